@@ -0,0 +1,11 @@
+#!/bin/sh
+set -e
+
+# Prometheus multiprocess mode: the workers write their metrics to this
+# directory, files left by a previous run would be added to the new totals.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec "$@"
@@ -0,0 +1,499 @@
+"""
+End-to-end load benchmark of the API, runnable entirely offline.
+
+The app is driven in process through its ASGI interface with the FAKE
+generation / embedding backend, the stub SPLADE and cross-encoder of
+benchmarks.stubs, an in-memory Qdrant (or a local one / the embedded backend)
+and mongomock-motor (or a local MongoDB with --mongo-url):
+
+    $ pip install mongomock-motor
+    $ python -m src.benchmarks.end_to_end --files 20 --queries 200 --output run.json
+    $ python -m src.benchmarks.end_to_end --files 20 --queries 200 --baseline run.json
+
+It measures the ingestion throughput (upload, process, index), the latency
+percentiles of each query endpoint and how the throughput of one endpoint
+scales with concurrent clients. With --url it targets a running server
+instead, which should then be configured with the FAKE backends.
+
+Without the CONTEXT_TOKEN_ENCODING tiktoken file cached locally, the answer
+endpoints pack their prompts with the ~4 characters per token estimate.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import httpx
+
+SYLLABLES = [ "ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "ba", "do", "fi", "gu", "ha", "je", "po" ]
+
+QUERY_ENDPOINTS = {
+    "search": "/api/v1/nlp/index/search/{project_id}",
+    "hybrid_search": "/api/v1/nlp/index/hybrid_search/{project_id}",
+    "hybrid_search_cross": "/api/v1/nlp/index/hybrid_search_cross/{project_id}",
+    "batch_search": "/api/v1/nlp/index/batch_search/{project_id}",
+    "hybrid_batch_search": "/api/v1/nlp/index/hybrid_batch_search/{project_id}",
+    "answer_search": "/api/v1/nlp/index/answer_search/{project_id}",
+    "answer_hybrid": "/api/v1/nlp/index/answer_hybrid/{project_id}",
+    "answer_hybrid_cross": "/api/v1/nlp/index/answer_hybrid_cross/{project_id}",
+}
+
+BATCH_ENDPOINTS = { "batch_search", "hybrid_batch_search" }
+ANSWER_ENDPOINTS = { "answer_search", "answer_hybrid", "answer_hybrid_cross" }
+
+
+# ========== SETUP ==========
+
+def configure_environment(args):
+    # before the settings are read for the first time
+    os.environ.update({
+        "MONGODB_URL": args.mongo_url or "mongodb://localhost:27017",
+        "MONGODB_DATABASE": args.mongo_database,
+        "APP_NAME": "asksource-benchmark",
+        "APP_VERSION": "0",
+        "GENERATION_BACKEND": "FAKE",
+        "EMBEDDING_BACKEND": "FAKE",
+        "GENERATION_MODEL_ID": "fake",
+        "EMBEDDING_MODEL_ID": "fake",
+        "EMBEDDING_MODEL_SIZE": str(args.dim),
+        "FAKE_EMBEDDING_LATENCY_MS": str(args.embedding_latency_ms),
+        "FAKE_GENERATION_LATENCY_MS": str(args.generation_latency_ms),
+        "SPLADE_MODEL_ID": "fake",
+        "RERANKER_MODEL_ID": "fake",
+        "VECTOR_DB_DISTANCE_METHOD": "cosine",
+    })
+    for key in ("OPENAI_API_KEY", "OPENAI_base_URL", "COHERE_API_KEY", "GEMINI_API_KEY"):
+        os.environ.setdefault(key, "")
+    os.environ.setdefault("INPUT_DEFAULT_MAX_CHARACTERS", "4096")
+    os.environ.setdefault("GENERATION_DEFAULT_MAX_TOKENS", "200")
+    os.environ.setdefault("GENERATION_DEFAULT_TEMPERATURE", "0.1")
+
+    os.environ["QDRANT_URL"] = ":memory:" if args.vectordb == "memory" else args.qdrant_url
+    if args.vectordb == "embedded":
+        os.environ["VECTOR_DB_BACKEND"] = "EMBEDDED"
+        os.environ["VECTOR_DB_PATH"] = "benchmark_embedded"
+    else:
+        os.environ["VECTOR_DB_BACKEND"] = "QDRANT"
+        os.environ["VECTOR_DB_PATH"] = "benchmark_qdrant"
+
+
+def create_db_client(args):
+    if args.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(args.mongo_url)[args.mongo_database]
+
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("mongomock-motor is not installed: pip install mongomock-motor, "
+                 "or pass --mongo-url of a local MongoDB")
+
+    return AsyncMongoMockClient()[args.mongo_database]
+
+
+def setup_app(args):
+    """
+    Sets the app state the startup event would, with the offline providers.
+    """
+    configure_environment(args)
+
+    from ..main import app
+    from ..help.config import get_settings
+    from ..stores.llm.LLMEnums import LLMEnums
+    from ..stores.llm.LLMProviderFactory import LLMProviderFactory
+    from ..stores.llm.templates.template_parser import TemplateParser
+    from ..stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+    from ..utils.readiness import Readiness
+    from ..utils.admission import AdmissionController
+    from .stubs import FakeSparseEmbeddingProvider, FakeCrossEncoderProvider
+
+    settings = get_settings()
+
+    app.db_client = create_db_client(args)
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    app.generation_client = llm_provider_factory.create(provider=LLMEnums.FAKE.value)
+    app.generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+    app.embedding_client = llm_provider_factory.create(provider=LLMEnums.FAKE.value)
+    app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                             embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    vectordb_factory = VectorDBProviderFactory(config=settings)
+    app.vectordb_client = vectordb_factory.create(provider=settings.VECTOR_DB_BACKEND)
+    app.vectordb_client.connect()
+    app.async_vectordb_client = vectordb_factory.create_async(provider=settings.VECTOR_DB_BACKEND)
+    if app.async_vectordb_client is not None:
+        app.async_vectordb_client.connect()
+
+    app.template_parser = TemplateParser(
+        language=settings.PRIMARY_LANG,
+        default_language=settings.DEFAULT_LANG,
+    )
+
+    app.sparse_embedding_client = FakeSparseEmbeddingProvider(
+        model_id=settings.SPLADE_MODEL_ID,
+        doc_top_k=settings.SPARSE_DOC_TOP_K,
+        doc_min_weight=settings.SPARSE_DOC_MIN_WEIGHT,
+        query_top_k=settings.SPARSE_QUERY_TOP_K,
+        query_min_weight=settings.SPARSE_QUERY_MIN_WEIGHT,
+        quantize_uint8=settings.SPARSE_QUANTIZE_UINT8,
+        quantization_max_weight=settings.SPARSE_QUANTIZATION_MAX_WEIGHT,
+    )
+    app.reranker_client = FakeCrossEncoderProvider(
+        model_id=settings.RERANKER_MODEL_ID,
+        batch_size=settings.RERANKER_BATCH_SIZE,
+        max_length=settings.RERANKER_MAX_LENGTH,
+        cache_size=settings.RERANKER_CACHE_SIZE,
+    )
+    app.answer_cache = None
+    app.usage_tracker = None
+    app.admission = AdmissionController.from_settings(settings)
+
+    app.readiness = Readiness()
+    for component in ("mongodb", "generation", "embedding", "vectordb", "sparse_embedding", "reranker"):
+        app.readiness.set_ready(component)
+
+    return app, settings
+
+
+def is_encoding_available(settings) -> bool:
+    from ..controllers.ContextController import get_encoding
+    return get_encoding(settings.CONTEXT_TOKEN_ENCODING) is not None
+
+
+def create_http_client(args, app=None):
+    if args.url:
+        return httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app),
+                             base_url="http://benchmark", timeout=args.timeout)
+
+
+# ========== DATASET ==========
+
+def build_corpus(args):
+    """
+    Deterministic synthetic documents: paragraphs of pseudo words drawn with
+    a Zipf-like frequency, the queries are the leading words of random paragraphs.
+    """
+    rng = random.Random(args.seed)
+    vocabulary = [ "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                   for _ in range(args.vocabulary) ]
+    weights = [ 1.0 / (rank + 1) for rank in range(len(vocabulary)) ]
+
+    files, paragraphs = [], []
+    for x in range(args.files):
+        file_paragraphs = [
+            " ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(40, 120))) + "."
+            for _ in range(args.paragraphs)
+        ]
+        paragraphs.extend(file_paragraphs)
+        files.append((f"benchmark_{x}.txt", "\n\n".join(file_paragraphs)))
+
+    queries = [ " ".join(paragraph.split()[:args.query_words])
+                for paragraph in rng.choices(paragraphs, k=args.queries) ]
+
+    return files, queries
+
+
+# ========== MEASURES ==========
+
+def percentile(sorted_values: list, q: float):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+
+
+def summarize(latencies: list, errors: int, elapsed: float, items_per_request: int = 1):
+    latencies = sorted(latencies)
+    to_ms = lambda value: value * 1000 if value is not None else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": to_ms(statistics.mean(latencies)) if latencies else None,
+        "p50_ms": to_ms(percentile(latencies, 0.50)),
+        "p90_ms": to_ms(percentile(latencies, 0.90)),
+        "p95_ms": to_ms(percentile(latencies, 0.95)),
+        "p99_ms": to_ms(percentile(latencies, 0.99)),
+        "max_ms": to_ms(latencies[-1]) if latencies else None,
+        "requests_per_second": len(latencies) / elapsed if elapsed else None,
+        "queries_per_second": len(latencies) * items_per_request / elapsed if elapsed else None,
+    }
+
+
+async def post(client: httpx.AsyncClient, path: str, **kwargs):
+    response = await client.post(path, **kwargs)
+    if response.status_code != 200:
+        raise RuntimeError(f"POST {path} failed with {response.status_code}: {response.text[:200]}")
+    return response.json()
+
+
+async def run_ingestion(client: httpx.AsyncClient, args, project_id: str, files: list):
+    start = time.perf_counter()
+    for file_name, content in files:
+        await post(client, f"/api/v1/data/upload/{project_id}",
+                   files={"file": (file_name, content.encode("utf-8"), "text/plain")})
+    upload_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    processed = await post(client, f"/api/v1/data/process/{project_id}", json={
+        "chunk_size": args.chunk_size,
+        "overlap_size": args.overlap_size,
+        "do_reset": 1,
+    })
+    process_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = await post(client, f"/api/v1/nlp/index/push/{project_id}", json={})
+    index_seconds = time.perf_counter() - start
+
+    chunks = processed["inserted_chunks"]
+    return {
+        "files": len(files),
+        "chunks": chunks,
+        "indexed_points": indexed["inserted_items_count"],
+        "upload_files_per_second": len(files) / upload_seconds,
+        "process_files_per_second": processed["processed_files"] / process_seconds,
+        "process_chunks_per_second": chunks / process_seconds,
+        "index_chunks_per_second": indexed["inserted_items_count"] / index_seconds,
+        "total_seconds": upload_seconds + process_seconds + index_seconds,
+    }
+
+
+def build_payload(args, endpoint: str, queries: list):
+    if endpoint in BATCH_ENDPOINTS:
+        payload = {"texts": queries}
+    else:
+        payload = {"text": queries[0]}
+
+    payload["limit"] = args.limit
+    if endpoint not in ("search", "batch_search", "answer_search"):
+        payload["dense_limit"] = args.dense_limit
+        payload["sparse_limit"] = args.sparse_limit
+
+    return payload
+
+
+def build_requests(args, endpoint: str, queries: list):
+    if endpoint in BATCH_ENDPOINTS:
+        return [ build_payload(args, endpoint, queries[x:x + args.batch_queries])
+                 for x in range(0, len(queries), args.batch_queries) ]
+
+    return [ build_payload(args, endpoint, [ query ]) for query in queries ]
+
+
+async def run_requests(client: httpx.AsyncClient, path: str, payloads: list, concurrency: int):
+    """
+    Sends the payloads from `concurrency` clients, returns the latencies,
+    the error count and the elapsed time.
+    """
+    latencies, errors = [], 0
+    next_payload = iter(payloads)
+
+    async def worker():
+        nonlocal errors
+        for payload in next_payload:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                is_ok = response.status_code == 200
+            except httpx.HTTPError:
+                is_ok = False
+
+            if is_ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[ worker() for _ in range(concurrency) ])
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run_endpoint(client: httpx.AsyncClient, args, project_id: str, endpoint: str,
+                       queries: list, concurrency: int = 1):
+    path = QUERY_ENDPOINTS[endpoint].format(project_id=project_id)
+    payloads = build_requests(args, endpoint, queries)
+
+    # warm up caches and lazy initialisations, not measured
+    await run_requests(client, path, payloads[:args.warmup], concurrency=1)
+
+    latencies, errors, elapsed = await run_requests(client, path, payloads, concurrency=concurrency)
+    items_per_request = args.batch_queries if endpoint in BATCH_ENDPOINTS else 1
+    return summarize(latencies, errors, elapsed, items_per_request=items_per_request)
+
+
+# ========== REPORT ==========
+
+def get_environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare_reports(baseline: dict, report: dict):
+    """
+    Prints the change of each throughput / latency metric against a previous run.
+    """
+    def line(name: str, before, after, higher_is_better: bool):
+        if before is None or after is None:
+            return
+        change = (after - before) / before * 100 if before else 0.0
+        better = (change >= 0) == higher_is_better
+        print(f"  {name:<48} {before:10.2f} -> {after:10.2f} ({change:+6.1f}% {'better' if better else 'worse'})")
+
+    print(f"compared to {baseline['environment'].get('git_commit')} ({baseline['environment'].get('timestamp')}):")
+
+    for key, value in report["ingestion"].items():
+        if key.endswith("_per_second"):
+            line(f"ingestion {key}", baseline["ingestion"].get(key), value, True)
+
+    for endpoint, result in report["endpoints"].items():
+        before = baseline["endpoints"].get(endpoint)
+        if not before:
+            continue
+        line(f"{endpoint} p50_ms", before["p50_ms"], result["p50_ms"], False)
+        line(f"{endpoint} p95_ms", before["p95_ms"], result["p95_ms"], False)
+        line(f"{endpoint} queries_per_second", before["queries_per_second"], result["queries_per_second"], True)
+
+    baseline_scaling = { str(result["concurrency"]): result for result in baseline.get("concurrency", []) }
+    for result in report["concurrency"]:
+        before = baseline_scaling.get(str(result["concurrency"]))
+        if before:
+            line(f"concurrency {result['concurrency']} queries_per_second",
+                 before["queries_per_second"], result["queries_per_second"], True)
+
+
+def print_report(report: dict):
+    ingestion = report["ingestion"]
+    print(f"ingestion: {ingestion['files']} files, {ingestion['chunks']} chunks | "
+          f"upload {ingestion['upload_files_per_second']:.1f} files/s | "
+          f"process {ingestion['process_chunks_per_second']:.1f} chunks/s | "
+          f"index {ingestion['index_chunks_per_second']:.1f} chunks/s")
+
+    for endpoint, result in report["endpoints"].items():
+        if not result["requests"]:
+            print(f"{endpoint:<20}: all {result['errors']} requests failed")
+            continue
+        print(f"{endpoint:<20}: p50 {result['p50_ms']:7.2f} ms | p95 {result['p95_ms']:7.2f} ms | "
+              f"p99 {result['p99_ms']:7.2f} ms | {result['queries_per_second']:7.1f} q/s | "
+              f"{result['errors']} errors")
+
+    for result in report["concurrency"]:
+        print(f"{report['params']['scaling_endpoint']} x{result['concurrency']:<3}: "
+              f"{result['queries_per_second']:7.1f} q/s | p50 {result['p50_ms']:7.2f} ms | "
+              f"p95 {result['p95_ms']:7.2f} ms")
+
+    for note in report["notes"]:
+        print(f"note: {note}")
+
+
+# ========== MAIN ==========
+
+async def run(args):
+    notes = []
+    app, endpoints = None, [ endpoint.strip() for endpoint in args.endpoints.split(",") if endpoint.strip() ]
+
+    if not args.url:
+        app, settings = setup_app(args)
+        if not is_encoding_available(settings) and any(endpoint in ANSWER_ENDPOINTS for endpoint in endpoints):
+            notes.append(f"tiktoken encoding {settings.CONTEXT_TOKEN_ENCODING} is not available offline, "
+                         f"the answer endpoints estimate the prompt tokens")
+
+    files, queries = build_corpus(args)
+    project_id = f"benchmark{uuid.uuid4().hex[:8]}"
+
+    async with create_http_client(args, app=app) as client:
+        try:
+            ingestion = await run_ingestion(client, args, project_id, files)
+
+            results = {}
+            for endpoint in endpoints:
+                results[endpoint] = await run_endpoint(client, args, project_id, endpoint, queries)
+
+            scaling = []
+            for concurrency in [ int(level) for level in args.concurrency.split(",") if level.strip() ]:
+                result = await run_endpoint(client, args, project_id, args.scaling_endpoint,
+                                            queries, concurrency=concurrency)
+                scaling.append({ "concurrency": concurrency, **result })
+        finally:
+            if not args.keep:
+                await client.delete(f"/api/v1/data/projects/{project_id}")
+
+    return {
+        "params": vars(args),
+        "environment": get_environment(),
+        "ingestion": ingestion,
+        "endpoints": results,
+        "concurrency": scaling,
+        "notes": notes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--vectordb", choices=["memory", "qdrant", "embedded"], default="memory")
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--mongo-url", default=None, help="local MongoDB, mongomock-motor by default")
+    parser.add_argument("--mongo-database", default="asksource_benchmark")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=30, help="paragraphs per file")
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--overlap-size", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=384, help="fake embedding size")
+    parser.add_argument("--embedding-latency-ms", type=int, default=0, help="simulated embedding API latency")
+    parser.add_argument("--generation-latency-ms", type=int, default=0, help="simulated generation API latency")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--query-words", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--dense-limit", type=int, default=10)
+    parser.add_argument("--sparse-limit", type=int, default=10)
+    parser.add_argument("--batch-queries", type=int, default=50, help="queries per batch search request")
+    parser.add_argument("--endpoints", default=",".join(QUERY_ENDPOINTS))
+    parser.add_argument("--scaling-endpoint", default="hybrid_search", choices=list(QUERY_ENDPOINTS))
+    parser.add_argument("--concurrency", default="1,4,16", help="comma separated client counts")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark project afterwards")
+    parser.add_argument("--baseline", default=None, help="JSON report of a previous run to compare with")
+    parser.add_argument("--output", default=None, help="optional path of a JSON report")
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints.split(",")) - set(QUERY_ENDPOINTS) - { "" }
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare_reports(json.load(f), report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Import time of the app, from `python -X importtime`, as a regression check.
+
+Every worker imports src.main, the document loaders, the ML stacks and the
+LLM SDKs are only imported when a file type is processed or a backend is
+selected:
+
+    $ python -m src.benchmarks.import_time
+    $ python -m src.benchmarks.import_time --check --max-ms 3000
+
+With --check the exit code is 1 when one of the lazy modules was imported
+by `import src.main`, or the import took longer than --max-ms.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# imported on demand, never by `import src.main`
+LAZY_MODULES = [
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "onnxruntime",
+    "langchain_community",
+    "langchain_text_splitters",
+    "unstructured",
+    "openai",
+    "cohere",
+    "google.generativeai",
+    "tiktoken",
+]
+
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def run_importtime(module: str) -> str:
+    root_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root_path, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return result.stderr
+
+
+def parse_importtime(output: str) -> list:
+    """
+    (name, self_us, cumulative_us) of every imported module, in import order.
+    """
+    modules = []
+    for line in output.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            modules.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return modules
+
+
+def build_report(module: str, modules: list, top: int) -> dict:
+    cumulative = { name: cumulative_us for name, _, cumulative_us in modules }
+
+    packages = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[name.split(".")[0]] += self_us
+
+    imported = { name for name, _, _ in modules }
+    lazy_imported = [
+        lazy_module for lazy_module in LAZY_MODULES
+        if any(name == lazy_module or name.startswith(lazy_module + ".") for name in imported)
+    ]
+
+    return {
+        "module": module,
+        "total_ms": cumulative.get(module, 0) / 1000,
+        "modules": len(modules),
+        "top_packages_ms": {
+            package: self_us / 1000
+            for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        },
+        "lazy_modules_imported": lazy_imported,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=15, help="heaviest packages to list")
+    parser.add_argument("--check", action="store_true", help="exit with 1 on a regression")
+    parser.add_argument("--max-ms", type=float, default=0, help="import time budget of --check, 0 disables it")
+    parser.add_argument("--output", default=None, help="optional path of a JSON report")
+    args = parser.parse_args()
+
+    report = build_report(args.module, parse_importtime(run_importtime(args.module)), top=args.top)
+
+    print(f"import {report['module']}: {report['total_ms']:.1f} ms, {report['modules']} modules")
+    for package, milliseconds in report["top_packages_ms"].items():
+        print(f"  {package:<32} {milliseconds:8.1f} ms")
+
+    if report["lazy_modules_imported"]:
+        print(f"imported eagerly: {', '.join(report['lazy_modules_imported'])}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "report": report}, f, indent=2)
+
+    if args.check:
+        over_budget = args.max_ms and report["total_ms"] > args.max_ms
+        if report["lazy_modules_imported"] or over_budget:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Per-request overhead of PrometheusMiddleware.
+
+A FastAPI app with as many routes as the API (path parameters included) is
+called directly through its ASGI interface, with and without the middleware,
+so the difference is the time spent in the middleware and the metrics:
+
+    $ python -m src.benchmarks.metrics_middleware --requests 20000
+
+"warm" requests hit the route cache, "cold" ones use a new path every time
+(e.g. a new project id) and resolve the route against the app routes.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from fastapi import FastAPI, APIRouter
+from ..utils.metrics import PrometheusMiddleware
+
+
+def build_app(routes: int, with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(prefix="/api/v1")
+
+    for i in range(routes):
+        async def endpoint(project_id: str):
+            return { "signal": "ok", "project_id": project_id }
+        router.add_api_route(f"/route_{i}/{{project_id}}", endpoint, methods=["POST"])
+
+    app.include_router(router)
+    if with_middleware:
+        app.add_middleware(PrometheusMiddleware)
+
+    return app
+
+
+def build_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": { "version": "3.0" },
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [ (b"content-type", b"application/json"), (b"content-length", b"2") ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+
+async def call(app: FastAPI, path: str):
+    async def receive():
+        return { "type": "http.request", "body": b"{}", "more_body": False }
+
+    async def send(message):
+        pass
+
+    await app(build_scope(path), receive, send)
+
+
+async def measure(app: FastAPI, paths: list) -> list:
+    latencies = []
+    for path in paths:
+        start = time.perf_counter()
+        await call(app, path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p95_us": latencies[int(len(latencies) * 0.95) - 1] * 1e6,
+        "mean_us": statistics.fmean(latencies) * 1e6,
+    }
+
+
+async def run(args) -> dict:
+    bare_app = build_app(args.routes, with_middleware=False)
+    metrics_app = build_app(args.routes, with_middleware=True)
+
+    # the last route is the worst case of a linear route lookup
+    warm_paths = [ f"/api/v1/route_{args.routes - 1}/project{i % 10}" for i in range(args.requests) ]
+    cold_paths = [ f"/api/v1/route_{args.routes - 1}/project_cold{i}" for i in range(args.requests) ]
+
+    for app in (bare_app, metrics_app):
+        await measure(app, warm_paths[:args.warmup])
+
+    results = {}
+    for name, paths in (("warm", warm_paths), ("cold", cold_paths)):
+        bare = summarize(await measure(bare_app, paths))
+        metrics = summarize(await measure(metrics_app, paths))
+        results[name] = {
+            "bare": bare,
+            "middleware": metrics,
+            "overhead_p50_us": metrics["p50_us"] - bare["p50_us"],
+            "overhead_mean_us": metrics["mean_us"] - bare["mean_us"],
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--output", default=None, help="optional path of a JSON report")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    for name, result in results.items():
+        print(
+            f"{name}: bare p50 {result['bare']['p50_us']:7.1f} us | "
+            f"middleware p50 {result['middleware']['p50_us']:7.1f} us | "
+            f"overhead p50 {result['overhead_p50_us']:6.1f} us, mean {result['overhead_mean_us']:6.1f} us"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
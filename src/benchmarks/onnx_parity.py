@@ -0,0 +1,147 @@
+"""
+Check that the ONNX backend of SPLADE and the cross-encoder matches the torch
+one within a tolerance, and compare their CPU latency:
+
+    $ python -m src.benchmarks.onnx_parity --corpus passages.txt --texts 200
+
+Exits with status 1 when a parity check fails, so it can gate a deployment
+switching INFERENCE_BACKEND to "onnx".
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+from ..stores.sparse_embedding.SparseEmbeddingProvider import SparseEmbeddingProvider
+from ..stores.sparse_embedding.OnnxSparseEmbeddingProvider import OnnxSparseEmbeddingProvider
+from ..stores.reranker.CrossEncoderProvider import CrossEncoderProvider
+from ..stores.reranker.OnnxCrossEncoderProvider import OnnxCrossEncoderProvider
+
+
+def timed(function, inputs: list):
+    outputs, latencies = [], []
+    for item in inputs:
+        start = time.perf_counter()
+        outputs.append(function(item))
+        latencies.append(time.perf_counter() - start)
+    return outputs, statistics.median(latencies) * 1000
+
+
+def sparse_parity(reference: dict, candidate: dict, top_k: int):
+    """
+    Relative L1 error on the union of terms and overlap of the top_k terms.
+    """
+    reference_terms = dict(zip(reference["indices"], reference["values"]))
+    candidate_terms = dict(zip(candidate["indices"], candidate["values"]))
+    terms = set(reference_terms) | set(candidate_terms)
+
+    error = sum(abs(reference_terms.get(term, 0.0) - candidate_terms.get(term, 0.0)) for term in terms)
+    relative_error = error / max(sum(reference_terms.values()), 1e-9)
+
+    def top_terms(terms_weights: dict):
+        return set(sorted(terms_weights, key=terms_weights.get, reverse=True)[:top_k])
+
+    overlap = len(top_terms(reference_terms) & top_terms(candidate_terms)) / max(min(top_k, len(reference_terms)), 1)
+    return relative_error, overlap
+
+
+def spearman(reference: list, candidate: list):
+    if len(reference) < 2:
+        return 1.0
+    reference_ranks = np.argsort(np.argsort(reference))
+    candidate_ranks = np.argsort(np.argsort(candidate))
+    return float(np.corrcoef(reference_ranks, candidate_ranks)[0, 1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="text file, one passage per line")
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--splade-model-id", default="opensearch-project/opensearch-neural-sparse-encoding-v1")
+    parser.add_argument("--reranker-model-id", default="cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")
+    parser.add_argument("--cache-dir", default=None, help="ONNX export cache, a temporary directory by default")
+    parser.add_argument("--no-quantize", action="store_true", help="compare the fp32 export instead of int8")
+    parser.add_argument("--num-threads", type=int, default=0)
+    parser.add_argument("--candidates", type=int, default=25, help="documents reranked per query")
+    parser.add_argument("--top-k", type=int, default=50, help="sparse terms compared for overlap")
+    parser.add_argument("--max-sparse-error", type=float, default=0.1)
+    parser.add_argument("--min-top-k-overlap", type=float, default=0.9)
+    parser.add_argument("--max-score-error", type=float, default=0.05)
+    parser.add_argument("--min-rank-correlation", type=float, default=0.95)
+    parser.add_argument("--output", default=None, help="optional path of a JSON report")
+    args = parser.parse_args()
+
+    with open(args.corpus) as f:
+        texts = [ line.strip() for line in f if line.strip() ][:args.texts]
+
+    onnx_params = {
+        "cache_dir": args.cache_dir or tempfile.mkdtemp(prefix="onnx_parity_"),
+        "quantize_int8": not args.no_quantize,
+        "num_threads": args.num_threads,
+    }
+
+    # ---- SPLADE
+    torch_sparse = SparseEmbeddingProvider(model_id=args.splade_model_id)
+    onnx_sparse = OnnxSparseEmbeddingProvider(model_id=args.splade_model_id, **onnx_params)
+
+    torch_vectors, torch_sparse_ms = timed(lambda text: torch_sparse.encode(text=text), texts)
+    onnx_vectors, onnx_sparse_ms = timed(lambda text: onnx_sparse.encode(text=text), texts)
+
+    sparse_results = [ sparse_parity(reference, candidate, top_k=args.top_k)
+                       for reference, candidate in zip(torch_vectors, onnx_vectors) ]
+    sparse_error = statistics.mean(error for error, _ in sparse_results)
+    sparse_overlap = statistics.mean(overlap for _, overlap in sparse_results)
+
+    # ---- cross-encoder: each text is a query against the next `candidates` passages
+    queries = [ (" ".join(text.split()[:12]), [ texts[(x + k) % len(texts)] for k in range(args.candidates) ])
+                for x, text in enumerate(texts) ]
+
+    torch_reranker = CrossEncoderProvider(model_id=args.reranker_model_id)
+    onnx_reranker = OnnxCrossEncoderProvider(model_id=args.reranker_model_id, **onnx_params)
+
+    def scores_of(provider):
+        return lambda query: [ float(score) for score in provider.predict_scores([ [query[0], doc] for doc in query[1] ]) ]
+
+    torch_scores, torch_rerank_ms = timed(scores_of(torch_reranker), queries)
+    onnx_scores, onnx_rerank_ms = timed(scores_of(onnx_reranker), queries)
+
+    score_error = max(float(np.max(np.abs(np.array(reference) - np.array(candidate))))
+                      for reference, candidate in zip(torch_scores, onnx_scores))
+    rank_correlation = statistics.mean(spearman(reference, candidate)
+                                       for reference, candidate in zip(torch_scores, onnx_scores))
+
+    report = {
+        "sparse_relative_l1_error": sparse_error,
+        f"sparse_top_{args.top_k}_overlap": sparse_overlap,
+        "sparse_p50_ms": {"torch": torch_sparse_ms, "onnx": onnx_sparse_ms},
+        "rerank_max_score_error": score_error,
+        "rerank_spearman": rank_correlation,
+        "rerank_p50_ms": {"torch": torch_rerank_ms, "onnx": onnx_rerank_ms},
+    }
+
+    checks = {
+        "sparse error": sparse_error <= args.max_sparse_error,
+        "sparse top-k overlap": sparse_overlap >= args.min_top_k_overlap,
+        "rerank score error": score_error <= args.max_score_error,
+        "rerank rank correlation": rank_correlation >= args.min_rank_correlation,
+    }
+
+    print(f"SPLADE  : relative L1 error {sparse_error:.4f}, top-{args.top_k} overlap {sparse_overlap:.3f}, "
+          f"p50 {torch_sparse_ms:.1f} ms -> {onnx_sparse_ms:.1f} ms ({torch_sparse_ms / onnx_sparse_ms:.2f}x)")
+    print(f"reranker: max score error {score_error:.4f}, spearman {rank_correlation:.3f}, "
+          f"p50 {torch_rerank_ms:.1f} ms -> {onnx_rerank_ms:.1f} ms ({torch_rerank_ms / onnx_rerank_ms:.2f}x)")
+    for name, passed in checks.items():
+        print(f"{'ok  ' if passed else 'FAIL'} {name}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "results": report, "checks": checks}, f, indent=2)
+
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Compare upsert and query throughput of QdrantDBProvider over REST and gRPC.
+
+Needs a local Qdrant exposing both ports (see docker/docker-compose.yml):
+
+    $ python -m src.benchmarks.qdrant_transport --url http://localhost:6333 --points 5000
+
+Each transport writes to its own throw-away collection, which is dropped at the end.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from ..stores.vectordb.providers import QdrantDBProvider
+
+
+def random_sparse_vector(vocab_size: int, terms: int):
+    indices = sorted(random.sample(range(vocab_size), terms))
+    return {
+        "indices": indices,
+        "values": [ random.random() for _ in indices ],
+    }
+
+
+def build_dataset(points: int, dim: int, sparse_terms: int, seed: int):
+    random.seed(seed)
+
+    texts = [ f"benchmark chunk {i}" for i in range(points) ]
+    dense_vectors = [ [ random.uniform(-1, 1) for _ in range(dim) ] for _ in range(points) ]
+    sparse_vectors = [ random_sparse_vector(30000, sparse_terms) for _ in range(points) ]
+
+    return texts, dense_vectors, sparse_vectors
+
+
+def run_transport(args, prefer_grpc: bool, dataset):
+    texts, dense_vectors, sparse_vectors = dataset
+    collection_name = f"benchmark_{'grpc' if prefer_grpc else 'rest'}"
+
+    provider = QdrantDBProvider(
+        url=args.url,
+        distance_method="cosine",
+        prefer_grpc=prefer_grpc,
+        grpc_port=args.grpc_port,
+        timeout=args.timeout,
+        pool_size=args.pool_size,
+    )
+    provider.connect()
+
+    try:
+        provider.create_collection(collection_name=collection_name,
+                                   embedding_size=args.dim, do_reset=True)
+
+        start = time.perf_counter()
+        is_inserted = provider.insert_many(
+            collection_name=collection_name,
+            texts=texts,
+            dense_vectors=dense_vectors,
+            sparse_vectors=sparse_vectors,
+            batch_size=args.batch_size,
+        )
+        upsert_seconds = time.perf_counter() - start
+
+        if not is_inserted:
+            raise RuntimeError(f"upsert failed for {collection_name}")
+
+        latencies = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            provider.search_by_vector(collection_name=collection_name,
+                                      vector=dense_vectors[i % len(dense_vectors)],
+                                      limit=args.limit)
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        return {
+            "transport": "grpc" if prefer_grpc else "rest",
+            "upsert_points_per_second": len(texts) / upsert_seconds,
+            "query_per_second": len(latencies) / sum(latencies),
+            "query_p50_ms": statistics.median(latencies) * 1000,
+            "query_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        }
+    finally:
+        provider.delete_collection(collection_name=collection_name)
+        provider.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--timeout", type=int, default=60)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--sparse-terms", type=int, default=120)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="optional path of a JSON report")
+    args = parser.parse_args()
+
+    dataset = build_dataset(points=args.points, dim=args.dim,
+                            sparse_terms=args.sparse_terms, seed=args.seed)
+
+    results = [ run_transport(args, prefer_grpc=prefer_grpc, dataset=dataset)
+                for prefer_grpc in (False, True) ]
+
+    for result in results:
+        print(
+            f"{result['transport']:>5}: "
+            f"upsert {result['upsert_points_per_second']:8.1f} points/s | "
+            f"query {result['query_per_second']:7.1f} q/s "
+            f"(p50 {result['query_p50_ms']:.2f} ms, p95 {result['query_p95_ms']:.2f} ms)"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Measure the effect of sparse vector pruning / uint8 quantization on index size,
+sparse query latency and recall@k against the unpruned SPLADE vectors.
+
+The corpus is a text file with one passage per line, queries default to the
+leading words of random passages:
+
+    $ python -m src.benchmarks.sparse_pruning --corpus passages.txt --doc-top-k 0,64,128,256 --min-weight 0,0.05
+
+Search runs on the embedded vector backend, so no Qdrant server is needed.
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from ..stores.sparse_embedding.SparseEmbeddingProvider import SparseEmbeddingProvider
+from ..stores.vectordb.providers import EmbeddedVectorDBProvider
+
+
+def parse_list(value: str, cast):
+    return [ cast(item) for item in value.split(",") if item.strip() ]
+
+
+def load_texts(args):
+    with open(args.corpus) as f:
+        passages = [ line.strip() for line in f if line.strip() ][:args.max_passages]
+
+    if args.queries:
+        with open(args.queries) as f:
+            queries = [ line.strip() for line in f if line.strip() ]
+    else:
+        random.seed(args.seed)
+        queries = [ " ".join(passage.split()[:args.query_words])
+                    for passage in random.sample(passages, min(args.num_queries, len(passages))) ]
+
+    return passages, queries
+
+
+def build_index(provider: EmbeddedVectorDBProvider, collection_name: str, sparse_vectors: list):
+    # dense vectors are not evaluated here, a 1-d placeholder keeps the interface happy
+    provider.create_collection(collection_name=collection_name, embedding_size=1, do_reset=True)
+    provider.insert_many(
+        collection_name=collection_name,
+        texts=[ str(x) for x in range(len(sparse_vectors)) ],
+        dense_vectors=[ [0.0] ] * len(sparse_vectors),
+        sparse_vectors=sparse_vectors,
+    )
+    return provider.get_collection(collection_name)
+
+
+def run_queries(collection, query_vectors: list, limit: int):
+    results, latencies = [], []
+    for query_vector in query_vectors:
+        start = time.perf_counter()
+        hits = collection.search_sparse(sparse_vector=query_vector, limit=limit)
+        latencies.append(time.perf_counter() - start)
+        results.append([ row for row, _ in hits ])
+
+    return results, sorted(latencies)
+
+
+def recall_at_k(results: list, baseline: list):
+    recalls = [ len(set(result) & set(expected)) / len(expected)
+                for result, expected in zip(results, baseline) if expected ]
+    return statistics.mean(recalls) if recalls else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="text file, one passage per line")
+    parser.add_argument("--queries", default=None, help="optional text file, one query per line")
+    parser.add_argument("--model-id", default="opensearch-project/opensearch-neural-sparse-encoding-v1")
+    parser.add_argument("--max-passages", type=int, default=5000)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--query-words", type=int, default=12)
+    parser.add_argument("--doc-top-k", default="0,64,128,256", help="comma separated, 0 keeps all terms")
+    parser.add_argument("--min-weight", default="0,0.05", help="comma separated document thresholds")
+    parser.add_argument("--query-top-k", type=int, default=0)
+    parser.add_argument("--query-min-weight", type=float, default=0.0)
+    parser.add_argument("--quantization-max-weight", type=float, default=5.0)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="optional path of a JSON report")
+    args = parser.parse_args()
+
+    passages, queries = load_texts(args)
+
+    provider = SparseEmbeddingProvider(model_id=args.model_id,
+                                       quantization_max_weight=args.quantization_max_weight)
+    doc_vectors = [ provider.encode(text=text) for text in passages ]
+    query_vectors = [ provider.encode(text=text) for text in queries ]
+    pruned_query_vectors = [
+        provider.prune_sparse_vector(vector, top_k=args.query_top_k, min_weight=args.query_min_weight)
+        for vector in query_vectors
+    ]
+
+    vectordb = EmbeddedVectorDBProvider(db_path=tempfile.mkdtemp(prefix="sparse_pruning_"),
+                                        distance_method="dot")
+    vectordb.connect()
+
+    baseline, _ = run_queries(build_index(vectordb, "baseline", doc_vectors), query_vectors, args.limit)
+
+    reports = []
+    for top_k in parse_list(args.doc_top_k, int):
+        for min_weight in parse_list(args.min_weight, float):
+            pruned = [ provider.prune_sparse_vector(vector, top_k=top_k, min_weight=min_weight)
+                       for vector in doc_vectors ]
+
+            for quantize in (False, True):
+                vectors = [ provider.quantize_sparse_vector(vector) for vector in pruned ] if quantize else pruned
+
+                collection = build_index(vectordb, "pruned", vectors)
+                results, latencies = run_queries(collection, pruned_query_vectors, args.limit)
+
+                postings = sum(len(vector["indices"]) for vector in vectors)
+                reports.append({
+                    "doc_top_k": top_k,
+                    "doc_min_weight": min_weight,
+                    "quantize_uint8": quantize,
+                    "terms_per_doc": postings / len(vectors),
+                    # u32 index + f32 or u8 weight per posting
+                    "index_bytes": postings * (4 + (1 if quantize else 4)),
+                    "query_p50_ms": statistics.median(latencies) * 1000,
+                    "query_p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+                    f"recall_at_{args.limit}": recall_at_k(results, baseline),
+                })
+
+    vectordb.disconnect()
+
+    baseline_terms = sum(len(vector["indices"]) for vector in doc_vectors) / len(doc_vectors)
+    print(f"baseline: {baseline_terms:.1f} terms/doc, {len(passages)} passages, {len(queries)} queries "
+          f"(query top_k={args.query_top_k}, min_weight={args.query_min_weight})")
+    for report in reports:
+        print(
+            f"top_k {report['doc_top_k']:>4} | min_weight {report['doc_min_weight']:<5} | "
+            f"{'uint8' if report['quantize_uint8'] else 'f32  '} | "
+            f"{report['terms_per_doc']:7.1f} terms/doc | {report['index_bytes'] / 2**20:8.2f} MiB | "
+            f"p50 {report['query_p50_ms']:.2f} ms, p95 {report['query_p95_ms']:.2f} ms | "
+            f"recall@{args.limit} {report[f'recall_at_{args.limit}']:.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"params": vars(args), "baseline_terms_per_doc": baseline_terms,
+                       "results": reports}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
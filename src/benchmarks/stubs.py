@@ -0,0 +1,68 @@
+"""
+Offline stand-ins for the local models, deterministic and cheap enough that
+a benchmark measures the application code around them. They subclass the
+real providers, so pruning, quantization and the rerank cache still run.
+"""
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import List
+from ..stores.sparse_embedding.SparseEmbeddingProvider import SparseEmbeddingProvider
+from ..stores.reranker.CrossEncoderProvider import CrossEncoderProvider
+
+VOCAB_SIZE = 30522
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+class FakeSparseEmbeddingProvider(SparseEmbeddingProvider):
+    """
+    Hashes the words of a text into a SPLADE sized vocabulary,
+    weighted by log(1 + term frequency).
+    """
+
+    def load_tokenizer(self, model_id: str):
+        self.tokenizer = None
+
+    def load_model(self, model_id: str):
+        self.model = None
+
+    def get_term_id(self, term: str) -> int:
+        digest = hashlib.md5(term.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "little") % VOCAB_SIZE
+
+    def encode_batch(self, texts: List[str], batch_size: int = 32):
+        sparse_vectors = []
+        for text in texts:
+            weights = {}
+            for term, frequency in Counter(tokenize(text)).items():
+                term_id = self.get_term_id(term)
+                weights[term_id] = weights.get(term_id, 0.0) + math.log1p(frequency)
+
+            indices = sorted(weights)
+            sparse_vectors.append({
+                "indices": indices,
+                "values": [ weights[index] for index in indices ],
+            })
+
+        return sparse_vectors
+
+
+class FakeCrossEncoderProvider(CrossEncoderProvider):
+    """
+    Scores a (query, text) pair by the share of the query words found in the text.
+    """
+
+    def load_model(self, model_id: str):
+        self.model = None
+
+    def predict_scores(self, model_input: List[list]) -> List[float]:
+        scores = []
+        for query, text in model_input:
+            query_terms, text_terms = set(tokenize(query)), set(tokenize(text))
+            scores.append(len(query_terms & text_terms) / max(len(query_terms), 1))
+
+        return scores
@@ -19,6 +19,11 @@ class BaseController:
             self.base_dir,
             "assets/database"
         )
+
+        self.models_dir = os.path.join(
+            self.base_dir,
+            "assets/models"
+        )
         
     def generate_random_string(self, length: int=12):
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
@@ -33,4 +38,15 @@ class BaseController:
         if not os.path.exists(database_path):
             os.makedirs(database_path)
 
-        return database_path
\ No newline at end of file
+        return database_path
+
+    def get_model_path(self, model_name: str):
+
+        model_path = os.path.join(
+            self.models_dir, model_name
+        )
+
+        if not os.path.exists(model_path):
+            os.makedirs(model_path)
+
+        return model_path
@@ -0,0 +1,161 @@
+from .BaseController import BaseController
+from ..utils.metrics import CONTEXT_TOKENS
+from functools import lru_cache
+from typing import List
+import logging
+import math
+
+# same estimate as LLMInterface.estimate_tokens, when the encoding can not be loaded
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoding(encoding_name: str):
+    """
+    Loaded once per process (at startup, see main.load_models). tiktoken
+    downloads the file unless it is in TIKTOKEN_CACHE_DIR, when that fails
+    (offline containers) the None result is cached too and the token counts
+    fall back to the CHARS_PER_TOKEN estimate.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logging.getLogger(__name__).warning(
+            f"Token encoding {encoding_name} unavailable ({e}), estimating {CHARS_PER_TOKEN} characters per token"
+        )
+        return None
+
+
+class ContextController(BaseController):
+    """
+    Packs retrieved chunks into the RAG prompt:
+
+    - consecutive chunks (by chunk order) of the same asset are merged into one
+      passage, the text they repeat because of the chunk overlap is kept once
+    - passages are added in relevance order until CONTEXT_MAX_TOKENS is used,
+      the last one is cut at a token boundary if enough budget is left for it
+    - the footer (question) is always kept, and the whole prompt stays under
+      INPUT_DEFAULT_MAX_CHARACTERS so the provider never truncates it
+    """
+
+    def __init__(self, template_parser):
+        super().__init__()
+        self.template_parser = template_parser
+        self.encoding = get_encoding(self.app_settings.CONTEXT_TOKEN_ENCODING)
+
+    def count_tokens(self, text: str) -> int:
+        if self.encoding is None:
+            return math.ceil(len(text) / CHARS_PER_TOKEN)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate_tokens(self, text: str, max_tokens: int) -> str:
+        if self.encoding is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return self.encoding.decode(tokens[:max_tokens])
+
+    def to_dict(self, document) -> dict:
+        return document if isinstance(document, dict) else document.dict()
+
+    def get_chunk_order(self, document: dict):
+        return (document.get("metadata") or {}).get("chunk_order")
+
+    def find_overlap(self, left: str, right: str) -> int:
+        """
+        Length of the longest suffix of `left` that is a prefix of `right`.
+        """
+        max_overlap = min(len(left), len(right)) // 2
+        for size in range(max_overlap, self.app_settings.CONTEXT_MIN_OVERLAP_CHARACTERS - 1, -1):
+            if size > 0 and left.endswith(right[:size]):
+                return size
+        return 0
+
+    def merge_documents(self, documents: List[dict]) -> List[dict]:
+        """
+        Returns passages in relevance order (of their best chunk), each holding
+        the merged text of neighbouring chunks from the same asset.
+        """
+        passages = []
+        for document in documents:
+            merged = False
+            for passage in passages:
+                if not document.get("asset_id") or passage["asset_id"] != document.get("asset_id"):
+                    continue
+
+                order = self.get_chunk_order(document)
+                if order is not None and order == passage["last_order"] + 1:
+                    overlap = self.find_overlap(passage["text"], document["text"])
+                    passage["text"] += ("" if overlap else "\n") + document["text"][overlap:]
+                    passage["last_order"] = order
+                elif order is not None and order == passage["first_order"] - 1:
+                    overlap = self.find_overlap(document["text"], passage["text"])
+                    passage["text"] = document["text"] + ("" if overlap else "\n") + passage["text"][overlap:]
+                    passage["first_order"] = order
+                else:
+                    continue
+
+                merged = True
+                break
+
+            if not merged:
+                order = self.get_chunk_order(document)
+                passages.append({
+                    "asset_id": document.get("asset_id"),
+                    "first_order": order if order is not None else -2,
+                    "last_order": order if order is not None else -2,
+                    "text": document["text"],
+                })
+
+        return passages
+
+    def build_context(self, query: str, documents: list):
+        """
+        Returns (documents_prompts, footer_prompt) for the retrieved documents.
+        """
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
+            "query": query
+        })
+
+        max_tokens = self.app_settings.CONTEXT_MAX_TOKENS - self.count_tokens(footer_prompt)
+        max_characters = (self.app_settings.INPUT_DEFAULT_MAX_CHARACTERS or 0) - len(footer_prompt) - 2
+        has_character_limit = bool(self.app_settings.INPUT_DEFAULT_MAX_CHARACTERS)
+
+        passages = self.merge_documents([ self.to_dict(document) for document in documents ])
+
+        headers = self.template_parser.render_many("rag", "document_prompt", [
+            { "doc_num": doc_num, "chunk_text": "" }
+            for doc_num in range(1, len(passages) + 1)
+        ])
+
+        texts = []
+        used_tokens, used_characters = 0, 0
+        for passage in passages:
+            header = headers[len(texts)]
+            separator = 1 if texts else 0
+            remaining_tokens = max_tokens - used_tokens - self.count_tokens(header) - separator
+            remaining_characters = max_characters - used_characters - len(header) - separator
+
+            text = passage["text"]
+            if self.count_tokens(text) > remaining_tokens:
+                if remaining_tokens < self.app_settings.CONTEXT_MIN_PASSAGE_TOKENS:
+                    continue
+                text = self.truncate_tokens(text, remaining_tokens)
+
+            if has_character_limit and len(text) > remaining_characters:
+                # ~4 characters per token
+                if remaining_characters < self.app_settings.CONTEXT_MIN_PASSAGE_TOKENS * 4:
+                    continue
+                text = text[:remaining_characters]
+
+            texts.append(text)
+            used_tokens += self.count_tokens(header) + self.count_tokens(text) + separator
+            used_characters += len(header) + len(text) + separator
+
+        document_prompts = self.template_parser.render_many("rag", "document_prompt", [
+            { "doc_num": doc_num, "chunk_text": text }
+            for doc_num, text in enumerate(texts, start=1)
+        ])
+
+        CONTEXT_TOKENS.observe(used_tokens)
+        return "\n".join(document_prompts), footer_prompt
@@ -1,18 +1,25 @@
 from .BaseController import BaseController
+from .ContextController import ContextController
 from ..models.db_schemes import Project, DataChunk
 from ..stores.llm.LLMEnums import DocumentTypeEnum
 from typing import List
+import asyncio
+import functools
 import json
+import time
+import uuid
 from ..models.ChunkModel import ChunkModel
 import logging
-from ..utils.metrics import EMBEDDINGS_COUNT , ANSWER_CONFIDENCE  , SPARSE_EMBEDDINGS_COUNT
-from qdrant_client.http.exceptions import UnexpectedResponse
+from ..stores.vectordb.VectorDBEnums import TenancyModeEnums
+from ..utils.metrics import EMBEDDINGS_COUNT , ANSWER_CONFIDENCE  , SPARSE_EMBEDDINGS_COUNT, ANSWER_CACHE_LOOKUPS, RERANK_DEPTH, HYBRID_SEARCH_FALLBACKS
+from ..utils.metrics import track_stage, get_backend_name
 logger = logging.getLogger(__name__)
 
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser, sparse_embedding_client, reranker_client):
+                 embedding_client, template_parser, sparse_embedding_client, reranker_client,
+                 answer_cache=None, async_vectordb_client=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
@@ -21,54 +28,165 @@ class NLPController(BaseController):
         self.sparse_embedding_client = sparse_embedding_client
         self.template_parser = template_parser
         self.reranker_client = reranker_client
+        self.answer_cache = answer_cache
+        self.async_vectordb_client = async_vectordb_client
+
+    async def query_vector_db(self, method_name: str, **kwargs):
+        """
+        Runs a vector db query without blocking the event loop: on the async
+        client when there is one, otherwise the sync client's in a thread.
+        """
+        if self.async_vectordb_client is not None:
+            return await getattr(self.async_vectordb_client, method_name)(**kwargs)
+
+        return await asyncio.to_thread(getattr(self.vectordb_client, method_name), **kwargs)
+
+    def is_shared_tenancy(self):
+        return self.app_settings.VECTOR_DB_TENANCY_MODE == TenancyModeEnums.SHARED.value
+
     def create_collection_name(self, project_id: str):
+        # in shared tenancy every project lives in one collection, partitioned by project_id
+        if self.is_shared_tenancy():
+            return self.app_settings.VECTOR_DB_SHARED_COLLECTION_NAME.strip()
         return f"collection_{project_id}".strip()
+
+    def create_index_version(self):
+        return str(int(time.time() * 1000))
+
+    def create_versioned_collection_name(self, project_id: str, index_version: str):
+        # searches always go through the alias returned by create_collection_name,
+        # re-indexing builds into a fresh versioned collection behind it
+        alias_name = self.create_collection_name(project_id=project_id)
+        return f"{alias_name}_v{index_version}"
+
+    def create_record_ids(self, project: Project, chunks_ids: List[int], index_version: str = None):
+        if not self.is_shared_tenancy():
+            return chunks_ids
+
+        # point ids must be unique across the projects sharing the collection
+        return [
+            str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project.project_id}/{index_version}/{chunk_id}"))
+            for chunk_id in chunks_ids
+        ]
+
+    def get_project_filter(self, project: Project):
+        return {"project_id": [project.project_id]}
     
+    def get_payload_filters(self, project: Project, filters=None):
+        """
+        Maps the request search filters onto the indexed payload fields.
+        In shared tenancy the project filter is always added.
+        """
+        if filters is None:
+            filters = {}
+
+        if not isinstance(filters, dict):
+            filters = filters.dict()
+
+        payload_filters = {
+            "asset_id": filters.get("asset_ids"),
+            "metadata.source": filters.get("sources"),
+            "metadata.page": filters.get("pages"),
+        }
+
+        if self.is_shared_tenancy():
+            payload_filters.update(self.get_project_filter(project=project))
+
+        return {
+            field_name: values
+            for field_name, values in payload_filters.items()
+            if values
+        } or None
+
     def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
+        if self.is_shared_tenancy():
+            return self.vectordb_client.delete_by_filter(
+                collection_name=collection_name,
+                filters=self.get_project_filter(project=project),
+            )
         return self.vectordb_client.delete_collection(collection_name=collection_name)
     
     # الكود الصحيح مع المسافات البادئة
     def get_vector_db_collection_info(self, project: Project):
             collection_name = self.create_collection_name(project_id=project.project_id)
+
+            if self.is_shared_tenancy():
+                points_count = 0
+                if self.vectordb_client.is_collection_existed(collection_name):
+                    points_count = self.vectordb_client.count(
+                        collection_name=collection_name,
+                        filters=self.get_project_filter(project=project),
+                    )
+                return {
+                    "collection_name": collection_name,
+                    "points_count": points_count,
+                    "status": "indexed" if points_count else "not_indexed",
+                }
+
+            not_indexed = {
+                "vectors_count": 0,
+                "points_count": 0,
+                "status": "not_indexed"
+            }
+
+            # the local Qdrant client raises a ValueError on a missing collection, not a 404
+            if not self.vectordb_client.is_collection_existed(collection_name):
+                return not_indexed
+
             try:
                 collection_info = self.vectordb_client.get_collection_info(collection_name=collection_name)
-                return json.loads(
-                    json.dumps(collection_info, default=lambda x: x.__dict__)
-                )
-            except UnexpectedResponse as e:
-                if e.status_code == 404:
-                    return {
-                        "vectors_count": 0,
-                        "points_count": 0,
-                        "status": "not_indexed"
-                    }
+            except Exception as e:
+                # qdrant_client is only imported with the Qdrant backend
+                from qdrant_client.http.exceptions import UnexpectedResponse
+                if isinstance(e, UnexpectedResponse) and e.status_code == 404:
+                    return not_indexed
                 raise e
+
+            # the embedded backend returns None for a collection dropped in the meantime
+            if collection_info is None:
+                return not_indexed
+
+            return json.loads(
+                json.dumps(collection_info, default=lambda x: x.__dict__)
+            )
     
     
     def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
                                    chunks_ids: List[int], 
-                                   do_reset: bool = False):
+                                   do_reset: bool = False,
+                                   collection_name: str = None,
+                                   index_version: str = None):
         
         # step1: get collection name
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        if collection_name is None:
+            collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # the shared collection holds other projects too, only this project can be reset
+        if do_reset and self.is_shared_tenancy():
+            self.reset_vector_db_collection(project=project)
+            do_reset = False
 
         # step2: manage items
         texts = [ c.chunk_text for c in chunks ]
-        metadata = [ c.chunk_metadata for c in  chunks]
+        # chunk_order lets the context packing merge neighbouring chunks back together
+        metadata = [ {**c.chunk_metadata, "chunk_order": c.chunk_order} for c in chunks ]
+        asset_ids = [ str(c.chunk_asset_id) for c in chunks ]
         # Generate dense vectors (existing logic)
-        dense_vectors = [
-            self.embedding_client.embed_text(text=text, 
-                                             document_type=DocumentTypeEnum.DOCUMENT.value)
-            for text in texts
-        ]
+        with track_stage("dense_embed", get_backend_name(self.embedding_client)):
+            dense_vectors = [
+                self.embedding_client.embed_text(text=text, 
+                                                 document_type=DocumentTypeEnum.DOCUMENT.value)
+                for text in texts
+            ]
         
         EMBEDDINGS_COUNT.inc(len(dense_vectors))
-        # Generate sparse vectors (new logic)
-        sparse_vectors = [
-            self.sparse_embedding_client.generate_sparse_vector(text=text)
-            for text in texts
-        ]
+        # Generate sparse vectors, the whole page goes through SPLADE in padded batches
+        with track_stage("sparse_encode", get_backend_name(self.sparse_embedding_client)):
+            sparse_vectors = self.sparse_embedding_client.generate_sparse_vectors(
+                texts=texts,
+                document_type=DocumentTypeEnum.DOCUMENT.value,
+            )
         
         SPARSE_EMBEDDINGS_COUNT.inc(len(sparse_vectors))
 
@@ -80,136 +198,447 @@ class NLPController(BaseController):
         )
 
         # Pass both vector types to the insert function
-        _ = self.vectordb_client.insert_many(
-            collection_name=collection_name,
-            texts=texts,
-            metadata=metadata,
-            dense_vectors=dense_vectors, # Changed from "vectors"
-            sparse_vectors=sparse_vectors, # Add this
-            record_ids=chunks_ids,
-        )
+        with track_stage("vector_upsert", get_backend_name(self.vectordb_client)):
+            is_inserted = self.vectordb_client.insert_many(
+                collection_name=collection_name,
+                texts=texts,
+                metadata=metadata,
+                dense_vectors=dense_vectors, # Changed from "vectors"
+                sparse_vectors=sparse_vectors, # Add this
+                record_ids=self.create_record_ids(project=project, chunks_ids=chunks_ids,
+                                                  index_version=index_version),
+                asset_ids=asset_ids,
+                project_id=project.project_id,
+                index_version=index_version,
+            )
 
-        return True
+        return is_inserted
 
     
     
     
-    async def reindex_project(self, project: Project, chunk_model: ChunkModel):
+    async def index_project_chunks(self, project: Project, chunk_model: ChunkModel,
+                                         collection_name: str, index_version: str):
         """
-        Deletes the entire vector collection and re-indexes all chunks
-        from MongoDB for a given project.
+        Indexes every chunk of the project page by page into `collection_name`.
+        Returns the number of indexed chunks, or None if a page failed.
+        A page fills every parallel upload of the vector DB with a full batch.
         """
-        logger.info(f"Starting auto re-indexing for project: {project.project_id}")
-
-        has_records = True
+        page_size = self.app_settings.VECTOR_DB_UPLOAD_BATCH_SIZE * max(1, self.app_settings.VECTOR_DB_UPLOAD_PARALLEL)
         page_no = 1
         inserted_items_count = 0
-        is_first_batch = True
 
-        while has_records:
-            page_chunks = await chunk_model.get_project_chunks(project_id=project.id, page_no=page_no)
-            
+        while True:
+            with track_stage("chunk_fetch", "mongodb"):
+                page_chunks = await chunk_model.get_project_chunks(project_id=project.id, page_no=page_no,
+                                                                   page_size=page_size)
+
             if not page_chunks or len(page_chunks) == 0:
-                has_records = False
-                # If no chunks are left, ensure the vector collection is cleared.
-                if is_first_batch:
-                    collection_name = self.create_collection_name(project_id=project.project_id)
-                    self.vectordb_client.delete_collection(collection_name=collection_name)
-                    logger.warning(f"Project {project.project_id} has no chunks. Vector DB collection cleared.")
                 break
 
             page_no += 1
             chunks_ids = list(range(inserted_items_count, inserted_items_count + len(page_chunks)))
 
-            self.index_into_vector_db(
+            is_inserted = self.index_into_vector_db(
                 project=project,
                 chunks=page_chunks,
-                do_reset=is_first_batch,
-                chunks_ids=chunks_ids
+                chunks_ids=chunks_ids,
+                collection_name=collection_name,
+                index_version=index_version,
             )
 
-            is_first_batch = False
+            if not is_inserted:
+                return None
+
             inserted_items_count += len(page_chunks)
 
+        return inserted_items_count
+
+    async def reindex_project(self, project: Project, chunk_model: ChunkModel, project_model=None):
+        """
+        Re-indexes the project under its reindex lease (see build_project_index),
+        so two workers never rebuild the same project at once: the second one
+        waits and then rebuilds from the chunks as the first one left them.
+        Without a project_model the rebuild runs unserialised.
+        """
+        if project_model is None:
+            return await self.build_project_index(project=project, chunk_model=chunk_model)
+
+        owner = uuid.uuid4().hex
+        ttl_seconds = self.app_settings.REINDEX_LOCK_TTL_SECONDS
+        # the lease expires after ttl_seconds, so a crashed holder blocks the others only that long
+        while not await project_model.acquire_reindex_lock(project=project, owner=owner,
+                                                           ttl_seconds=ttl_seconds):
+            await asyncio.sleep(self.app_settings.REINDEX_LOCK_POLL_SECONDS)
+
+        try:
+            return await self.build_project_index(project=project, chunk_model=chunk_model)
+        finally:
+            await project_model.release_reindex_lock(project=project, owner=owner)
+
+    async def build_project_index(self, project: Project, chunk_model: ChunkModel):
+        """
+        Re-indexes all chunks from MongoDB for a given project (blue/green).
+
+        The new index is built into a versioned collection while searches keep
+        hitting the current one through the project alias. Once the build is
+        complete the alias is switched atomically and the old collection dropped.
+        Returns the number of indexed chunks, or None if the build failed
+        (in which case the previous index keeps serving).
+        """
+        logger.info(f"Starting auto re-indexing for project: {project.project_id}")
+
+        if self.is_shared_tenancy():
+            inserted_items_count = await self.reindex_shared_project(project=project, chunk_model=chunk_model)
+            logger.info(f"Finished auto re-indexing for project: {project.project_id}. Total chunks indexed: {inserted_items_count}")
+            return inserted_items_count
+
+        index_version = self.create_index_version()
+        alias_name = self.create_collection_name(project_id=project.project_id)
+        collection_name = self.create_versioned_collection_name(project_id=project.project_id,
+                                                                index_version=index_version)
+
+        try:
+            inserted_items_count = await self.index_project_chunks(
+                project=project,
+                chunk_model=chunk_model,
+                collection_name=collection_name,
+                index_version=index_version,
+            )
+        except Exception:
+            self.vectordb_client.delete_collection(collection_name=collection_name)
+            raise
+
+        if inserted_items_count is None:
+            logger.error(f"Re-indexing failed for project: {project.project_id}, keeping the previous index")
+            self.vectordb_client.delete_collection(collection_name=collection_name)
+            return None
+
+        # If no chunks are left, ensure the vector collection is cleared.
+        if inserted_items_count == 0:
+            self.vectordb_client.delete_collection(collection_name=alias_name)
+            logger.warning(f"Project {project.project_id} has no chunks. Vector DB collection cleared.")
+            return inserted_items_count
+
+        previous_collection = self.vectordb_client.switch_alias(
+            alias_name=alias_name,
+            collection_name=collection_name,
+        )
+
+        if previous_collection and previous_collection != collection_name:
+            self.vectordb_client.delete_collection(collection_name=previous_collection)
+
         logger.info(f"Finished auto re-indexing for project: {project.project_id}. Total chunks indexed: {inserted_items_count}")
         return inserted_items_count
-    
-    def search_hybrid_collection(self, project: Project, text: str, 
-                                 dense_limit: int, sparse_limit: int, limit: int):
-        
+
+    async def reindex_shared_project(self, project: Project, chunk_model: ChunkModel):
+        """
+        Shared tenancy variant: the new points are written next to the old ones
+        under a new index_version, then the project's points of any other
+        version are deleted by filter. A failed build only removes its own points.
+        """
+        index_version = self.create_index_version()
         collection_name = self.create_collection_name(project_id=project.project_id)
+        project_filter = self.get_project_filter(project=project)
 
-        # Step 1: Generate dense vector for the query
-        dense_vector = self.embedding_client.embed_text(
-            text=text, 
-            document_type=DocumentTypeEnum.QUERY.value
-        )
-        if not dense_vector:
-            return None
+        try:
+            inserted_items_count = await self.index_project_chunks(
+                project=project,
+                chunk_model=chunk_model,
+                collection_name=collection_name,
+                index_version=index_version,
+            )
+        except Exception:
+            self.vectordb_client.delete_by_filter(
+                collection_name=collection_name,
+                filters={**project_filter, "index_version": [index_version]},
+            )
+            raise
 
-        # Step 2: Generate sparse vector for the query
-        sparse_vector = self.sparse_embedding_client.generate_sparse_vector(text=text)
-        if not sparse_vector:
+        if inserted_items_count is None:
+            logger.error(f"Re-indexing failed for project: {project.project_id}, keeping the previous index")
+            self.vectordb_client.delete_by_filter(
+                collection_name=collection_name,
+                filters={**project_filter, "index_version": [index_version]},
+            )
             return None
-        
-        # Step 3: Perform hybrid search
-        results = self.vectordb_client.search_hybrid(
+
+        if not self.vectordb_client.is_collection_existed(collection_name):
+            return inserted_items_count
+
+        self.vectordb_client.delete_by_filter(
             collection_name=collection_name,
-            dense_vector=dense_vector,
-            sparse_vector=sparse_vector,
-            dense_limit=dense_limit,
-            sparse_limit=sparse_limit,
-            limit=limit
+            filters=project_filter,
+            exclude_filters={"index_version": [index_version]},
         )
 
-        return results
+        if inserted_items_count == 0:
+            logger.warning(f"Project {project.project_id} has no chunks. Vector DB points cleared.")
+
+        return inserted_items_count
     
-    def search_hybrid_with_rerank(self, project: Project, text: str, 
-                                  dense_limit: int, sparse_limit: int, 
-                                  rerank_limit: int):
+    async def run_with_timeout(self, awaitable, timeout: float, side: str):
+        try:
+            return await asyncio.wait_for(awaitable, timeout=timeout or None)
+        except Exception as e:
+            logger.warning(f"{side} query encoding failed: {e!r}")
+            return None
+
+    async def encode_query_hybrid(self, text: str, dense_vector: list = None, sparse_vector: dict = None):
+        """
+        Computes the dense (remote embedding API) and sparse (local SPLADE, in an
+        executor) query vectors concurrently, each under its own timeout.
+        A side that fails or times out comes back as None.
+        """
+        async def encode_dense():
+            if dense_vector is not None:
+                return dense_vector
+            with track_stage("dense_embed", get_backend_name(self.embedding_client)):
+                return await self.embedding_client.embed_text_async(text=text,
+                                                                    document_type=DocumentTypeEnum.QUERY.value)
+
+        async def encode_sparse():
+            if sparse_vector is not None:
+                return sparse_vector
+            with track_stage("sparse_encode", get_backend_name(self.sparse_embedding_client)):
+                return await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                    self.sparse_embedding_client.generate_sparse_vector,
+                    text=text,
+                    document_type=DocumentTypeEnum.QUERY.value,
+                ))
+
+        dense, sparse = await asyncio.gather(
+            self.run_with_timeout(encode_dense(), self.app_settings.QUERY_DENSE_TIMEOUT_SECONDS, "dense"),
+            self.run_with_timeout(encode_sparse(), self.app_settings.QUERY_SPARSE_TIMEOUT_SECONDS, "sparse"),
+        )
+
+        return dense or None, sparse or None
+
+    async def search_hybrid_collection(self, project: Project, text: str, 
+                                       dense_limit: int, sparse_limit: int, limit: int,
+                                       dense_vector: list = None, sparse_vector: dict = None,
+                                       filters=None):
+        
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        payload_filters = self.get_payload_filters(project=project, filters=filters)
+
+        # Step 1: Generate the dense and sparse query vectors concurrently (unless the caller already did)
+        dense_vector, sparse_vector = await self.encode_query_hybrid(text=text, dense_vector=dense_vector,
+                                                                     sparse_vector=sparse_vector)
+
+        if not dense_vector and not sparse_vector:
+            return None
+
+        # Step 2: Perform hybrid search, or search with the side that is left
+        with track_stage("vector_query", get_backend_name(self.vectordb_client)):
+            return await self.search_available_vectors(
+                collection_name=collection_name,
+                dense_vector=dense_vector,
+                sparse_vector=sparse_vector,
+                dense_limit=dense_limit,
+                sparse_limit=sparse_limit,
+                limit=limit,
+                payload_filters=payload_filters,
+            )
+
+    async def search_available_vectors(self, collection_name: str, dense_vector: list, sparse_vector: dict,
+                                 dense_limit: int, sparse_limit: int, limit: int, payload_filters=None):
+        """
+        Hybrid search when both query vectors are there, otherwise the side that is left.
+        """
+        if dense_vector and sparse_vector:
+            return await self.query_vector_db(
+                "search_hybrid",
+                collection_name=collection_name,
+                dense_vector=dense_vector,
+                sparse_vector=sparse_vector,
+                dense_limit=dense_limit,
+                sparse_limit=sparse_limit,
+                limit=limit,
+                filters=payload_filters,
+            )
+
+        if dense_vector:
+            HYBRID_SEARCH_FALLBACKS.labels(mode="dense_only").inc()
+            return await self.query_vector_db(
+                "search_by_vector",
+                collection_name=collection_name,
+                vector=dense_vector,
+                limit=limit,
+                filters=payload_filters,
+            )
+
+        if sparse_vector:
+            HYBRID_SEARCH_FALLBACKS.labels(mode="sparse_only").inc()
+            return await self.query_vector_db(
+                "search_by_sparse_vector",
+                collection_name=collection_name,
+                sparse_vector=sparse_vector,
+                limit=limit,
+                filters=payload_filters,
+            )
+
+        return None
+    
+    async def encode_queries_hybrid(self, texts: List[str]):
+        """
+        Batched encode_query_hybrid: one embedding API call and one SPLADE pass
+        for all the texts. The per query timeouts do not apply to a batch.
+        """
+        async def encode_dense():
+            with track_stage("dense_embed", get_backend_name(self.embedding_client)):
+                return await self.embedding_client.embed_texts_async(texts=texts,
+                                                                     document_type=DocumentTypeEnum.QUERY.value)
+
+        async def encode_sparse():
+            with track_stage("sparse_encode", get_backend_name(self.sparse_embedding_client)):
+                return await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                    self.sparse_embedding_client.generate_sparse_vectors,
+                    texts=texts,
+                    document_type=DocumentTypeEnum.QUERY.value,
+                ))
+
+        dense_vectors, sparse_vectors = await asyncio.gather(
+            self.run_with_timeout(encode_dense(), None, "dense"),
+            self.run_with_timeout(encode_sparse(), None, "sparse"),
+        )
+
+        return dense_vectors or None, sparse_vectors or None
+
+    async def search_hybrid_collection_batch(self, project: Project, texts: List[str],
+                                             dense_limit: int, sparse_limit: int, limit: int,
+                                             filters=None):
+        """
+        Hybrid search of many queries in one vector db round trip,
+        the results come back in the order of `texts`.
+        """
+        dense_vectors, sparse_vectors = await self.encode_queries_hybrid(texts=texts)
+
+        if not dense_vectors and not sparse_vectors:
+            return None
+
+        if not sparse_vectors:
+            HYBRID_SEARCH_FALLBACKS.labels(mode="dense_only").inc()
+        elif not dense_vectors:
+            HYBRID_SEARCH_FALLBACKS.labels(mode="sparse_only").inc()
+
+        with track_stage("vector_query", get_backend_name(self.vectordb_client)):
+            return await self.query_vector_db(
+                "search_batch",
+                collection_name=self.create_collection_name(project_id=project.project_id),
+                dense_vectors=dense_vectors,
+                sparse_vectors=sparse_vectors,
+                dense_limit=dense_limit,
+                sparse_limit=sparse_limit,
+                limit=limit,
+                filters=self.get_payload_filters(project=project, filters=filters),
+            )
+
+    async def search_hybrid_with_rerank(self, project: Project, text: str, 
+                                        dense_limit: int, sparse_limit: int, 
+                                        rerank_limit: int, dense_vector: list = None,
+                                        sparse_vector: dict = None, filters=None):
         
+        # at least one candidate past the limit, so the score gap can be told from the start
+        max_pool = max(self.app_settings.RERANK_POOL_MAX, rerank_limit)
+        min_pool = min(max(self.app_settings.RERANK_POOL_MIN, rerank_limit + 1), max_pool)
+
         # Step 1: Perform an initial hybrid search to get candidate documents.
-        # We fetch more documents than needed (e.g., 25) to give the reranker a good selection.
-        initial_candidates = self.search_hybrid_collection(
+        # The whole pool is fetched at once, only the cross-encoding is incremental.
+        initial_candidates = await self.search_hybrid_collection(
             project=project,
             text=text,
             dense_limit=dense_limit,
             sparse_limit=sparse_limit,
-            limit=rerank_limit * 3  # Fetch more candidates for reranking
+            limit=max_pool,
+            dense_vector=dense_vector,
+            sparse_vector=sparse_vector,
+            filters=filters,
         )
 
         if not initial_candidates:
             return None
 
-        # Step 2: Rerank the candidates using the Cross-Encoder model.
+        # Step 2: Rerank the candidates using the Cross-Encoder model,
+        # going deeper into the pool only while the top-k boundary is unclear.
         # The documents need to be converted to dicts for the reranker.
         candidate_dicts = [doc.dict() for doc in initial_candidates]
-        reranked_results = self.reranker_client.rerank_documents(
-            query=text,
-            documents=candidate_dicts
-        )
+        with track_stage("rerank", get_backend_name(self.reranker_client)):
+            reranked_results = await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                self.rerank_adaptive,
+                query=text,
+                candidates=candidate_dicts,
+                rerank_limit=rerank_limit,
+                min_pool=min_pool,
+            ))
 
         # Step 3: Return the top N results after reranking.
         return reranked_results[:rerank_limit]
+
+    def rerank_adaptive(self, query: str, candidates: List[dict], rerank_limit: int, min_pool: int):
+        """
+        Cross-encodes the first `min_pool` first-stage candidates, then
+        RERANK_POOL_STEP more at a time until the candidates run out or:
+        - the k-th rerank score leads the (k+1)-th by RERANK_SCORE_GAP or more
+          (0 disables it), the top `rerank_limit` is clearly separated
+        - a step left the top `rerank_limit` unchanged
+        """
+        step = max(self.app_settings.RERANK_POOL_STEP, 1)
+        score_gap = self.app_settings.RERANK_SCORE_GAP
+
+        def is_separated(ranked: List[dict]):
+            if score_gap <= 0 or rerank_limit < 1 or len(ranked) <= rerank_limit:
+                return False
+            return ranked[rerank_limit - 1]['rerank_score'] - ranked[rerank_limit]['rerank_score'] >= score_gap
+
+        def top_k(documents: List[dict]):
+            ranked = sorted(documents, key=lambda x: x['rerank_score'], reverse=True)
+            return ranked, [ id(doc) for doc in ranked[:rerank_limit] ]
+
+        def score(documents: List[dict]):
+            scores = self.reranker_client.score_pairs(query=query, texts=[doc['text'] for doc in documents])
+            for doc, doc_score in zip(documents, scores):
+                doc['rerank_score'] = float(doc_score)
+
+        depth = min(max(min_pool, 1), len(candidates))
+        score(candidates[:depth])
+        ranked, top_ids = top_k(candidates[:depth])
+
+        while depth < len(candidates) and not is_separated(ranked):
+            next_depth = min(depth + step, len(candidates))
+            score(candidates[depth:next_depth])
+            depth = next_depth
+
+            ranked, next_top_ids = top_k(candidates[:depth])
+            if set(next_top_ids) == set(top_ids):
+                break
+            top_ids = next_top_ids
+
+        RERANK_DEPTH.observe(depth)
+        return ranked
     
-    def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                    vector: list = None, filters=None):
 
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
 
-        # step2: get text embedding vector
-        vector = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        # step2: get text embedding vector (unless the caller already did)
+        if vector is None:
+            vector = await self.embed_query(text=text)
 
         if not vector or len(vector) == 0:
             return False
 
         # step3: do semantic search
-        results = self.vectordb_client.search_by_vector(
-            collection_name=collection_name,
-            vector=vector,
-            limit=limit
-        )
+        with track_stage("vector_query", get_backend_name(self.vectordb_client)):
+            results = await self.query_vector_db(
+                "search_by_vector",
+                collection_name=collection_name,
+                vector=vector,
+                limit=limit,
+                filters=self.get_payload_filters(project=project, filters=filters),
+            )
 
         if not results:
             return False
@@ -218,15 +647,111 @@ class NLPController(BaseController):
     
 
 
-    def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 10,
+                                          filters=None):
+        """
+        Semantic search of many queries with one embedding call and one
+        vector db round trip, the results come back in the order of `texts`.
+        """
+        with track_stage("dense_embed", get_backend_name(self.embedding_client)):
+            vectors = await self.embedding_client.embed_texts_async(texts=texts,
+                                                                    document_type=DocumentTypeEnum.QUERY.value)
+        if not vectors:
+            return False
+
+        with track_stage("vector_query", get_backend_name(self.vectordb_client)):
+            return await self.query_vector_db(
+                "search_batch",
+                collection_name=self.create_collection_name(project_id=project.project_id),
+                dense_vectors=vectors,
+                limit=limit,
+                filters=self.get_payload_filters(project=project, filters=filters),
+            )
+
+    async def embed_query(self, text: str):
+        with track_stage("dense_embed", get_backend_name(self.embedding_client)):
+            return await self.embedding_client.embed_text_async(text=text,
+                                                                document_type=DocumentTypeEnum.QUERY.value)
+
+    def get_cached_answer(self, project: Project, mode: str, scope: str, query_vector: list):
+        """
+        Looks up an answer to a semantically equivalent query asked earlier
+        against the same index generation of the project.
+        """
+        if self.answer_cache is None or not query_vector:
+            return None
+
+        entry = self.answer_cache.lookup(
+            project_id=project.project_id,
+            scope=scope,
+            generation=project.index_generation,
+            vector=query_vector,
+        )
+
+        ANSWER_CACHE_LOOKUPS.labels(mode=mode, result="hit" if entry else "miss").inc()
+
+        if entry is None:
+            return None
+
+        return entry["answer"], entry["full_prompt"], entry["chat_history"]
+
+    def cache_answer(self, project: Project, scope: str, query_vector: list,
+                           answer: str, full_prompt: str, chat_history: list):
+        if self.answer_cache is None or not query_vector or not answer:
+            return False
+
+        return self.answer_cache.store(
+            project_id=project.project_id,
+            scope=scope,
+            generation=project.index_generation,
+            vector=query_vector,
+            answer=answer,
+            full_prompt=full_prompt,
+            chat_history=chat_history,
+        )
+
+    @track_stage("prompt_assembly")
+    def build_rag_prompt(self, query: str, documents: list):
+        """
+        Returns the user prompt (packed documents + footer) and the chat history
+        holding the system prompt.
+        """
+        system_prompt = self.template_parser.get("rag", "system_prompt")
+
+        documents_prompts, footer_prompt = ContextController(
+            template_parser=self.template_parser
+        ).build_context(query=query, documents=documents)
+
+        chat_history = [
+            self.generation_client.construct_prompt(
+                prompt=system_prompt,
+                role=self.generation_client.enums.SYSTEM.value,
+            )
+        ]
+
+        full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
+        return full_prompt, chat_history
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  filters=None):
         
         answer, full_prompt, chat_history = None, None, None
 
+        # step0: serve paraphrases of recently answered questions from the cache
+        scope = f"rag:{limit}:{self.get_payload_filters(project=project, filters=filters)}"
+        query_vector = await self.embed_query(text=query) if self.answer_cache is not None else None
+        cached = self.get_cached_answer(project=project, mode="rag", scope=scope,
+                                        query_vector=query_vector)
+        if cached:
+            return cached
+
         # step1: retrieve related documents
-        retrieved_documents = self.search_vector_db_collection(
+        retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit,
+            vector=query_vector,
+            filters=filters,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
@@ -237,53 +762,45 @@ class NLPController(BaseController):
         average_score = total_score / len(retrieved_documents) if retrieved_documents else 0
         # ====================================
 
-        # step2: Construct LLM prompt
-        system_prompt = self.template_parser.get("rag", "system_prompt")
-
-        documents_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    "chunk_text": doc.text,
-            })
-            for idx, doc in enumerate(retrieved_documents)
-        ])
-
-        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-            "query": query
-        })
-
-        # step3: Construct Generation Client Prompts
-        chat_history = [
-            self.generation_client.construct_prompt(
-                prompt=system_prompt,
-                role=self.generation_client.enums.SYSTEM.value,
-            )
-        ]
-
-        full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
+        # step2: Construct LLM prompt within the context budget
+        full_prompt, chat_history = self.build_rag_prompt(query=query, documents=retrieved_documents)
 
         # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
+        with track_stage("llm_generation", get_backend_name(self.generation_client)):
+            answer = await self.generation_client.generate_text_async(
+                prompt=full_prompt,
+                chat_history=chat_history
+            )
         ANSWER_CONFIDENCE.observe(average_score)
+        self.cache_answer(project=project, scope=scope, query_vector=query_vector,
+                          answer=answer, full_prompt=full_prompt, chat_history=chat_history)
         return answer, full_prompt, chat_history
     
 
-    def answer_rag_question_hybrid(self, project: Project, query: str, 
-                                   dense_limit: int, sparse_limit: int, 
-                                   limit: int):
+    async def answer_rag_question_hybrid(self, project: Project, query: str, 
+                                         dense_limit: int, sparse_limit: int, 
+                                         limit: int, filters=None):
         
         answer, full_prompt, chat_history = None, None, None
 
+        # Step 0: Serve paraphrases of recently answered questions from the cache
+        scope = f"hybrid:{dense_limit}:{sparse_limit}:{limit}:{self.get_payload_filters(project=project, filters=filters)}"
+        query_vector, sparse_vector = await self.encode_query_hybrid(text=query)
+        cached = self.get_cached_answer(project=project, mode="hybrid", scope=scope,
+                                        query_vector=query_vector)
+        if cached:
+            return cached
+
         # Step 1: Retrieve related documents using HYBRID SEARCH
-        retrieved_documents = self.search_hybrid_collection(
+        retrieved_documents = await self.search_hybrid_collection(
             project=project,
             text=query,
             dense_limit=dense_limit,
             sparse_limit=sparse_limit,
             limit=limit,
+            dense_vector=query_vector,
+            sparse_vector=sparse_vector,
+            filters=filters,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
@@ -294,52 +811,44 @@ class NLPController(BaseController):
         average_score = total_score / len(retrieved_documents) if retrieved_documents else 0
         # ====================================
 
-        # Step 2: Construct LLM prompt (This logic remains the same)
-        system_prompt = self.template_parser.get("rag", "system_prompt")
-
-        documents_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    "chunk_text": doc.text,
-            })
-            for idx, doc in enumerate(retrieved_documents)
-        ])
-
-        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-            "query": query
-        })
-
-        # Step 3: Construct Generation Client Prompts (This logic remains the same)
-        chat_history = [
-            self.generation_client.construct_prompt(
-                prompt=system_prompt,
-                role=self.generation_client.enums.SYSTEM.value,
-            )
-        ]
-
-        full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
+        # step2: Construct LLM prompt within the context budget
+        full_prompt, chat_history = self.build_rag_prompt(query=query, documents=retrieved_documents)
 
         # Step 4: Retrieve the Answer (This logic remains the same)
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
+        with track_stage("llm_generation", get_backend_name(self.generation_client)):
+            answer = await self.generation_client.generate_text_async(
+                prompt=full_prompt,
+                chat_history=chat_history
+            )
         ANSWER_CONFIDENCE.observe(average_score)
+        self.cache_answer(project=project, scope=scope, query_vector=query_vector,
+                          answer=answer, full_prompt=full_prompt, chat_history=chat_history)
         return answer, full_prompt, chat_history
     
-    def answer_rag_question_hybrid_cross(self, project: Project, query: str, 
-                                         dense_limit: int, sparse_limit: int, 
-                                         limit: int):
+    async def answer_rag_question_hybrid_cross(self, project: Project, query: str, 
+                                               dense_limit: int, sparse_limit: int, 
+                                               limit: int, filters=None):
         
         answer, full_prompt, chat_history = None, None, None
 
+        # Step 0: Serve paraphrases of recently answered questions from the cache
+        scope = f"hybrid_cross:{dense_limit}:{sparse_limit}:{limit}:{self.get_payload_filters(project=project, filters=filters)}"
+        query_vector, sparse_vector = await self.encode_query_hybrid(text=query)
+        cached = self.get_cached_answer(project=project, mode="hybrid_cross", scope=scope,
+                                        query_vector=query_vector)
+        if cached:
+            return cached
+
         # Step 1: Retrieve the best possible documents using hybrid search + reranker
-        reranked_documents = self.search_hybrid_with_rerank(
+        reranked_documents = await self.search_hybrid_with_rerank(
             project=project,
             text=query,
             dense_limit=dense_limit,
             sparse_limit=sparse_limit,
             rerank_limit=limit, # Use the final limit for the reranker
+            dense_vector=query_vector,
+            sparse_vector=sparse_vector,
+            filters=filters,
         )
 
         if not reranked_documents or len(reranked_documents) == 0:
@@ -349,36 +858,16 @@ class NLPController(BaseController):
         total_score = sum(doc['rerank_score'] for doc in reranked_documents)
         average_score = total_score / len(reranked_documents) if reranked_documents else 0
         # ====================================
-        # Step 2: Construct LLM prompt (Same logic as before)
-        system_prompt = self.template_parser.get("rag", "system_prompt")
-
-        # The reranked_documents are already dicts, so we access text with ['text']
-        documents_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    "chunk_text": doc['text'],
-            })
-            for idx, doc in enumerate(reranked_documents)
-        ])
-
-        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-            "query": query
-        })
-
-        # Step 3: Construct Generation Client Prompts (Same logic as before)
-        chat_history = [
-            self.generation_client.construct_prompt(
-                prompt=system_prompt,
-                role=self.generation_client.enums.SYSTEM.value,
-            )
-        ]
-
-        full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
+        # step2: Construct LLM prompt within the context budget
+        full_prompt, chat_history = self.build_rag_prompt(query=query, documents=reranked_documents)
 
         # Step 4: Retrieve the Answer (Same logic as before)
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
+        with track_stage("llm_generation", get_backend_name(self.generation_client)):
+            answer = await self.generation_client.generate_text_async(
+                prompt=full_prompt,
+                chat_history=chat_history
+            )
         ANSWER_CONFIDENCE.observe(average_score)
+        self.cache_answer(project=project, scope=scope, query_vector=query_vector,
+                          answer=answer, full_prompt=full_prompt, chat_history=chat_history)
         return answer, full_prompt, chat_history
\ No newline at end of file
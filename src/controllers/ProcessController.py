@@ -1,12 +1,40 @@
 from .BaseController import BaseController
-from langchain_community.document_loaders import PyPDFLoader, TextLoader, Docx2txtLoader, UnstructuredExcelLoader, PDFPlumberLoader
-from langchain_community.document_loaders import UnstructuredWordDocumentLoader  
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from ..models import ProcessingEnum
 from .ProjectController import ProjectController
+from functools import lru_cache
+import importlib
 import os
 from ..utils.metrics import DOCS_INDEXED, CHUNKS_PER_QUERY 
 
+# extension -> loaders to try in order, as (module, class). langchain_community
+# and unstructured are heavy, a loader is imported the first time its file
+# type is processed instead of with the app.
+FILE_LOADERS = {
+    ProcessingEnum.PDF.value: [
+        ("langchain_community.document_loaders.pdf", "PDFPlumberLoader"),
+        ("langchain_community.document_loaders.pdf", "PyPDFLoader"),
+    ],
+    ProcessingEnum.TXT.value: [
+        ("langchain_community.document_loaders.text", "TextLoader"),
+    ],
+    ProcessingEnum.DOCX.value: [
+        ("langchain_community.document_loaders.word_document", "UnstructuredWordDocumentLoader"),
+    ],
+    ProcessingEnum.DOC.value: [
+        ("langchain_community.document_loaders.word_document", "Docx2txtLoader"),
+    ],
+    ProcessingEnum.XLS.value: [
+        ("langchain_community.document_loaders.excel", "UnstructuredExcelLoader"),
+    ],
+    ProcessingEnum.XLSX.value: [
+        ("langchain_community.document_loaders.excel", "UnstructuredExcelLoader"),
+    ],
+}
+
+@lru_cache(maxsize=None)
+def import_class(module_name: str, class_name: str):
+    return getattr(importlib.import_module(module_name), class_name)
+
 class ProcessController(BaseController):
     """Controller for processing files."""
     
@@ -26,20 +54,19 @@ class ProcessController(BaseController):
             file_id
         )
         """Process the file based on its type."""
-        if file_ext == ProcessingEnum.PDF.value:
+        loaders = FILE_LOADERS.get(file_ext)
+        if not loaders:
+            raise ValueError(f"Unsupported file type: {file_ext}")
+
+        # the next loader is the fallback when one can not be created
+        for module_name, class_name in loaders[:-1]:
             try:
-                return PDFPlumberLoader(file_path)
-            except:
-                return PyPDFLoader(file_path)
-        if file_ext == ProcessingEnum.TXT.value:
-            return  TextLoader(file_path)
-        if file_ext == ProcessingEnum.DOCX.value:
-            return  UnstructuredWordDocumentLoader(file_path)
-        if file_ext == ProcessingEnum.DOC.value:
-            return  Docx2txtLoader(file_path)
-        if file_ext == ProcessingEnum.XLS.value or file_ext == ProcessingEnum.XLSX.value:
-            return  UnstructuredExcelLoader(file_path)
-        raise ValueError(f"Unsupported file type: {file_ext}")
+                return import_class(module_name, class_name)(file_path)
+            except Exception:
+                continue
+
+        module_name, class_name = loaders[-1]
+        return import_class(module_name, class_name)(file_path)
         
     def get_file_content(self, file_id: str):
 
@@ -49,6 +76,7 @@ class ProcessController(BaseController):
     def process_file_content(self, file_content: list, file_id: str,
                             chunk_size: int=400, overlap_size: int=30):
 
+        RecursiveCharacterTextSplitter = import_class("langchain_text_splitters", "RecursiveCharacterTextSplitter")
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=overlap_size,
@@ -31,15 +31,82 @@ class Settings(BaseSettings):
     COHERE_API_KEY: str = None
     GEMINI_API_KEY: str = None
 
+    # FAKE backend (offline benchmarks): simulated API round trip per call
+    FAKE_EMBEDDING_LATENCY_MS: int = 0
+    FAKE_GENERATION_LATENCY_MS: int = 0
+
+    # LLM usage per project, written to Mongo every USAGE_FLUSH_INTERVAL_SECONDS
+    USAGE_TRACKING_ENABLED: bool = True
+    USAGE_FLUSH_INTERVAL_SECONDS: float = 10.0
+    # USD per million tokens: {"model_id": {"prompt": 0.15, "completion": 0.6}}
+    LLM_TOKEN_PRICES: dict = {}
+
+    # one reindex per project at a time across workers, a lease held longer is taken over
+    REINDEX_LOCK_TTL_SECONDS: float = 600.0
+    REINDEX_LOCK_POLL_SECONDS: float = 0.5
+
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
+
+    CONTEXT_MAX_TOKENS: int = 3000
+    CONTEXT_MIN_PASSAGE_TOKENS: int = 50
+    CONTEXT_MIN_OVERLAP_CHARACTERS: int = 10
+    CONTEXT_TOKEN_ENCODING: str = "o200k_base"
     
     SPLADE_MODEL_ID: str
     RERANKER_MODEL_ID: str
+    RERANKER_BATCH_SIZE: int = 32
+    RERANKER_MAX_LENGTH: int = 512
+    RERANKER_CACHE_SIZE: int = 4096
+    RERANK_POOL_MIN: int = 6
+    RERANK_POOL_MAX: int = 15
+    RERANK_POOL_STEP: int = 3
+    RERANK_SCORE_GAP: float = 1.0
+
+    # SPLADE and the reranker load concurrently at startup and run one
+    # warm-up batch of this size (0 disables it)
+    MODEL_WARMUP_BATCH_SIZE: int = 8
+    # serve while the models load, their routes answer 503 until ready
+    MODELS_BACKGROUND_LOADING: bool = False
+
+    # admission control, per worker: answer_* generations (interactive) and
+    # indexing runs (ingestion) each get their own slots and wait queue, a
+    # max concurrency of 0 disables the limit
+    ADMISSION_INTERACTIVE_MAX_CONCURRENCY: int = 8
+    ADMISSION_INTERACTIVE_MAX_QUEUE: int = 32
+    ADMISSION_INTERACTIVE_MAX_WAIT_SECONDS: float = 10.0
+    ADMISSION_INGESTION_MAX_CONCURRENCY: int = 2
+    ADMISSION_INGESTION_MAX_QUEUE: int = 8
+    ADMISSION_INGESTION_MAX_WAIT_SECONDS: float = 60.0
+
+    QUERY_DENSE_TIMEOUT_SECONDS: float = 5.0
+    QUERY_SPARSE_TIMEOUT_SECONDS: float = 5.0
+
+    BATCH_SEARCH_MAX_QUERIES: int = 256
+
+    SPARSE_DOC_TOP_K: int = 0
+    SPARSE_DOC_MIN_WEIGHT: float = 0.0
+    SPARSE_QUERY_TOP_K: int = 0
+    SPARSE_QUERY_MIN_WEIGHT: float = 0.0
+    SPARSE_QUANTIZE_UINT8: bool = False
+    SPARSE_QUANTIZATION_MAX_WEIGHT: float = 5.0
+
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_QUANTIZE_INT8: bool = True
+    ONNX_NUM_THREADS: int = 0
+
+    # shared inference server (python -m src.inference_server), empty keeps
+    # the models in each worker
+    INFERENCE_SERVER_SOCKET: str = ""
+    INFERENCE_SERVER_MAX_BATCH_SIZE: int = 64
+    INFERENCE_SERVER_MAX_WAIT_MS: float = 5.0
+    INFERENCE_SERVER_POOL_SIZE: int = 8
+    INFERENCE_SERVER_TIMEOUT_SECONDS: float = 30.0
+    INFERENCE_SERVER_CONNECT_TIMEOUT_SECONDS: float = 300.0
 
     VECTOR_DB_BACKEND : str
     VECTOR_DB_PATH : str
@@ -47,8 +114,37 @@ class Settings(BaseSettings):
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
+    TEMPLATES_AUTO_RELOAD: bool = False
+
+    VECTOR_DB_TENANCY_MODE: str = "collection"
+    VECTOR_DB_SHARED_COLLECTION_NAME: str = "collection_shared"
 
     QDRANT_URL: str = None
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_TIMEOUT: int = 30
+    QDRANT_POOL_SIZE: int = 20
+
+    VECTOR_DB_UPLOAD_BATCH_SIZE: int = 256
+    VECTOR_DB_UPLOAD_MAX_BATCH_BYTES: int = 4194304
+    VECTOR_DB_UPLOAD_PARALLEL: int = 4
+    VECTOR_DB_UPLOAD_MAX_RETRIES: int = 3
+
+    # collection profile (applied when a collection is created)
+    VECTOR_DB_QUANTIZATION: str = "none"
+    VECTOR_DB_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_DB_DENSE_ON_DISK: bool = False
+    VECTOR_DB_SPARSE_ON_DISK: bool = False
+    VECTOR_DB_HNSW_M: int = 16
+    VECTOR_DB_HNSW_EF_CONSTRUCT: int = 100
+    VECTOR_DB_SEARCH_OVERSAMPLING: float = 2.0
+    VECTOR_DB_SEARCH_RESCORE: bool = True
+
+    ANSWER_CACHE_ENABLED: bool = False
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_MAX_ENTRIES: int = 256
+    ANSWER_CACHE_TTL_SECONDS: int = 3600
+    ANSWER_CACHE_MAX_BUCKETS: int = 1024
     
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE_PATH), 
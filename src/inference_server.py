@@ -0,0 +1,75 @@
+"""
+Shared local inference server: one copy of the SPLADE model and of the
+cross-encoder per host, served to all the uvicorn workers over a Unix
+domain socket with micro-batching across their requests.
+
+    $ python -m src.inference_server
+    $ python -m src.inference_server --check    # exit status 0 when it answers
+
+The workers use it when INFERENCE_SERVER_SOCKET is set, with the same
+settings file. In docker-compose it runs as the `inference` service (profile
+inference-server), restarted when it dies.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from .help.config import get_settings
+from .stores.inference.InferenceServer import InferenceServer
+from .stores.inference.LocalModelFactory import LocalModelFactory
+
+
+async def serve():
+    settings = get_settings()
+    if not settings.INFERENCE_SERVER_SOCKET:
+        raise ValueError("INFERENCE_SERVER_SOCKET is not set")
+
+    local_model_factory = LocalModelFactory(config=settings)
+    sparse_embedding_client, reranker_client = await asyncio.gather(
+        asyncio.to_thread(local_model_factory.create_sparse_embedding, remote=False),
+        asyncio.to_thread(local_model_factory.create_reranker, remote=False),
+    )
+
+    if settings.MODEL_WARMUP_BATCH_SIZE:
+        await asyncio.gather(
+            asyncio.to_thread(sparse_embedding_client.warm_up, batch_size=settings.MODEL_WARMUP_BATCH_SIZE),
+            asyncio.to_thread(reranker_client.warm_up, batch_size=settings.MODEL_WARMUP_BATCH_SIZE),
+        )
+
+    server = InferenceServer(
+        socket_path=settings.INFERENCE_SERVER_SOCKET,
+        sparse_embedding_client=sparse_embedding_client,
+        reranker_client=reranker_client,
+        max_batch_size=settings.INFERENCE_SERVER_MAX_BATCH_SIZE,
+        max_wait_ms=settings.INFERENCE_SERVER_MAX_WAIT_MS,
+    )
+    await server.serve_forever()
+
+
+def check() -> int:
+    settings = get_settings()
+    try:
+        info = LocalModelFactory(config=settings).create_inference_client().ping()
+    except Exception as e:
+        print(f"inference server unavailable on {settings.INFERENCE_SERVER_SOCKET}: {e}", file=sys.stderr)
+        return 1
+
+    print(f"inference server {info['pid']} serving {info['sparse_model_id']} and {info['reranker_model_id']}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared SPLADE and cross-encoder inference server")
+    parser.add_argument("--check", action="store_true",
+                        help="only check that the server on INFERENCE_SERVER_SOCKET answers")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(check())
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
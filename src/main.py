@@ -6,10 +6,17 @@ from .help.config import Settings
 from .stores.llm.LLMProviderFactory import LLMProviderFactory
 from .stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from .stores.llm.templates.template_parser import TemplateParser
-from .stores.sparse_embedding.SparseEmbeddingProvider import SparseEmbeddingProvider
-from .stores.reranker.CrossEncoderProvider import CrossEncoderProvider
+from .stores.inference.LocalModelFactory import LocalModelFactory
+from .controllers.ContextController import get_encoding
+from .stores.cache.SemanticAnswerCache import SemanticAnswerCache
+from .stores.llm.UsageTracker import UsageTracker
+from .models.UsageModel import UsageModel
 from .utils.metrics import setup_metrics 
+from .utils.readiness import Readiness, ComponentStateEnums
+from .utils.admission import AdmissionController
+from .routers import health
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 
 app = FastAPI()
 
@@ -30,44 +37,117 @@ setup_metrics(app)
 @app.on_event("startup")
 async def startup_db_client():
     settings = Settings()
+    app.readiness = Readiness()
+
+    # concurrency budgets of the answer and indexing routes
+    app.admission = AdmissionController.from_settings(settings)
+
+    # the local models load (and warm up) in threads, concurrently with each
+    # other and with the setup of the clients below
+    app.sparse_embedding_client = None
+    app.reranker_client = None
+    app.readiness.set_state("sparse_embedding", ComponentStateEnums.PENDING)
+    app.readiness.set_state("reranker", ComponentStateEnums.PENDING)
+    models_loading = asyncio.create_task(load_models(settings))
+
     app.mongodb_conn = AsyncIOMotorClient(settings.MONGODB_URL)
     app.db_client = app.mongodb_conn[settings.MONGODB_DATABASE]
+    app.readiness.set_ready("mongodb")
     
     llm_provider_factory = LLMProviderFactory(settings)
 
     # generation client
     app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
     app.generation_client.set_generation_model(model_id = settings.GENERATION_MODEL_ID)
+    app.readiness.set_ready("generation")
 
     # embedding client
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                              embedding_size=settings.EMBEDDING_MODEL_SIZE)
+    app.readiness.set_ready("embedding")
     
+    # LLM usage per project
+    app.usage_tracker = None
+    if settings.USAGE_TRACKING_ENABLED:
+        app.usage_tracker = UsageTracker(
+            usage_model=await UsageModel.create_instance(db_client=app.db_client),
+            flush_interval=settings.USAGE_FLUSH_INTERVAL_SECONDS,
+            token_prices=settings.LLM_TOKEN_PRICES,
+        )
+        app.usage_tracker.start()
+
+        app.generation_client.usage_tracker = app.usage_tracker
+        app.embedding_client.usage_tracker = app.usage_tracker
+
     # vector db client
     vectordb_factory = VectorDBProviderFactory(config=settings)
     app.vectordb_client = vectordb_factory.create(provider=settings.VECTOR_DB_BACKEND)
     app.vectordb_client.connect()
+    app.async_vectordb_client = vectordb_factory.create_async(provider=settings.VECTOR_DB_BACKEND)
+    if app.async_vectordb_client is not None:
+        app.async_vectordb_client.connect()
+    app.readiness.set_ready("vectordb")
 
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG,
+        auto_reload=settings.TEMPLATES_AUTO_RELOAD,
     )
-    
-    # sparse embedding client
-    app.sparse_embedding_client = SparseEmbeddingProvider(model_id=settings.SPLADE_MODEL_ID)
-    
-     # reranker client
-    app.reranker_client = CrossEncoderProvider(model_id=settings.RERANKER_MODEL_ID)
+
+    # semantic answer cache
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        app.answer_cache = SemanticAnswerCache(
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            max_buckets=settings.ANSWER_CACHE_MAX_BUCKETS,
+        )
+
+    # by default the worker only accepts requests once the models are warm,
+    # in the background mode the model routes answer 503 until then
+    app.models_loading = models_loading
+    if not settings.MODELS_BACKGROUND_LOADING:
+        await models_loading
+
+        failed = app.readiness.get_failed()
+        if failed:
+            raise RuntimeError(f"Failed to load {', '.join(failed)}")
+
+
+async def load_models(settings: Settings):
+    # in-process models, or clients of the shared inference server
+    local_model_factory = LocalModelFactory(config=settings)
+
+    # sparse embedding client, reranker client
+    app.sparse_embedding_client, app.reranker_client, _ = await asyncio.gather(
+        app.readiness.load("sparse_embedding", local_model_factory.create_sparse_embedding,
+                           warm_up_batch_size=settings.MODEL_WARMUP_BATCH_SIZE),
+        app.readiness.load("reranker", local_model_factory.create_reranker,
+                           warm_up_batch_size=settings.MODEL_WARMUP_BATCH_SIZE),
+        # the prompt token encoding, downloaded by tiktoken unless it is cached
+        asyncio.to_thread(get_encoding, settings.CONTEXT_TOKEN_ENCODING),
+    )
+
+    # the shared server can die after the workers connected, the readiness
+    # endpoint checks it is still there
+    if local_model_factory.use_server(remote=True):
+        app.readiness.add_check("inference_server", local_model_factory.create_inference_client().ping)
 
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if app.usage_tracker is not None:
+        await app.usage_tracker.stop()
     app.mongodb_conn.close()
     app.vectordb_client.disconnect()
+    if app.async_vectordb_client is not None:
+        await app.async_vectordb_client.disconnect()
 
 # app.router.lifespan.on_startup.append(startup_db_client)
 # app.router.lifespan.on_shutdown.append(shutdown_db_client)
 
+app.include_router(health.health_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
\ No newline at end of file
@@ -2,6 +2,9 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId
+from pymongo import ReturnDocument
+import time
+from ..utils.metrics import track_stage
 class ProjectModel(BaseDataModel): 
       
     def __init__(self, db_client: object):
@@ -37,6 +40,7 @@ class ProjectModel(BaseDataModel):
          project.id = result.inserted_id
          return project
 
+    @track_stage("mongo_project_lookup", "mongodb")
     async def get_project_or_create_one(self, project_id: str):
 
         record = await self.collection.find_one({
@@ -44,8 +48,10 @@ class ProjectModel(BaseDataModel):
         })
 
         if record is None:
-            # create new project
-            project = Project(project_id=project_id)
+            # create new project, its generation starts from the creation time so
+            # a project re-created under the same id never matches the answers
+            # cached for the deleted one
+            project = Project(project_id=project_id, index_generation=int(time.time() * 1000))
             project = await self.create_project(project=project)
 
             return project
@@ -72,6 +78,50 @@ class ProjectModel(BaseDataModel):
         return projects, total_pages
 
 
+    async def increment_index_generation(self, project: Project):
+        """
+        Bumps the project's index generation after its chunks were re-indexed,
+        so everything derived from the previous index (e.g. cached answers) is discarded.
+        """
+        record = await self.collection.find_one_and_update(
+            {"_id": project.id},
+            {"$inc": {"index_generation": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if record is None:
+            return project.index_generation
+
+        project.index_generation = record["index_generation"]
+        return project.index_generation
+
+    async def acquire_reindex_lock(self, project: Project, owner: str, ttl_seconds: float):
+        """
+        Takes the project's reindex lease for `owner` if nobody holds it or
+        the holder's lease expired. Returns True when the lease was taken.
+        """
+        now = time.time()
+        record = await self.collection.find_one_and_update(
+            {
+                "_id": project.id,
+                "$or": [
+                    {"reindex_lock_until": {"$exists": False}},
+                    {"reindex_lock_until": {"$lt": now}},
+                ],
+            },
+            {"$set": {"reindex_lock_owner": owner, "reindex_lock_until": now + ttl_seconds}},
+            return_document=ReturnDocument.AFTER
+        )
+
+        return record is not None
+
+    async def release_reindex_lock(self, project: Project, owner: str):
+        # only the holder releases, an expired lease may already belong to another worker
+        await self.collection.update_one(
+            {"_id": project.id, "reindex_lock_owner": owner},
+            {"$unset": {"reindex_lock_owner": "", "reindex_lock_until": ""}}
+        )
+
     async def delete_project(self, project_id: ObjectId):
         result = await self.collection.delete_one({"_id": project_id})
         return result.deleted_count > 0    
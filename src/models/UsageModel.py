@@ -0,0 +1,71 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import ProjectUsage
+from .enums.DataBaseEnum import DataBaseEnum
+from pymongo import UpdateOne
+
+class UsageModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_USAGE_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        await instance.init_collection()
+        return instance
+
+    async def init_collection(self):
+        all_collections = await self.db_client.list_collection_names()
+        if DataBaseEnum.COLLECTION_USAGE_NAME.value not in all_collections:
+            self.collection = self.db_client[DataBaseEnum.COLLECTION_USAGE_NAME.value]
+            indexes = ProjectUsage.get_indexes()
+            for index in indexes:
+                await self.collection.create_index(
+                    index["key"],
+                    name=index["name"],
+                    unique=index["unique"]
+                )
+
+    async def increment_many(self, usages: list):
+        """
+        Adds the counts of each ProjectUsage to its (project, day, backend,
+        model, operation) document, created on first use.
+        """
+        if not usages:
+            return 0
+
+        operations = [
+            UpdateOne(
+                {
+                    "project_id": usage.project_id,
+                    "day": usage.day,
+                    "backend": usage.backend,
+                    "model": usage.model,
+                    "operation": usage.operation,
+                },
+                {"$inc": {
+                    "calls": usage.calls,
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "cost": usage.cost,
+                }},
+                upsert=True
+            )
+            for usage in usages
+        ]
+
+        await self.collection.bulk_write(operations, ordered=False)
+        return len(usages)
+
+    async def get_project_usage(self, project_id: str, since_day: str=None):
+        query = {"project_id": project_id}
+        if since_day:
+            query["day"] = {"$gte": since_day}
+
+        records = await self.collection.find(query).sort("day", 1).to_list(length=None)
+
+        return [
+            ProjectUsage(**record)
+            for record in records
+        ]
@@ -1,3 +1,4 @@
 from .project import Project
 from .data_chunk import DataChunk , RetrievedDocument
-from .asset import Asset
\ No newline at end of file
+from .asset import Asset
+from .usage import ProjectUsage
@@ -27,4 +27,6 @@ class DataChunk(BaseModel):
 
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    asset_id: Optional[str] = None
+    metadata: Optional[dict] = None
\ No newline at end of file
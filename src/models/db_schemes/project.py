@@ -5,6 +5,7 @@ from bson.objectid import ObjectId
 class Project(BaseModel):
     id: Optional[ObjectId] = Field(None, alias="_id")
     project_id: str = Field(..., min_length=1)
+    index_generation: int = Field(default=0, ge=0)
 
     @validator('project_id')
     def validate_project_id(cls, value):
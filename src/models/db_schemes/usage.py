@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from bson.objectid import ObjectId
+
+class ProjectUsage(BaseModel):
+    """
+    LLM usage of a project, rolled up per day, backend, model and operation
+    (generation / embedding).
+    """
+    id: Optional[ObjectId] = Field(None, alias="_id")
+    project_id: str = Field(..., min_length=1)
+    day: str = Field(..., min_length=1)
+    backend: str = Field(..., min_length=1)
+    model: str = Field(..., min_length=1)
+    operation: str = Field(..., min_length=1)
+    calls: int = Field(default=0, ge=0)
+    prompt_tokens: int = Field(default=0, ge=0)
+    completion_tokens: int = Field(default=0, ge=0)
+    cost: float = Field(default=0.0, ge=0)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def get_indexes(cls):
+
+        return [
+            {
+                "key": [
+                    ("project_id", 1),
+                    ("day", 1),
+                    ("backend", 1),
+                    ("model", 1),
+                    ("operation", 1)
+                ],
+                "name": "project_id_day_backend_model_operation_index_1",
+                "unique": True
+            }
+        ]
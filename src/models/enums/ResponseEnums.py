@@ -17,9 +17,17 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb-search-success"
+    BATCH_SEARCH_TOO_MANY_QUERIES = "batch_search_too_many_queries"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
     FILE_DELETED_SUCCESSFULLY = "file_deleted_successfully"
     FILE_DELETE_FAILED = "file_delete_failed"
     FILE_UPDATED_SUCCESSFULLY = "file_updated_successfully"
-    FILE_UPDATE_FAILED = "file_update_failed"
\ No newline at end of file
+    FILE_UPDATE_FAILED = "file_update_failed"
+    PROJECT_USAGE_RETRIEVED = "project_usage_retrieved"
+    WORKER_ALIVE = "worker_alive"
+    WORKER_READY = "worker_ready"
+    WORKER_NOT_READY = "worker_not_ready"
+    MODELS_NOT_READY = "models_not_ready"
+    ADMISSION_QUEUE_FULL = "admission_queue_full"
+    ADMISSION_QUEUE_TIMEOUT = "admission_queue_timeout"
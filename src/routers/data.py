@@ -10,11 +10,14 @@ from .schemes.data import ProcessRequest
 from ..models.ProjectModel import ProjectModel
 from ..models.ChunkModel import ChunkModel
 from ..models.AssetModel import AssetModel
+from ..models.UsageModel import UsageModel
 from ..models.db_schemes import DataChunk, Asset
 from ..models.enums.AssetTypeEnum import AssetTypeEnum
 from ..controllers import NLPController
 from ..models.db_schemes import DataChunk
-from datetime import datetime 
+from datetime import datetime, date
+from .dependencies import set_usage_project, require_models_ready, admit
+from ..utils.admission import AdmissionClassEnums
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -211,7 +214,9 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
     )
 
 
-@data_router.delete("/delete/{project_id}/{asset_name}")
+@data_router.delete("/delete/{project_id}/{asset_name}",
+                    dependencies=[Depends(set_usage_project), Depends(require_models_ready),
+                                  Depends(admit(AdmissionClassEnums.INGESTION))])
 async def delete_asset(request: Request, project_id: str, asset_name: str):
 
     # Step 1: Get the project
@@ -261,7 +266,16 @@ async def delete_asset(request: Request, project_id: str, asset_name: str):
             reranker_client=request.app.reranker_client,
             template_parser=request.app.template_parser,
         )
-        await nlp_controller.reindex_project(project=project, chunk_model=chunk_model)
+        inserted_count = await nlp_controller.reindex_project(project=project, chunk_model=chunk_model,
+                                                              project_model=project_model)
+        if inserted_count is None:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value}
+            )
+
+        # cached answers were built from the previous index
+        await project_model.increment_index_generation(project=project)
 
 
     return JSONResponse(
@@ -388,7 +402,9 @@ async def get_assets(request: Request, project_id: str):
 
 
 
-@data_router.put("/update/{project_id}/{asset_name}")
+@data_router.put("/update/{project_id}/{asset_name}",
+                 dependencies=[Depends(set_usage_project), Depends(require_models_ready),
+                               Depends(admit(AdmissionClassEnums.INGESTION))])
 async def update_asset(request: Request, project_id: str, asset_name: str, file: UploadFile,
                       app_settings: Settings = Depends(get_settings)):
     
@@ -471,7 +487,17 @@ async def update_asset(request: Request, project_id: str, asset_name: str, file:
         reranker_client=request.app.reranker_client,
         template_parser=request.app.template_parser,
     )
-    inserted_count = await nlp_controller.reindex_project(project=project, chunk_model=chunk_model)
+    inserted_count = await nlp_controller.reindex_project(project=project, chunk_model=chunk_model,
+                                                          project_model=project_model)
+    if inserted_count is None:
+        # the previous index keeps serving, and so do the answers cached from it
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value}
+        )
+
+    # cached answers were built from the previous index
+    await project_model.increment_index_generation(project=project)
 
 
 
@@ -557,7 +583,11 @@ async def delete_project(request: Request, project_id: str):
     for asset in assets_to_delete:
         data_controller.delete_physical_file(project_id=project.project_id, file_name=asset.asset_name)
 
+    # the other workers drop their cached answers when they see the new generation
+    await project_model.increment_index_generation(project=project)
     nlp_controller.reset_vector_db_collection(project=project)
+    if request.app.answer_cache is not None:
+        request.app.answer_cache.invalidate(project_id=project.project_id)
 
     await chunk_model.delete_chunks_by_project_id(project_id=project.id)
 
@@ -581,6 +611,46 @@ async def delete_project(request: Request, project_id: str):
 
 
 
+@data_router.get("/projects/{project_id}/usage")
+async def get_project_usage(request: Request, project_id: str, since: date = None):
+    """
+    LLM calls, tokens and estimated cost of a project, in total, per
+    backend / model / operation and per day. `since` is a YYYY-MM-DD day,
+    anything else is rejected with a 422.
+    """
+    # counts still buffered in the other workers are written within USAGE_FLUSH_INTERVAL_SECONDS
+    if request.app.usage_tracker is not None:
+        await request.app.usage_tracker.flush()
+
+    usage_model = await UsageModel.create_instance(db_client=request.app.db_client)
+    usages = await usage_model.get_project_usage(project_id=project_id,
+                                                 since_day=since.isoformat() if since else None)
+
+    counters = ["calls", "prompt_tokens", "completion_tokens", "cost"]
+    total = { counter: 0 for counter in counters }
+    by_model = {}
+    for usage in usages:
+        key = (usage.backend, usage.model, usage.operation)
+        model_usage = by_model.setdefault(key, {
+            "backend": usage.backend, "model": usage.model, "operation": usage.operation,
+            **{ counter: 0 for counter in counters }
+        })
+
+        for counter in counters:
+            total[counter] += getattr(usage, counter)
+            model_usage[counter] += getattr(usage, counter)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.PROJECT_USAGE_RETRIEVED.value,
+            "project_id": project_id,
+            "total": total,
+            "by_model": list(by_model.values()),
+            "daily": [ usage.dict(exclude={"id", "project_id"}) for usage in usages ],
+        }
+    )
+
+
 @data_router.get("/files/{project_id}/{asset_name}")
 async def get_file_content(project_id: str, asset_name: str):
     project_controller = ProjectController()
@@ -0,0 +1,67 @@
+from fastapi import HTTPException, Request, status
+from ..models.enums.ResponseEnums import ResponseSignal
+from ..stores.llm.UsageTracker import CURRENT_PROJECT
+from ..utils.admission import AdmissionClassEnums, AdmissionRejectReasonEnums, AdmissionRejectedError
+import time
+
+
+async def set_usage_project(project_id: str):
+    """
+    Attributes the LLM tokens used while serving the request to its project.
+    Async on purpose: it runs in the request context, a sync dependency would
+    set the variable in a threadpool copy of it.
+    """
+    CURRENT_PROJECT.set(project_id)
+
+
+async def require_models_ready(request: Request):
+    """
+    With MODELS_BACKGROUND_LOADING the worker serves requests while the local
+    models load, the routes that need them answer 503 until they are ready.
+    With the shared inference server, also while its last check failed.
+    """
+    names = ["sparse_embedding", "reranker"]
+    if "inference_server" in request.app.readiness.checks:
+        names.append("inference_server")
+
+    if not request.app.readiness.is_ready(names):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"signal": ResponseSignal.MODELS_NOT_READY.value},
+            headers={"Retry-After": "5"},
+        )
+
+
+ADMISSION_REJECTIONS = {
+    AdmissionRejectReasonEnums.QUEUE_FULL.value: (status.HTTP_429_TOO_MANY_REQUESTS,
+                                                  ResponseSignal.ADMISSION_QUEUE_FULL),
+    AdmissionRejectReasonEnums.QUEUE_TIMEOUT.value: (status.HTTP_503_SERVICE_UNAVAILABLE,
+                                                     ResponseSignal.ADMISSION_QUEUE_TIMEOUT),
+}
+
+
+def admit(admission_class: AdmissionClassEnums):
+    """
+    Dependency holding a slot of `admission_class` for the whole request:
+    429 when its wait queue is full, 503 when no slot freed up in time,
+    both with a Retry-After.
+    """
+    async def dependency(request: Request):
+        limiter = request.app.admission.get_limiter(admission_class)
+        try:
+            await limiter.acquire()
+        except AdmissionRejectedError as e:
+            status_code, signal = ADMISSION_REJECTIONS[e.reason]
+            raise HTTPException(
+                status_code=status_code,
+                detail={"signal": signal.value},
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            limiter.release(hold_seconds=time.perf_counter() - start)
+
+    return dependency
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, status, Request
+from fastapi.responses import JSONResponse
+from ..models.enums.ResponseEnums import ResponseSignal
+
+health_router = APIRouter(
+    prefix="/api/v1/health",
+    tags=["api_v1", "health"],
+)
+
+
+@health_router.get("/live")
+async def live():
+    return JSONResponse(content={"signal": ResponseSignal.WORKER_ALIVE.value})
+
+
+@health_router.get("/ready")
+async def ready(request: Request):
+    """
+    Load state of each component of this worker (clients, local models and
+    their warm-up), 503 until all of them are ready or when one of them
+    stopped working since (the shared inference server).
+    """
+    await request.app.readiness.run_checks()
+    report = request.app.readiness.report()
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "signal": (ResponseSignal.WORKER_READY if report["ready"] else ResponseSignal.WORKER_NOT_READY).value,
+            **report,
+        }
+    )
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, status, Request
+from fastapi import FastAPI, APIRouter, status, Request, Depends
 from fastapi.responses import JSONResponse
 from .schemes.nlp import PushRequest, SearchRequest, HybridSearchRequest
 from ..models.ProjectModel import ProjectModel
@@ -6,7 +6,11 @@ from ..models.ChunkModel import ChunkModel
 from ..controllers import NLPController
 from ..models import ResponseSignal
 from .schemes.nlp import PushRequest, SearchRequest, HybridSearchRequest, RerankSearchRequest
+from .schemes.nlp import BatchSearchRequest, HybridBatchSearchRequest
+from ..help.config import get_settings, Settings
 from ..models.enums.ResponseEnums import ResponseSignal # Make sure this is imported
+from .dependencies import set_usage_project, require_models_ready, admit
+from ..utils.admission import AdmissionClassEnums
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -14,9 +18,11 @@ logger = logging.getLogger('uvicorn.error')
 nlp_router = APIRouter(
     prefix="/api/v1/nlp",
     tags=["api_v1", "nlp"],
+    dependencies=[Depends(set_usage_project)],
 )
 
-@nlp_router.post("/index/push/{project_id}")
+@nlp_router.post("/index/push/{project_id}",
+                 dependencies=[Depends(require_models_ready), Depends(admit(AdmissionClassEnums.INGESTION))])
 async def index_project(request: Request, project_id: str, push_request: PushRequest):
 
     project_model = await ProjectModel.create_instance(
@@ -48,42 +54,24 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
         template_parser=request.app.template_parser,
     )
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-
-    while has_records:
-        page_chunks = await chunk_model.get_project_chunks(project_id=project.id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-
-        chunks_ids =  list(range(idx, idx + len(page_chunks)))
-        idx += len(page_chunks)
-        
-        is_inserted = nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            do_reset=push_request.do_reset,
-            chunks_ids=chunks_ids
+    # blue/green rebuild: searches keep using the current index until the new one is complete
+    inserted_items_count = await nlp_controller.reindex_project(
+        project=project,
+        chunk_model=chunk_model,
+        project_model=project_model,
+    )
+
+    if inserted_items_count is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+            }
         )
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
-        
-        inserted_items_count = await nlp_controller.reindex_project(
-        project=project,
-        chunk_model=chunk_model)
-        
+    # cached answers were built from the previous index
+    await project_model.increment_index_generation(project=project)
+
     return JSONResponse(
         content={
             "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
@@ -138,10 +126,12 @@ async def search_index(request: Request, project_id: str, search_request: Search
         reranker_client=request.app.reranker_client,
         sparse_embedding_client=request.app.sparse_embedding_client,
         template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
     )
 
-    results = nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+    results = await nlp_controller.search_vector_db_collection(
+        project=project, text=search_request.text, limit=search_request.limit,
+        filters=search_request.filters,
     )
 
     if not results:
@@ -160,7 +150,8 @@ async def search_index(request: Request, project_id: str, search_request: Search
     )
 
 
-@nlp_router.post("/index/hybrid_search/{project_id}")
+@nlp_router.post("/index/hybrid_search/{project_id}",
+                 dependencies=[Depends(require_models_ready)])
 async def hybrid_search_index(request: Request, project_id: str, search_request: HybridSearchRequest):
     
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -173,14 +164,16 @@ async def hybrid_search_index(request: Request, project_id: str, search_request:
         reranker_client=request.app.reranker_client,
         sparse_embedding_client=request.app.sparse_embedding_client, # Pass the new client
         template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
     )
 
-    results = nlp_controller.search_hybrid_collection(
+    results = await nlp_controller.search_hybrid_collection(
         project=project, 
         text=search_request.text, 
         dense_limit=search_request.dense_limit,
         sparse_limit=search_request.sparse_limit,
-        limit=search_request.limit
+        limit=search_request.limit,
+        filters=search_request.filters,
     )
 
     if not results:
@@ -199,7 +192,98 @@ async def hybrid_search_index(request: Request, project_id: str, search_request:
 
 
 
-@nlp_router.post("/index/answer_search/{project_id}")
+@nlp_router.post("/index/batch_search/{project_id}")
+async def batch_search_index(request: Request, project_id: str, search_request: BatchSearchRequest,
+                             app_settings: Settings = Depends(get_settings)):
+
+    if len(search_request.texts) > app_settings.BATCH_SEARCH_MAX_QUERIES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.BATCH_SEARCH_TOO_MANY_QUERIES.value}
+        )
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        reranker_client=request.app.reranker_client,
+        sparse_embedding_client=request.app.sparse_embedding_client,
+        template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
+    )
+
+    results = await nlp_controller.search_vector_db_collection_batch(
+        project=project, texts=search_request.texts, limit=search_request.limit,
+        filters=search_request.filters,
+    )
+
+    if not results:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value}
+        )
+
+    # one list per query, in the order of the request texts
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [ [ result.dict() for result in query_results or [] ] for query_results in results ]
+        }
+    )
+
+
+@nlp_router.post("/index/hybrid_batch_search/{project_id}",
+                 dependencies=[Depends(require_models_ready)])
+async def hybrid_batch_search_index(request: Request, project_id: str, search_request: HybridBatchSearchRequest,
+                                    app_settings: Settings = Depends(get_settings)):
+
+    if len(search_request.texts) > app_settings.BATCH_SEARCH_MAX_QUERIES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.BATCH_SEARCH_TOO_MANY_QUERIES.value}
+        )
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        reranker_client=request.app.reranker_client,
+        sparse_embedding_client=request.app.sparse_embedding_client,
+        template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
+    )
+
+    results = await nlp_controller.search_hybrid_collection_batch(
+        project=project,
+        texts=search_request.texts,
+        dense_limit=search_request.dense_limit,
+        sparse_limit=search_request.sparse_limit,
+        limit=search_request.limit,
+        filters=search_request.filters,
+    )
+
+    if not results:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value}
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [ [ result.dict() for result in query_results or [] ] for query_results in results ]
+        }
+    )
+
+
+@nlp_router.post("/index/answer_search/{project_id}",
+                 dependencies=[Depends(admit(AdmissionClassEnums.INTERACTIVE))])
 async def answer_rag(request: Request, project_id: str, search_request: SearchRequest):
     
     project_model = await ProjectModel.create_instance(
@@ -217,12 +301,15 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
         reranker_client=request.app.reranker_client,
         sparse_embedding_client=request.app.sparse_embedding_client,
         template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
+        answer_cache=request.app.answer_cache,
     )
 
-    answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
+    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
+        filters=search_request.filters,
     )
 
     if not answer:
@@ -243,7 +330,8 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
     )
 
 
-@nlp_router.post("/index/hybrid_search_cross/{project_id}")
+@nlp_router.post("/index/hybrid_search_cross/{project_id}",
+                 dependencies=[Depends(require_models_ready)])
 async def hybrid_search_cross_index(request: Request, project_id: str, search_request: RerankSearchRequest):
     
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -256,14 +344,16 @@ async def hybrid_search_cross_index(request: Request, project_id: str, search_re
         sparse_embedding_client=request.app.sparse_embedding_client,
         reranker_client=request.app.reranker_client, # Pass the new client
         template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
     )
 
-    results = nlp_controller.search_hybrid_with_rerank(
+    results = await nlp_controller.search_hybrid_with_rerank(
         project=project, 
         text=search_request.text, 
         dense_limit=search_request.dense_limit,
         sparse_limit=search_request.sparse_limit,
-        rerank_limit=search_request.limit
+        rerank_limit=search_request.limit,
+        filters=search_request.filters,
     )
 
     if not results:
@@ -280,7 +370,8 @@ async def hybrid_search_cross_index(request: Request, project_id: str, search_re
     )
 
 
-@nlp_router.post("/index/answer_hybrid/{project_id}")
+@nlp_router.post("/index/answer_hybrid/{project_id}",
+                 dependencies=[Depends(require_models_ready), Depends(admit(AdmissionClassEnums.INTERACTIVE))])
 async def answer_rag_hybrid(request: Request, project_id: str, search_request: HybridSearchRequest):
     
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -293,14 +384,17 @@ async def answer_rag_hybrid(request: Request, project_id: str, search_request: H
         sparse_embedding_client=request.app.sparse_embedding_client,
         reranker_client=request.app.reranker_client,
         template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
+        answer_cache=request.app.answer_cache,
     )
 
-    answer, full_prompt, chat_history =  nlp_controller.answer_rag_question_hybrid(
+    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question_hybrid(
         project=project,
         query=search_request.text,
         dense_limit=search_request.dense_limit,
         sparse_limit=search_request.sparse_limit,
         limit=search_request.limit,
+        filters=search_request.filters,
     )
 
     if not answer:
@@ -319,7 +413,8 @@ async def answer_rag_hybrid(request: Request, project_id: str, search_request: H
     )
 
 
-@nlp_router.post("/index/answer_hybrid_cross/{project_id}")
+@nlp_router.post("/index/answer_hybrid_cross/{project_id}",
+                 dependencies=[Depends(require_models_ready), Depends(admit(AdmissionClassEnums.INTERACTIVE))])
 async def answer_rag_hybrid_cross(request: Request, project_id: str, search_request: RerankSearchRequest):
     
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -332,14 +427,17 @@ async def answer_rag_hybrid_cross(request: Request, project_id: str, search_requ
         sparse_embedding_client=request.app.sparse_embedding_client,
         reranker_client=request.app.reranker_client,
         template_parser=request.app.template_parser,
+        async_vectordb_client=request.app.async_vectordb_client,
+        answer_cache=request.app.answer_cache,
     )
 
-    answer, full_prompt, chat_history = nlp_controller.answer_rag_question_hybrid_cross(
+    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question_hybrid_cross(
         project=project,
         query=search_request.text,
         dense_limit=search_request.dense_limit,
         sparse_limit=search_request.sparse_limit,
         limit=search_request.limit,
+        filters=search_request.filters,
     )
 
     if not answer:
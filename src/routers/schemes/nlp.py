@@ -1,21 +1,42 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+
+class SearchFilters(BaseModel):
+    asset_ids: Optional[List[str]] = None
+    sources: Optional[List[str]] = None
+    pages: Optional[List[int]] = None
 
 class PushRequest(BaseModel):
-    do_reset: Optional[int] = 0
+    # a push always rebuilds the whole index (blue/green), there is nothing to reset
+    pass
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    filters: Optional[SearchFilters] = None
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+    filters: Optional[SearchFilters] = None
+
+class HybridBatchSearchRequest(BaseModel):
+    texts: List[str]
+    dense_limit: Optional[int] = 10
+    sparse_limit: Optional[int] = 5
+    limit: Optional[int] = 5
+    filters: Optional[SearchFilters] = None
 
 class HybridSearchRequest(BaseModel):
     text: str
     dense_limit: Optional[int] = 10
     sparse_limit: Optional[int] = 5
-    limit: Optional[int] = 5    
+    limit: Optional[int] = 5
+    filters: Optional[SearchFilters] = None
 
 class RerankSearchRequest(BaseModel):
     text: str
     dense_limit: Optional[int] = 10
     sparse_limit: Optional[int] = 5
     limit: Optional[int] = 5
+    filters: Optional[SearchFilters] = None
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+import threading
+
+class LRUCache:
+    """
+    Thread-safe bounded mapping, the least recently used keys are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        self.put_many({ key: value })
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[key] = self.entries[key]
+        return found
+
+    def put_many(self, items: dict):
+        if self.max_entries <= 0:
+            return
+
+        with self.lock:
+            for key, value in items.items():
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
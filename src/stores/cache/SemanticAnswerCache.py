@@ -0,0 +1,143 @@
+from collections import OrderedDict
+import numpy as np
+import threading
+import time
+import logging
+
+class SemanticAnswerCache:
+    """
+    Per-project answer cache keyed by query-embedding similarity.
+
+    Each (project, scope) bucket holds the normalized embeddings of the queries
+    it has answered. A lookup is a nearest-neighbour search over that matrix and
+    returns the stored answer when the cosine similarity reaches the threshold.
+    Buckets are tagged with the project's index generation, so any re-index
+    silently drops every answer built from the old chunks. The scope includes
+    the limits and filters of the query, so at most `max_buckets` buckets are
+    kept, the least recently used is dropped first.
+    """
+
+    def __init__(self, similarity_threshold: float=0.95,
+                       max_entries: int=256,
+                       ttl_seconds: int=3600,
+                       max_buckets: int=1024):
+
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_buckets = max_buckets
+
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def normalize(self, vector: list):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def get_bucket(self, project_id: str, scope: str, generation: int, create: bool = True):
+        key = (project_id, scope)
+        bucket = self.buckets.get(key)
+
+        if bucket is not None and bucket["generation"] != generation:
+            del self.buckets[key]
+            bucket = None
+
+        if bucket is None:
+            if not create:
+                return None
+
+            bucket = {
+                "generation": generation,
+                "vectors": None,
+                "entries": [],
+            }
+            self.buckets[key] = bucket
+
+            while len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+
+        self.buckets.move_to_end(key)
+        return bucket
+
+    def evict_expired(self, bucket: dict):
+        if not self.ttl_seconds or not bucket["entries"]:
+            return
+
+        now = time.monotonic()
+        keep = [
+            idx for idx, entry in enumerate(bucket["entries"])
+            if now - entry["created_at"] < self.ttl_seconds
+        ]
+
+        if len(keep) == len(bucket["entries"]):
+            return
+
+        bucket["entries"] = [ bucket["entries"][idx] for idx in keep ]
+        bucket["vectors"] = bucket["vectors"][keep] if len(keep) else None
+
+    def lookup(self, project_id: str, scope: str, generation: int, vector: list):
+        query = self.normalize(vector)
+        if query is None:
+            return None
+
+        with self.lock:
+            # a miss does not create a bucket, only answers take room
+            bucket = self.get_bucket(project_id=project_id, scope=scope, generation=generation, create=False)
+            if bucket is None:
+                return None
+
+            self.evict_expired(bucket)
+
+            if bucket["vectors"] is None or bucket["vectors"].shape[1] != query.shape[0]:
+                return None
+
+            similarities = bucket["vectors"] @ query
+            best_idx = int(np.argmax(similarities))
+
+            if similarities[best_idx] < self.similarity_threshold:
+                return None
+
+            return bucket["entries"][best_idx]
+
+    def store(self, project_id: str, scope: str, generation: int, vector: list,
+                    answer: str, full_prompt: str, chat_history: list):
+        query = self.normalize(vector)
+        if query is None:
+            return False
+
+        with self.lock:
+            bucket = self.get_bucket(project_id=project_id, scope=scope, generation=generation)
+
+            if bucket["vectors"] is not None and bucket["vectors"].shape[1] != query.shape[0]:
+                # embedding model changed, the old vectors are not comparable anymore
+                bucket["vectors"] = None
+                bucket["entries"] = []
+
+            bucket["entries"].append({
+                "answer": answer,
+                "full_prompt": full_prompt,
+                "chat_history": chat_history,
+                "created_at": time.monotonic(),
+            })
+
+            if bucket["vectors"] is None:
+                bucket["vectors"] = query.reshape(1, -1)
+            else:
+                bucket["vectors"] = np.vstack([bucket["vectors"], query])
+
+            # drop the oldest entries once the bucket is full
+            overflow = len(bucket["entries"]) - self.max_entries
+            if overflow > 0:
+                bucket["entries"] = bucket["entries"][overflow:]
+                bucket["vectors"] = bucket["vectors"][overflow:]
+
+        return True
+
+    def invalidate(self, project_id: str):
+        with self.lock:
+            for key in [ key for key in self.buckets if key[0] == project_id ]:
+                del self.buckets[key]
@@ -0,0 +1,105 @@
+from .InferenceEnums import InferenceOperationEnums
+from .InferenceProtocol import send_message, receive_message
+import logging
+import queue
+import socket
+import time
+
+
+class InferenceClient:
+    """
+    Blocking client of the InferenceServer, safe to share between threads:
+    each request takes a connection of the pool (or opens one), at most
+    `pool_size` idle connections are kept.
+    """
+
+    def __init__(self, socket_path: str, pool_size: int = 8, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.connections = queue.LifoQueue(maxsize=pool_size)
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self, timeout: float = None):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout or self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def wait_until_available(self, timeout: float = 300.0, interval: float = 0.5) -> dict:
+        """
+        Waits for the server (which loads the models when it starts) and
+        returns its info.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.request(InferenceOperationEnums.INFO.value)
+            except (OSError, ConnectionError) as e:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Inference server not available on {self.socket_path}: {e}")
+                time.sleep(interval)
+
+    def ping(self, timeout: float = 2.0) -> dict:
+        """
+        Health check over a fresh connection, raises when the server is down
+        or does not answer within `timeout`.
+        """
+        sock = self.connect(timeout=timeout)
+        try:
+            send_message(sock, { "operation": InferenceOperationEnums.INFO.value, "inputs": None })
+            response = receive_message(sock)
+        finally:
+            sock.close()
+
+        if "error" in response:
+            raise RuntimeError(f"Inference server error on ping: {response['error']}")
+
+        return response["result"]
+
+    def acquire(self):
+        try:
+            return self.connections.get_nowait()
+        except queue.Empty:
+            return self.connect()
+
+    def release(self, sock):
+        try:
+            self.connections.put_nowait(sock)
+        except queue.Full:
+            sock.close()
+
+    def send(self, message: dict) -> dict:
+        sock = self.acquire()
+        try:
+            send_message(sock, message)
+            response = receive_message(sock)
+        except BaseException:
+            sock.close()
+            raise
+        self.release(sock)
+        return response
+
+    def request(self, operation: str, inputs: list = None):
+        message = { "operation": operation, "inputs": inputs }
+        try:
+            response = self.send(message)
+        except ConnectionError:
+            # the pooled connections may predate a server restart
+            self.close()
+            response = self.send(message)
+
+        if "error" in response:
+            raise RuntimeError(f"Inference server error on {operation}: {response['error']}")
+
+        return response["result"]
+
+    def close(self):
+        while True:
+            try:
+                self.connections.get_nowait().close()
+            except queue.Empty:
+                break
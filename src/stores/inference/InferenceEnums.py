@@ -0,0 +1,14 @@
+from enum import Enum
+
+class InferenceBackendEnums(Enum):
+    TORCH = "torch"
+    ONNX = "onnx"
+
+class OnnxTaskEnums(Enum):
+    MASKED_LM = "masked-lm"
+    SEQUENCE_CLASSIFICATION = "sequence-classification"
+
+class InferenceOperationEnums(Enum):
+    INFO = "info"
+    SPARSE_ENCODE = "sparse_encode"
+    RERANK_SCORES = "rerank_scores"
@@ -0,0 +1,48 @@
+import json
+import struct
+
+# every message is a 4 bytes big-endian length followed by that much JSON
+HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+
+def encode_message(message: dict) -> bytes:
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(payload)) + payload
+
+
+def decode_length(header: bytes) -> int:
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Inference message of {length} bytes is too large")
+    return length
+
+
+def receive_exactly(sock, size: int) -> bytes:
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("Inference server closed the connection")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_message(sock, message: dict):
+    sock.sendall(encode_message(message))
+
+
+def receive_message(sock) -> dict:
+    length = decode_length(receive_exactly(sock, HEADER.size))
+    return json.loads(receive_exactly(sock, length))
+
+
+async def read_message(reader) -> dict:
+    length = decode_length(await reader.readexactly(HEADER.size))
+    return json.loads(await reader.readexactly(length))
+
+
+async def write_message(writer, message: dict):
+    writer.write(encode_message(message))
+    await writer.drain()
@@ -0,0 +1,148 @@
+from .InferenceEnums import InferenceOperationEnums
+from .InferenceProtocol import read_message, write_message
+from ...utils.metrics import INFERENCE_SERVER_BATCH_SIZE
+import asyncio
+import logging
+import os
+
+
+class MicroBatcher:
+    """
+    Merges the inputs of concurrent requests into one model call: the first
+    request waits at most `max_wait_ms` for others, up to `max_batch_size`
+    inputs. Model calls run one at a time, in a thread.
+    """
+
+    def __init__(self, operation: str, function, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.operation = operation
+        self.function = function
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+
+    async def submit(self, inputs: list) -> list:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((inputs, future))
+        return await future
+
+    async def collect(self) -> list:
+        batch = [ await self.queue.get() ]
+        size = len(batch[0][0])
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(request)
+            size += len(request[0])
+
+        return batch
+
+    async def run(self):
+        while True:
+            batch = await self.collect()
+            inputs = [ item for request_inputs, _ in batch for item in request_inputs ]
+            INFERENCE_SERVER_BATCH_SIZE.labels(operation=self.operation).observe(len(inputs))
+
+            try:
+                outputs = await asyncio.to_thread(self.function, inputs)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            start = 0
+            for request_inputs, future in batch:
+                if not future.done():
+                    future.set_result(outputs[start:start + len(request_inputs)])
+                start += len(request_inputs)
+
+
+class InferenceServer:
+    """
+    Owns the one copy of the SPLADE model and of the cross-encoder of a host
+    and serves them to the API workers over a Unix domain socket, see
+    RemoteSparseEmbeddingProvider and RemoteCrossEncoderProvider.
+    """
+
+    def __init__(self, socket_path: str, sparse_embedding_client, reranker_client,
+                       max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.socket_path = socket_path
+        self.sparse_embedding_client = sparse_embedding_client
+        self.reranker_client = reranker_client
+        self.logger = logging.getLogger(__name__)
+
+        self.batchers = {
+            InferenceOperationEnums.SPARSE_ENCODE.value: MicroBatcher(
+                operation=InferenceOperationEnums.SPARSE_ENCODE.value,
+                function=lambda texts: sparse_embedding_client.encode_batch(texts=texts, batch_size=max_batch_size),
+                max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+            ),
+            InferenceOperationEnums.RERANK_SCORES.value: MicroBatcher(
+                operation=InferenceOperationEnums.RERANK_SCORES.value,
+                function=lambda pairs: [ float(score) for score in reranker_client.predict_scores(pairs) ],
+                max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+            ),
+        }
+
+    def get_info(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "sparse_model_id": self.sparse_embedding_client.model_id,
+            "reranker_model_id": self.reranker_client.model_id,
+        }
+
+    async def handle_request(self, request: dict) -> dict:
+        operation = request.get("operation")
+
+        if operation == InferenceOperationEnums.INFO.value:
+            return { "result": self.get_info() }
+
+        batcher = self.batchers.get(operation)
+        if batcher is None:
+            return { "error": f"Unknown operation: {operation}" }
+
+        try:
+            return { "result": await batcher.submit(request.get("inputs") or []) }
+        except Exception as e:
+            self.logger.exception(f"Error while running {operation}")
+            return { "error": str(e) }
+
+    async def handle_connection(self, reader, writer):
+        # one request at a time per connection, the clients keep a pool of them
+        try:
+            while True:
+                try:
+                    request = await read_message(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                await write_message(writer, await self.handle_request(request))
+        except (ConnectionError, ValueError) as e:
+            self.logger.warning(f"Inference connection closed: {e}")
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+
+        batcher_tasks = [ asyncio.create_task(batcher.run()) for batcher in self.batchers.values() ]
+        server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+        self.logger.info(f"Inference server listening on {self.socket_path}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in batcher_tasks:
+                task.cancel()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
@@ -0,0 +1,78 @@
+from .InferenceEnums import InferenceBackendEnums
+from ...controllers.BaseController import BaseController
+
+class LocalModelFactory:
+    """
+    Creates the SPLADE and cross-encoder providers from the settings: thin
+    clients of the shared inference server when INFERENCE_SERVER_SOCKET is
+    set (and `remote`), else in-process torch or ONNX models.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    def use_server(self, remote: bool) -> bool:
+        return remote and bool(self.config.INFERENCE_SERVER_SOCKET)
+
+    def get_sparse_params(self) -> dict:
+        return {
+            "model_id": self.config.SPLADE_MODEL_ID,
+            "doc_top_k": self.config.SPARSE_DOC_TOP_K,
+            "doc_min_weight": self.config.SPARSE_DOC_MIN_WEIGHT,
+            "query_top_k": self.config.SPARSE_QUERY_TOP_K,
+            "query_min_weight": self.config.SPARSE_QUERY_MIN_WEIGHT,
+            "quantize_uint8": self.config.SPARSE_QUANTIZE_UINT8,
+            "quantization_max_weight": self.config.SPARSE_QUANTIZATION_MAX_WEIGHT,
+        }
+
+    def get_reranker_params(self) -> dict:
+        return {
+            "model_id": self.config.RERANKER_MODEL_ID,
+            "batch_size": self.config.RERANKER_BATCH_SIZE,
+            "max_length": self.config.RERANKER_MAX_LENGTH,
+            "cache_size": self.config.RERANKER_CACHE_SIZE,
+        }
+
+    def get_onnx_params(self) -> dict:
+        return {
+            "cache_dir": BaseController().get_model_path(model_name="onnx"),
+            "quantize_int8": self.config.ONNX_QUANTIZE_INT8,
+            "num_threads": self.config.ONNX_NUM_THREADS,
+        }
+
+    def get_server_params(self) -> dict:
+        return {
+            "socket_path": self.config.INFERENCE_SERVER_SOCKET,
+            "pool_size": self.config.INFERENCE_SERVER_POOL_SIZE,
+            "timeout": self.config.INFERENCE_SERVER_TIMEOUT_SECONDS,
+            "connect_timeout": self.config.INFERENCE_SERVER_CONNECT_TIMEOUT_SECONDS,
+        }
+
+    def create_inference_client(self):
+        from .InferenceClient import InferenceClient
+        return InferenceClient(socket_path=self.config.INFERENCE_SERVER_SOCKET, pool_size=1,
+                               timeout=self.config.INFERENCE_SERVER_TIMEOUT_SECONDS)
+
+    def create_sparse_embedding(self, remote: bool = True):
+        if self.use_server(remote):
+            from ..sparse_embedding.RemoteSparseEmbeddingProvider import RemoteSparseEmbeddingProvider
+            return RemoteSparseEmbeddingProvider(**self.get_sparse_params(), **self.get_server_params())
+
+        if self.config.INFERENCE_BACKEND == InferenceBackendEnums.ONNX.value:
+            from ..sparse_embedding.OnnxSparseEmbeddingProvider import OnnxSparseEmbeddingProvider
+            return OnnxSparseEmbeddingProvider(**self.get_sparse_params(), **self.get_onnx_params())
+
+        from ..sparse_embedding.SparseEmbeddingProvider import SparseEmbeddingProvider
+        return SparseEmbeddingProvider(**self.get_sparse_params())
+
+    def create_reranker(self, remote: bool = True):
+        if self.use_server(remote):
+            from ..reranker.RemoteCrossEncoderProvider import RemoteCrossEncoderProvider
+            return RemoteCrossEncoderProvider(**self.get_reranker_params(), **self.get_server_params())
+
+        if self.config.INFERENCE_BACKEND == InferenceBackendEnums.ONNX.value:
+            from ..reranker.OnnxCrossEncoderProvider import OnnxCrossEncoderProvider
+            return OnnxCrossEncoderProvider(**self.get_reranker_params(), **self.get_onnx_params())
+
+        from ..reranker.CrossEncoderProvider import CrossEncoderProvider
+        return CrossEncoderProvider(**self.get_reranker_params())
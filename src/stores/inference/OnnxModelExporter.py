@@ -0,0 +1,117 @@
+from .InferenceEnums import OnnxTaskEnums
+from contextlib import contextmanager
+import fcntl
+import logging
+import os
+
+
+class OnnxModelExporter:
+    """
+    Exports Hugging Face models to ONNX once, optionally with dynamic int8
+    quantization of the weights, and caches the result under `cache_dir`.
+    torch is only needed the first time a model is exported.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger(__name__)
+
+    def get_model_dir(self, model_id: str, task: str):
+        return os.path.join(self.cache_dir, f"{model_id.replace('/', '__')}__{task}")
+
+    def get_model_path(self, model_id: str, task: str, quantize_int8: bool = True):
+        file_name = "model_int8.onnx" if quantize_int8 else "model.onnx"
+        return os.path.join(self.get_model_dir(model_id=model_id, task=task), file_name)
+
+    @contextmanager
+    def export_lock(self, model_dir: str):
+        # every uvicorn worker starts at once, only one of them exports
+        with open(os.path.join(model_dir, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_model(self, model_id: str, task: str):
+        from transformers import AutoModelForMaskedLM, AutoModelForSequenceClassification
+
+        if task == OnnxTaskEnums.MASKED_LM.value:
+            return AutoModelForMaskedLM.from_pretrained(model_id)
+        if task == OnnxTaskEnums.SEQUENCE_CLASSIFICATION.value:
+            return AutoModelForSequenceClassification.from_pretrained(model_id)
+
+        raise ValueError(f"Unsupported ONNX task: {task}")
+
+    def export_fp32(self, model_id: str, task: str, tokenizer, output_path: str):
+        import torch
+
+        model = self.load_model(model_id=model_id, task=task)
+        model.eval()
+
+        # a sentence pair, so token_type_ids are exported for the models using them
+        sample = dict(tokenizer("what is onnx", "an open format for models", return_tensors="pt"))
+        input_names = list(sample.keys())
+
+        dynamic_axes = { name: {0: "batch", 1: "sequence"} for name in input_names }
+        dynamic_axes["logits"] = {0: "batch", 1: "sequence"} if task == OnnxTaskEnums.MASKED_LM.value \
+            else {0: "batch"}
+
+        tmp_path = output_path + ".tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (sample,),
+                tmp_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                dynamo=False,
+            )
+        os.replace(tmp_path, output_path)
+
+    def export(self, model_id: str, task: str, tokenizer, quantize_int8: bool = True):
+        """
+        Returns the path of the ONNX model, exporting it if it is not cached yet.
+        """
+        model_dir = self.get_model_dir(model_id=model_id, task=task)
+        model_path = self.get_model_path(model_id=model_id, task=task, quantize_int8=quantize_int8)
+
+        os.makedirs(model_dir, exist_ok=True)
+
+        with self.export_lock(model_dir):
+            if os.path.exists(model_path):
+                return model_path
+
+            fp32_path = self.get_model_path(model_id=model_id, task=task, quantize_int8=False)
+            if not os.path.exists(fp32_path):
+                self.logger.info(f"Exporting {model_id} to ONNX ({task})")
+                self.export_fp32(model_id=model_id, task=task, tokenizer=tokenizer, output_path=fp32_path)
+
+            if quantize_int8:
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+
+                self.logger.info(f"Quantizing {model_id} to int8")
+                tmp_path = model_path + ".tmp"
+                quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+                os.replace(tmp_path, model_path)
+
+        return model_path
+
+
+def create_inference_session(model_path: str, num_threads: int = 0):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+
+    return ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def get_session_inputs(session, tokens) -> dict:
+    # only feed what the exported graph declares (e.g. no token_type_ids for XLM-R)
+    input_names = { session_input.name for session_input in session.get_inputs() }
+    return { name: value for name, value in tokens.items() if name in input_names }
@@ -4,6 +4,11 @@ class LLMEnums(Enum):
     OPENAI = "OPENAI"
     COHERE = "COHERE"
     GEMINI = "GEMINI"
+    FAKE = "FAKE"
+
+class LLMOperationEnums(Enum):
+    GENERATION = "generation"
+    EMBEDDING = "embedding"
 
 class OpenAIEnums(Enum):
     SYSTEM = "system"
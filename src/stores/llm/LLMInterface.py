@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+from ...utils.metrics import LLM_CALLS, LLM_TOKENS, CURRENT_ENDPOINT, get_backend_name
+import asyncio
 
 class LLMInterface(ABC):
 
+    # set by main.py, rolls the token counts up per project
+    usage_tracker = None
+
     @abstractmethod
     def set_generation_model(self, model_id: str):
         pass
@@ -15,10 +20,50 @@ class LLMInterface(ABC):
                             temperature: float = None):
         pass
 
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                        temperature: float = None):
+        # the generation APIs are called with blocking clients, in a thread off the event loop
+        return await asyncio.to_thread(self.generate_text, prompt=prompt, chat_history=chat_history,
+                                       max_output_tokens=max_output_tokens, temperature=temperature)
+
     @abstractmethod
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    async def embed_text_async(self, text: str, document_type: str = None):
+        # providers without an async client run the blocking call in a thread
+        return await asyncio.to_thread(self.embed_text, text=text, document_type=document_type)
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        # providers without a batch endpoint embed the texts one by one
+        return [ self.embed_text(text=text, document_type=document_type) for text in texts ]
+
+    async def embed_texts_async(self, texts: list, document_type: str = None):
+        return await asyncio.to_thread(self.embed_texts, texts=texts, document_type=document_type)
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
-        pass
\ No newline at end of file
+        pass
+
+    def estimate_tokens(self, texts: list) -> int:
+        # for the APIs that do not report usage, ~4 characters per token
+        return sum(len(text) for text in texts) // 4
+
+    def record_usage(self, operation: str, model: str, prompt_tokens: int, completion_tokens: int=0):
+        backend = get_backend_name(self)
+        model = model or "none"
+        endpoint = CURRENT_ENDPOINT.get()
+        prompt_tokens = int(prompt_tokens or 0)
+        completion_tokens = int(completion_tokens or 0)
+
+        LLM_CALLS.labels(backend=backend, model=model, endpoint=endpoint, operation=operation).inc()
+        LLM_TOKENS.labels(backend=backend, model=model, endpoint=endpoint,
+                          operation=operation, token_type="prompt").inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(backend=backend, model=model, endpoint=endpoint,
+                              operation=operation, token_type="completion").inc(completion_tokens)
+
+        if self.usage_tracker is not None:
+            self.usage_tracker.record(backend=backend, model=model, operation=operation,
+                                      endpoint=endpoint, prompt_tokens=prompt_tokens,
+                                      completion_tokens=completion_tokens)
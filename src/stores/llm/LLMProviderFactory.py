@@ -1,6 +1,5 @@
 
 from .LLMEnums import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider, GeminiProvider
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
@@ -8,6 +7,7 @@ class LLMProviderFactory:
 
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
+            from .providers import OpenAIProvider
             return OpenAIProvider(
                 api_key=self.config.OPENAI_API_KEY,
                 base_url=self.config.OPENAI_base_URL,
@@ -17,6 +17,7 @@ class LLMProviderFactory:
             )
 
         if provider == LLMEnums.COHERE.value:
+            from .providers import CoHereProvider
             return CoHereProvider(
                 api_key=self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
@@ -25,6 +26,7 @@ class LLMProviderFactory:
             )
         
         if provider == LLMEnums.GEMINI.value:
+            from .providers import GeminiProvider
             return GeminiProvider(
                 api_key=self.config.GEMINI_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
@@ -32,4 +34,14 @@ class LLMProviderFactory:
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
             )
 
+        if provider == LLMEnums.FAKE.value:
+            from .providers import FakeProvider
+            return FakeProvider(
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_latency_ms=self.config.FAKE_EMBEDDING_LATENCY_MS,
+                generation_latency_ms=self.config.FAKE_GENERATION_LATENCY_MS,
+            )
+
         return None
\ No newline at end of file
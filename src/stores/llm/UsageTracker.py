@@ -0,0 +1,120 @@
+from ...models.db_schemes import ProjectUsage
+from ...utils.metrics import LLM_COST
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import asyncio
+import logging
+import threading
+
+# project of the request being served, set by the routers (set_usage_project)
+CURRENT_PROJECT = ContextVar("current_project", default=None)
+
+
+class UsageTracker:
+    """
+    Write-behind accounting of the LLM tokens per project.
+
+    Provider calls only add their counts to an in-memory buffer keyed by
+    (project, day, backend, model, operation), a background task writes the
+    buffer to Mongo every `flush_interval` seconds in one bulk upsert. A failed
+    flush puts the counts back so they go out with the next one.
+
+    `token_prices` maps a model id to its USD price per million tokens:
+    {"gpt-4o-mini": {"prompt": 0.15, "completion": 0.6}}.
+    """
+
+    def __init__(self, usage_model, flush_interval: float=10.0, token_prices: dict=None):
+        self.usage_model = usage_model
+        self.flush_interval = flush_interval
+        self.token_prices = token_prices or {}
+
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.flush_task = None
+        self.logger = logging.getLogger(__name__)
+
+    def get_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prices = self.token_prices.get(model)
+        if not prices:
+            return 0.0
+
+        return (prompt_tokens * prices.get("prompt", 0.0)
+                + completion_tokens * prices.get("completion", 0.0)) / 1_000_000
+
+    def record(self, backend: str, model: str, operation: str, endpoint: str,
+               prompt_tokens: int, completion_tokens: int=0):
+        """
+        Called from the providers, possibly in worker threads.
+        """
+        cost = self.get_cost(model=model, prompt_tokens=prompt_tokens,
+                             completion_tokens=completion_tokens)
+        if cost:
+            LLM_COST.labels(backend=backend, model=model, endpoint=endpoint).inc(cost)
+
+        project_id = CURRENT_PROJECT.get()
+        if not project_id:
+            return
+
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        key = (project_id, day, backend, model, operation)
+
+        with self.lock:
+            counts = self.pending.setdefault(key, [0, 0, 0, 0.0])
+            counts[0] += 1
+            counts[1] += prompt_tokens
+            counts[2] += completion_tokens
+            counts[3] += cost
+
+    def take_pending(self) -> dict:
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        return pending
+
+    def restore_pending(self, pending: dict):
+        with self.lock:
+            for key, (calls, prompt_tokens, completion_tokens, cost) in pending.items():
+                counts = self.pending.setdefault(key, [0, 0, 0, 0.0])
+                counts[0] += calls
+                counts[1] += prompt_tokens
+                counts[2] += completion_tokens
+                counts[3] += cost
+
+    async def flush(self):
+        pending = self.take_pending()
+        if not pending:
+            return 0
+
+        usages = [
+            ProjectUsage(project_id=project_id, day=day, backend=backend, model=model,
+                         operation=operation, calls=calls, prompt_tokens=prompt_tokens,
+                         completion_tokens=completion_tokens, cost=cost)
+            for (project_id, day, backend, model, operation), (calls, prompt_tokens, completion_tokens, cost)
+            in pending.items()
+        ]
+
+        try:
+            return await self.usage_model.increment_many(usages)
+        except Exception as e:
+            self.logger.error(f"Error while writing LLM usage, retrying on next flush: {e}")
+            self.restore_pending(pending)
+            return 0
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+
+        await self.flush()
@@ -1,5 +1,5 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import CoHereEnums, DocumentTypeEnum
+from ..LLMEnums import CoHereEnums, DocumentTypeEnum, LLMOperationEnums
 import cohere 
 import logging
 
@@ -35,6 +35,15 @@ class CoHereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
+    def record_response_usage(self, operation: LLMOperationEnums, model: str, response):
+        billed_units = getattr(getattr(response, "meta", None), "billed_units", None)
+        if billed_units is None:
+            return
+
+        self.record_usage(operation=operation.value, model=model,
+                          prompt_tokens=billed_units.input_tokens,
+                          completion_tokens=billed_units.output_tokens)
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
 
@@ -60,7 +69,8 @@ class CoHereProvider(LLMInterface):
         if not response or not response.text:
             self.logger.error("Error while generating text with CoHere")
             return None
-        
+
+        self.record_response_usage(LLMOperationEnums.GENERATION, self.generation_model_id, response)
         return response.text
     
     def embed_text(self, text: str, document_type: str = None):
@@ -73,21 +83,51 @@ class CoHereProvider(LLMInterface):
             return None
         
         input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
+        if document_type == DocumentTypeEnum.QUERY.value:
             input_type = CoHereEnums.QUERY
 
         response = self.client.embed(
             model = self.embedding_model_id,
             texts = [self.process_text(text)],
-            input_type = input_type,
+            input_type = input_type.value,
             embedding_types=['float'],
         )
 
         if not response or not response.embeddings or not response.embeddings.float:
             self.logger.error("Error while embedding text with CoHere")
             return None
+
+        self.record_response_usage(LLMOperationEnums.EMBEDDING, self.embedding_model_id, response)
         
         return response.embeddings.float[0]
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        if not self.client:
+            self.logger.error("CoHere client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        input_type = CoHereEnums.DOCUMENT
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY
+
+        response = self.client.embed(
+            model = self.embedding_model_id,
+            texts = [ self.process_text(text) for text in texts ],
+            input_type = input_type.value,
+            embedding_types=['float'],
+        )
+
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding texts with CoHere")
+            return None
+
+        self.record_response_usage(LLMOperationEnums.EMBEDDING, self.embedding_model_id, response)
+
+        return response.embeddings.float
     
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -0,0 +1,107 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import OpenAIEnums, LLMOperationEnums
+import hashlib
+import logging
+import math
+import re
+import time
+
+
+class FakeProvider(LLMInterface):
+    """
+    Deterministic offline provider for benchmarks and local runs: texts are
+    embedded by hashing their words into `embedding_size` buckets (texts
+    sharing words stay close), generation echoes the start of the prompt.
+    The optional latencies stand in for the round trip to a real API.
+    """
+
+    def __init__(self, default_input_max_characters: int=1000,
+                       default_generation_max_output_tokens: int=1000,
+                       default_generation_temperature: float=0.1,
+                       embedding_latency_ms: int=0, generation_latency_ms: int=0):
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.embedding_latency_ms = embedding_latency_ms
+        self.generation_latency_ms = generation_latency_ms
+
+        self.generation_model_id = None
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.enums = OpenAIEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    def wait(self, latency_ms: int):
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        self.wait(self.generation_latency_ms)
+
+        # ~4 characters per token
+        answer = self.process_text(prompt)[:max_output_tokens * 4]
+        self.record_usage(operation=LLMOperationEnums.GENERATION.value, model=self.generation_model_id,
+                          prompt_tokens=self.estimate_tokens([ message["content"] for message in chat_history ]),
+                          completion_tokens=self.estimate_tokens([ answer ]))
+        return answer
+
+    def hash_text(self, text: str):
+        vector = [ 0.0 ] * self.embedding_size
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.embedding_size
+            vector[bucket] += 1.0 if digest[4] % 2 else -1.0
+
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [ value / norm for value in vector ]
+
+    def embed_text(self, text: str, document_type: str = None):
+
+        if not self.embedding_size:
+            self.logger.error("Embedding size for Fake provider was not set")
+            return None
+
+        self.wait(self.embedding_latency_ms)
+        self.record_usage(operation=LLMOperationEnums.EMBEDDING.value, model=self.embedding_model_id,
+                          prompt_tokens=self.estimate_tokens([ self.process_text(text) ]))
+        return self.hash_text(self.process_text(text))
+
+    def embed_texts(self, texts: list, document_type: str = None):
+
+        if not self.embedding_size:
+            self.logger.error("Embedding size for Fake provider was not set")
+            return None
+
+        # one simulated round trip for the whole batch
+        self.wait(self.embedding_latency_ms)
+        self.record_usage(operation=LLMOperationEnums.EMBEDDING.value, model=self.embedding_model_id,
+                          prompt_tokens=self.estimate_tokens([ self.process_text(text) for text in texts ]))
+        return [ self.hash_text(self.process_text(text)) for text in texts ]
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_text(prompt)
+        }
@@ -1,5 +1,5 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import DocumentTypeEnum, GeminiEnums
+from ..LLMEnums import DocumentTypeEnum, GeminiEnums, LLMOperationEnums
 import google.generativeai as genai
 import logging
 
@@ -71,7 +71,14 @@ class GeminiProvider(LLMInterface):
                 self.process_text(prompt),
                 generation_config=genai.types.GenerationConfig(**current_gen_config)
             )
-            
+
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                self.record_usage(operation=LLMOperationEnums.GENERATION.value,
+                                  model=self.generation_model_id,
+                                  prompt_tokens=usage.prompt_token_count,
+                                  completion_tokens=usage.candidates_token_count)
+
             return response.text
         except Exception as e:
             self.logger.error(f"Error while generating text with Gemini: {e}")
@@ -90,11 +97,35 @@ class GeminiProvider(LLMInterface):
                 content=self.process_text(text),
                 task_type=task_type
             )
+            # embed_content does not report usage
+            self.record_usage(operation=LLMOperationEnums.EMBEDDING.value, model=self.embedding_model_id,
+                              prompt_tokens=self.estimate_tokens([ self.process_text(text) ]))
             return result['embedding']
         except Exception as e:
             self.logger.error(f"Error while embedding text with Gemini: {e}")
             return None
 
+    def embed_texts(self, texts: list, document_type: str = None):
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for Gemini was not set")
+            return None
+
+        task_type = "RETRIEVAL_DOCUMENT" if document_type == DocumentTypeEnum.DOCUMENT.value else "RETRIEVAL_QUERY"
+
+        try:
+            # a list of contents is embedded in one batch request
+            result = genai.embed_content(
+                model=self.embedding_model_id,
+                content=[ self.process_text(text) for text in texts ],
+                task_type=task_type
+            )
+            self.record_usage(operation=LLMOperationEnums.EMBEDDING.value, model=self.embedding_model_id,
+                              prompt_tokens=self.estimate_tokens([ self.process_text(text) for text in texts ]))
+            return result['embedding']
+        except Exception as e:
+            self.logger.error(f"Error while embedding texts with Gemini: {e}")
+            return None
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
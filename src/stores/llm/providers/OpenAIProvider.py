@@ -1,6 +1,6 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from ..LLMEnums import OpenAIEnums, LLMOperationEnums
+from openai import OpenAI, AsyncOpenAI
 import logging
 
 
@@ -27,6 +27,10 @@ class OpenAIProvider(LLMInterface):
             api_key = self.api_key,
             base_url = self.base_url if self.base_url and len(self.base_url) else None
         )
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.base_url if self.base_url and len(self.base_url) else None
+        )
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -40,6 +44,15 @@ class OpenAIProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
+    def record_response_usage(self, operation: LLMOperationEnums, model: str, response):
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        self.record_usage(operation=operation.value, model=model,
+                          prompt_tokens=getattr(usage, "prompt_tokens", 0),
+                          completion_tokens=getattr(usage, "completion_tokens", 0))
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
         
@@ -69,6 +82,8 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Error while generating text with OpenAI")
             return None
 
+        self.record_response_usage(LLMOperationEnums.GENERATION, self.generation_model_id, response)
+
         return response.choices[0].message.content
 
 
@@ -91,8 +106,79 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Error while embedding text with OpenAI")
             return None
 
+        self.record_response_usage(LLMOperationEnums.EMBEDDING, self.embedding_model_id, response)
+
         return response.data[0].embedding
 
+    async def embed_text_async(self, text: str, document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            model = self.embedding_model_id,
+            input = text,
+        )
+
+        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+            self.logger.error("Error while embedding text with OpenAI")
+            return None
+
+        self.record_response_usage(LLMOperationEnums.EMBEDDING, self.embedding_model_id, response)
+
+        return response.data[0].embedding
+
+    def embed_texts(self, texts: list, document_type: str = None):
+
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = self.client.embeddings.create(
+            model = self.embedding_model_id,
+            input = texts,
+        )
+
+        if not response or not response.data or len(response.data) != len(texts):
+            self.logger.error("Error while embedding texts with OpenAI")
+            return None
+
+        self.record_response_usage(LLMOperationEnums.EMBEDDING, self.embedding_model_id, response)
+
+        return [ record.embedding for record in sorted(response.data, key=lambda record: record.index) ]
+
+    async def embed_texts_async(self, texts: list, document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            model = self.embedding_model_id,
+            input = texts,
+        )
+
+        if not response or not response.data or len(response.data) != len(texts):
+            self.logger.error("Error while embedding texts with OpenAI")
+            return None
+
+        self.record_response_usage(LLMOperationEnums.EMBEDDING, self.embedding_model_id, response)
+
+        return [ record.embedding for record in sorted(response.data, key=lambda record: record.index) ]
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
@@ -1,3 +1,13 @@
-from .CoHereProvider import CoHereProvider
-from .OpenAIProvider import OpenAIProvider
-from .GeminiProvider import GeminiProvider
\ No newline at end of file
+import importlib
+
+# each provider pulls in its SDK, it is imported the first time it is used
+__all__ = ["CoHereProvider", "OpenAIProvider", "GeminiProvider", "FakeProvider"]
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    provider = getattr(importlib.import_module(f".{name}", __name__), name)
+    # the submodule import bound its module to the name, the class replaces it
+    globals()[name] = provider
+    return provider
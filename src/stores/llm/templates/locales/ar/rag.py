@@ -19,7 +19,7 @@ system_prompt = Template("\n".join([
     "رابعاً، حافظ على نبرة احترافية وموضوعية.",
     "خامساً، إذا كانت الإجابة غير موجودة في المستندات، أجب بوضوح أن 'المعلومات المطلوبة غير متوفرة في المصادر المقدمة'.",
     "عليك توليد الرد بنفس لغة استفسار المستخدم.",
-    "كن مؤدباً ومحترماً في التعامل مع المستخدم.",
+    "كن مؤدباً ومحترماً في التعامل مع المستخدم.",
 ]))
 
 #### Document ####
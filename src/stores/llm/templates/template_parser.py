@@ -1,43 +1,140 @@
+from string import Template
+from typing import List
+import importlib
+import logging
 import os
+import threading
+import time
 
 class TemplateParser:
+    """
+    Loads every locale template group once into an in-memory registry
+    (group -> key -> Template) with the default language fallback already
+    resolved, so rendering a prompt is a dict lookup.
 
-    def __init__(self, language: str=None, default_language='en'):
+    With `auto_reload` (development) the locale files are checked for changes
+    at most every `reload_interval` seconds and the registry is rebuilt.
+    """
+
+    def __init__(self, language: str=None, default_language='en',
+                       auto_reload: bool=False, reload_interval: float=1.0):
         self.current_path = os.path.dirname(os.path.abspath(__file__))
+        self.locales_path = os.path.join(self.current_path, "locales")
         self.default_language = default_language
         self.language = None
 
+        self.auto_reload = auto_reload
+        self.reload_interval = reload_interval
+        self.last_check = 0.0
+        self.files_mtimes = {}
+        self.reload_lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+        self.registry = {}
+
         self.set_language(language)
 
-    
     def set_language(self, language: str):
-        if not language:
-            self.language = self.default_language
-
-        language_path = os.path.join(self.current_path, "locales", language)
-        if os.path.exists(language_path):
+        if language and os.path.isdir(os.path.join(self.locales_path, language)):
             self.language = language
         else:
             self.language = self.default_language
 
-    def get(self, group: str, key: str, vars: dict={}):
+        self.load_templates()
+
+    def get_group_files(self, language: str) -> dict:
+        language_path = os.path.join(self.locales_path, language)
+        if not os.path.isdir(language_path):
+            return {}
+
+        return {
+            file_name[:-3]: os.path.join(language_path, file_name)
+            for file_name in sorted(os.listdir(language_path))
+            if file_name.endswith(".py") and not file_name.startswith("__")
+        }
+
+    def load_group(self, language: str, group: str, reload: bool=False) -> dict:
+        module_name = f".locales.{language}.{group}"
+        try:
+            module = importlib.import_module(module_name, package=__package__)
+            if reload:
+                module = importlib.reload(module)
+        except Exception as e:
+            self.logger.error(f"Error while loading templates {language}/{group}: {e}")
+            return {}
+
+        return {
+            key: value for key, value in vars(module).items()
+            if isinstance(value, Template)
+        }
+
+    def load_templates(self, reload: bool=False):
+        """
+        Builds the registry: the default language templates, overridden key by
+        key by the selected language ones.
+        """
+        registry, files_mtimes = {}, {}
+
+        languages = [ self.default_language ]
+        if self.language != self.default_language:
+            languages.append(self.language)
+
+        for language in languages:
+            for group, group_path in self.get_group_files(language).items():
+                files_mtimes[group_path] = os.path.getmtime(group_path)
+                registry.setdefault(group, {}).update(
+                    self.load_group(language=language, group=group, reload=reload)
+                )
+
+        # swapped in one assignment, readers never see a half built registry
+        self.registry = registry
+        self.files_mtimes = files_mtimes
+
+    def get_files_mtimes(self) -> dict:
+        languages = { self.default_language, self.language }
+        return {
+            group_path: os.path.getmtime(group_path)
+            for language in languages
+            for group_path in self.get_group_files(language).values()
+        }
+
+    def reload_if_changed(self):
+        now = time.monotonic()
+        if now - self.last_check < self.reload_interval:
+            return
+
+        with self.reload_lock:
+            if now - self.last_check < self.reload_interval:
+                return
+            self.last_check = now
+
+            if self.get_files_mtimes() != self.files_mtimes:
+                self.logger.info("Locale templates changed, reloading")
+                self.load_templates(reload=True)
+
+    def get_template(self, group: str, key: str):
         if not group or not key:
             return None
-        
-        group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py" )
-        targeted_language = self.language
-        if not os.path.exists(group_path):
-            group_path = os.path.join(self.current_path, "locales", self.default_language, f"{group}.py" )
-            targeted_language = self.default_language
-
-        if not os.path.exists(group_path):
-            return None
-        
-        # import group module
-        module = __import__(f"src.stores.llm.templates.locales.{targeted_language}.{group}", fromlist=[group])
 
-        if not module:
+        if self.auto_reload:
+            self.reload_if_changed()
+
+        return self.registry.get(group, {}).get(key)
+
+    def get(self, group: str, key: str, vars: dict={}):
+        template = self.get_template(group=group, key=key)
+        if not template:
             return None
-        
-        key_attribute = getattr(module, key)
-        return key_attribute.substitute(vars)
\ No newline at end of file
+
+        return template.substitute(vars)
+
+    def render_many(self, group: str, key: str, vars_list: List[dict]) -> List[str]:
+        """
+        Renders the same template for each vars dict, e.g. all the document
+        prompts of an answer.
+        """
+        template = self.get_template(group=group, key=key)
+        if not template:
+            return []
+
+        return [ template.substitute(vars) for vars in vars_list ]
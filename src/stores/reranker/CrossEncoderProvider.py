@@ -1,10 +1,61 @@
-from sentence_transformers import CrossEncoder
 from typing import List
+import hashlib
+from ..cache.LRUCache import LRUCache
+from ...utils.metrics import RERANK_PAIRS
 
 class CrossEncoderProvider:
-    def __init__(self, model_id: str):
-        # Load a pre-trained Cross-Encoder model
-        self.model = CrossEncoder(model_id)
+    def __init__(self, model_id: str, batch_size: int = 32, max_length: int = 512,
+                       cache_size: int = 4096):
+        self.model_id = model_id
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+        # (query digest, chunk digest) -> score, so candidates seen for the
+        # same query are not scored again
+        self.score_cache = LRUCache(max_entries=cache_size)
+
+        self.load_model(model_id=model_id)
+
+    def load_model(self, model_id: str):
+        # Load a pre-trained Cross-Encoder model, sentence_transformers (and
+        # torch) are imported here rather than with the app
+        from sentence_transformers import CrossEncoder
+        self.model = CrossEncoder(model_id, max_length=self.max_length)
+
+    def predict_scores(self, model_input: List[list]) -> List[float]:
+        return self.model.predict(model_input, batch_size=self.batch_size)
+
+    def warm_up(self, batch_size: int = 8):
+        """
+        Scores one batch straight through the model (not the score cache),
+        the first call pays for the lazy kernel / session initialisation.
+        """
+        pairs = [ ["warm up query", "a longer warm up passage " * 16] ] * batch_size
+        self.predict_scores(pairs)
+
+    def get_digest(self, text: str):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def score_pairs(self, query: str, texts: List[str]) -> List[float]:
+        """
+        Cross-encoder scores of (query, text) pairs, only the pairs missing
+        from the cache go through the model.
+        """
+        query_digest = self.get_digest(query)
+        keys = [ (query_digest, self.get_digest(text)) for text in texts ]
+        scores = self.score_cache.get_many(keys)
+
+        missing = { key: text for key, text in zip(keys, texts) if key not in scores }
+        RERANK_PAIRS.labels(result="hit").inc(len(keys) - len(missing))
+        RERANK_PAIRS.labels(result="miss").inc(len(missing))
+
+        if missing:
+            predicted = self.predict_scores([ [query, text] for text in missing.values() ])
+            new_scores = { key: float(score) for key, score in zip(missing.keys(), predicted) }
+            self.score_cache.put_many(new_scores)
+            scores.update(new_scores)
+
+        return [ scores[key] for key in keys ]
 
     def rerank_documents(self, query: str, documents: List[dict]) -> List[dict]:
         """
@@ -13,11 +64,8 @@ class CrossEncoderProvider:
         if not documents:
             return []
 
-        # Create pairs of [query, document_text] for the model
-        model_input = [[query, doc['text']] for doc in documents]
-        
-        # Predict scores for each pair
-        scores = self.model.predict(model_input)
+        # Score each [query, document_text] pair
+        scores = self.score_pairs(query=query, texts=[doc['text'] for doc in documents])
         
         # Add the new cross-encoder score to each document
         for i in range(len(documents)):
@@ -26,4 +74,4 @@ class CrossEncoderProvider:
         # Sort documents by the new score in descending order
         reranked_docs = sorted(documents, key=lambda x: x['rerank_score'], reverse=True)
         
-        return reranked_docs
\ No newline at end of file
+        return reranked_docs
@@ -0,0 +1,52 @@
+import numpy as np
+from typing import List
+from .CrossEncoderProvider import CrossEncoderProvider
+from ..inference.InferenceEnums import OnnxTaskEnums
+from ..inference.OnnxModelExporter import OnnxModelExporter, create_inference_session, get_session_inputs
+
+class OnnxCrossEncoderProvider(CrossEncoderProvider):
+    """
+    Cross-encoder scores computed by onnxruntime on an exported (and by
+    default int8 quantized) copy of the model.
+    """
+
+    def __init__(self, model_id: str, cache_dir: str,
+                       quantize_int8: bool = True, num_threads: int = 0, **kwargs):
+        self.cache_dir = cache_dir
+        self.quantize_int8 = quantize_int8
+        self.num_threads = num_threads
+        super().__init__(model_id=model_id, **kwargs)
+
+    def load_model(self, model_id: str):
+        from transformers import AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
+
+        model_path = OnnxModelExporter(cache_dir=self.cache_dir).export(
+            model_id=model_id,
+            task=OnnxTaskEnums.SEQUENCE_CLASSIFICATION.value,
+            tokenizer=self.tokenizer,
+            quantize_int8=self.quantize_int8,
+        )
+        self.session = create_inference_session(model_path=model_path, num_threads=self.num_threads)
+
+    def predict_scores(self, model_input: List[list]) -> List[float]:
+        scores = []
+        for start in range(0, len(model_input), self.batch_size):
+            batch = model_input[start:start + self.batch_size]
+            tokens = self.tokenizer(
+                [ pair[0] for pair in batch ],
+                [ pair[1] for pair in batch ],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='np',
+            )
+            logits = self.session.run(["logits"], get_session_inputs(self.session, tokens))[0]
+
+            # single label models: sigmoid, like sentence_transformers' CrossEncoder.predict
+            if logits.shape[-1] == 1:
+                scores.extend((1 / (1 + np.exp(-logits[:, 0]))).tolist())
+            else:
+                scores.extend(logits.tolist())
+
+        return scores
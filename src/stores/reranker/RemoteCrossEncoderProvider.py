@@ -0,0 +1,26 @@
+from typing import List
+from .CrossEncoderProvider import CrossEncoderProvider
+from ..inference.InferenceClient import InferenceClient
+from ..inference.InferenceEnums import InferenceOperationEnums
+
+class RemoteCrossEncoderProvider(CrossEncoderProvider):
+    """
+    Cross-encoder scores computed by the shared inference server of the
+    host, the worker holds no model. The score cache still runs here.
+    """
+
+    def __init__(self, model_id: str, socket_path: str, pool_size: int = 8,
+                       timeout: float = 30.0, connect_timeout: float = 300.0, **kwargs):
+        self.client = InferenceClient(socket_path=socket_path, pool_size=pool_size, timeout=timeout)
+        self.connect_timeout = connect_timeout
+        super().__init__(model_id=model_id, **kwargs)
+
+    def load_model(self, model_id: str):
+        info = self.client.wait_until_available(timeout=self.connect_timeout)
+        if info["reranker_model_id"] != model_id:
+            raise ValueError(f"Inference server serves {info['reranker_model_id']}, not {model_id}")
+        self.model = None
+
+    def predict_scores(self, model_input: List[list]) -> List[float]:
+        return self.client.request(InferenceOperationEnums.RERANK_SCORES.value,
+                                   inputs=[ list(pair) for pair in model_input ])
@@ -0,0 +1,43 @@
+import numpy as np
+from typing import List
+from .SparseEmbeddingProvider import SparseEmbeddingProvider
+from ..inference.InferenceEnums import OnnxTaskEnums
+from ..inference.OnnxModelExporter import OnnxModelExporter, create_inference_session, get_session_inputs
+
+class OnnxSparseEmbeddingProvider(SparseEmbeddingProvider):
+    """
+    Same SPLADE vectors as SparseEmbeddingProvider, computed by onnxruntime
+    on an exported (and by default int8 quantized) copy of the model.
+    """
+
+    def __init__(self, model_id: str, cache_dir: str,
+                       quantize_int8: bool = True, num_threads: int = 0, **kwargs):
+        self.cache_dir = cache_dir
+        self.quantize_int8 = quantize_int8
+        self.num_threads = num_threads
+        super().__init__(model_id=model_id, **kwargs)
+
+    def load_model(self, model_id: str):
+        model_path = OnnxModelExporter(cache_dir=self.cache_dir).export(
+            model_id=model_id,
+            task=OnnxTaskEnums.MASKED_LM.value,
+            tokenizer=self.tokenizer,
+            quantize_int8=self.quantize_int8,
+        )
+        self.session = create_inference_session(model_path=model_path, num_threads=self.num_threads)
+
+    def encode_batch(self, texts: List[str], batch_size: int = 32):
+        sparse_vectors = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(texts[start:start + batch_size], return_tensors='np', padding=True)
+            logits = self.session.run(["logits"], get_session_inputs(self.session, tokens))[0]
+
+            # Aggregate token embeddings to get a document-level sparse vector
+            vectors = np.max(
+                np.log1p(np.maximum(logits, 0)) * tokens["attention_mask"][..., None],
+                axis=1
+            )
+
+            sparse_vectors.extend(self.to_sparse_vectors(vectors))
+
+        return sparse_vectors
@@ -0,0 +1,29 @@
+from typing import List
+from .SparseEmbeddingProvider import SparseEmbeddingProvider
+from ..inference.InferenceClient import InferenceClient
+from ..inference.InferenceEnums import InferenceOperationEnums
+
+class RemoteSparseEmbeddingProvider(SparseEmbeddingProvider):
+    """
+    SPLADE vectors computed by the shared inference server of the host, the
+    worker holds no model. Pruning and quantization still run here.
+    """
+
+    def __init__(self, model_id: str, socket_path: str, pool_size: int = 8,
+                       timeout: float = 30.0, connect_timeout: float = 300.0, **kwargs):
+        self.client = InferenceClient(socket_path=socket_path, pool_size=pool_size, timeout=timeout)
+        self.connect_timeout = connect_timeout
+        super().__init__(model_id=model_id, **kwargs)
+
+    def load_tokenizer(self, model_id: str):
+        self.tokenizer = None
+
+    def load_model(self, model_id: str):
+        info = self.client.wait_until_available(timeout=self.connect_timeout)
+        if info["sparse_model_id"] != model_id:
+            raise ValueError(f"Inference server serves {info['sparse_model_id']}, not {model_id}")
+        self.model = None
+
+    def encode_batch(self, texts: List[str], batch_size: int = 32):
+        # the server batches across workers, batch_size is its own
+        return self.client.request(InferenceOperationEnums.SPARSE_ENCODE.value, inputs=list(texts))
@@ -1,36 +1,136 @@
-import torch
-from transformers import AutoModelForMaskedLM, AutoTokenizer
+import numpy as np
+from typing import List
+from ..llm.LLMEnums import DocumentTypeEnum
 
 class SparseEmbeddingProvider:
-    def __init__(self, model_id: str ):
+    def __init__(self, model_id: str,
+                       doc_top_k: int = 0, doc_min_weight: float = 0.0,
+                       query_top_k: int = 0, query_min_weight: float = 0.0,
+                       quantize_uint8: bool = False, quantization_max_weight: float = 5.0):
+        self.model_id = model_id
+        self.load_tokenizer(model_id=model_id)
+        self.load_model(model_id=model_id)
+
+        # pruning per document type, a top_k of 0 keeps every term above min_weight
+        self.pruning = {
+            DocumentTypeEnum.DOCUMENT.value: (doc_top_k, doc_min_weight),
+            DocumentTypeEnum.QUERY.value: (query_top_k, query_min_weight),
+        }
+        self.quantize_uint8 = quantize_uint8
+        self.quantization_max_weight = quantization_max_weight
+
+    # torch and transformers are imported when the model loads, not with the app
+    def load_tokenizer(self, model_id: str):
+        from transformers import AutoTokenizer
         self.tokenizer = AutoTokenizer.from_pretrained(model_id)
+
+    def load_model(self, model_id: str):
+        from transformers import AutoModelForMaskedLM
         self.model = AutoModelForMaskedLM.from_pretrained(model_id)
         self.model.eval()  # Set model to evaluation mode
 
-    def generate_sparse_vector(self, text: str):
+    def prune_sparse_vector(self, sparse_vector: dict, top_k: int = 0, min_weight: float = 0.0):
+        """
+        Keeps the `top_k` heaviest terms with a weight >= `min_weight`.
+        """
+        indices = np.asarray(sparse_vector["indices"], dtype=np.int64)
+        values = np.asarray(sparse_vector["values"], dtype=np.float32)
+
+        keep = values >= min_weight
+        indices, values = indices[keep], values[keep]
+
+        if top_k and len(values) > top_k:
+            top = np.argpartition(-values, top_k - 1)[:top_k]
+            top.sort()
+            indices, values = indices[top], values[top]
+
+        return {
+            "indices": indices.tolist(),
+            "values": values.tolist(),
+        }
+
+    def quantize_sparse_vector(self, sparse_vector: dict):
+        """
+        Maps the weights linearly onto 1..255 with a fixed scale, so document
+        scores keep the same order and the index can store them as uint8.
+        """
+        values = np.asarray(sparse_vector["values"], dtype=np.float32)
+        values = np.clip(np.rint(values / self.quantization_max_weight * 255), 1, 255)
+
+        return {
+            "indices": sparse_vector["indices"],
+            "values": values.astype(np.uint8).tolist(),
+        }
+
+    def encode(self, text: str):
+        """
+        Raw SPLADE output: every non-zero vocabulary weight.
+        """
+        return self.encode_batch(texts=[text])[0]
+
+    def to_sparse_vectors(self, vectors: np.ndarray):
+        sparse_vectors = []
+        for vector in vectors:
+            indices = np.nonzero(vector)[0]
+            sparse_vectors.append({
+                "indices": indices.tolist(),
+                "values": vector[indices].tolist()
+            })
+        return sparse_vectors
+
+    def encode_batch(self, texts: List[str], batch_size: int = 32):
         """
-        Generates a sparse vector for a given text using the SPLADE model.
+        Runs the texts through the model `batch_size` at a time, padded to the
+        longest text of the batch (the padding is masked out of the max pooling).
         """
+        import torch
+
+        sparse_vectors = []
         with torch.no_grad():
-            tokens = self.tokenizer(text, return_tensors='pt')
-            output = self.model(**tokens)
-            
-            # Aggregate token embeddings to get a document-level sparse vector
-            vector = torch.max(
-                torch.log(1 + torch.relu(output[0])) * tokens.attention_mask.unsqueeze(-1), 
-                dim=1
-            )[0].squeeze()
-
-            # Extract non-zero indices and their values
-            indices = vector.nonzero().squeeze().cpu().tolist()
-            values = vector[indices].cpu().tolist()
-
-            # Ensure indices are always a list
-            if not isinstance(indices, list):
-                indices = [indices]
-                values = [values]
-            
-            return {
-                "indices": indices,
-                "values": values
-            }
\ No newline at end of file
+            for start in range(0, len(texts), batch_size):
+                tokens = self.tokenizer(texts[start:start + batch_size], return_tensors='pt', padding=True)
+                output = self.model(**tokens)
+
+                # Aggregate token embeddings to get a document-level sparse vector
+                vectors = torch.max(
+                    torch.log(1 + torch.relu(output[0])) * tokens.attention_mask.unsqueeze(-1),
+                    dim=1
+                )[0]
+
+                sparse_vectors.extend(self.to_sparse_vectors(vectors.cpu().numpy()))
+
+        return sparse_vectors
+
+    def warm_up(self, batch_size: int = 8):
+        """
+        Runs one padded batch through the model, the first call pays for the
+        lazy kernel / session initialisation instead of a user query.
+        """
+        texts = [ "warm up query", "a longer warm up passage " * 16 ] * (batch_size // 2 + 1)
+        self.encode_batch(texts=texts[:batch_size], batch_size=batch_size)
+
+    def postprocess_sparse_vector(self, sparse_vector: dict, document_type: str):
+        top_k, min_weight = self.pruning.get(document_type, (0, 0.0))
+        sparse_vector = self.prune_sparse_vector(sparse_vector, top_k=top_k, min_weight=min_weight)
+
+        # queries stay in float, scaling only the documents keeps the ranking
+        if self.quantize_uint8 and document_type == DocumentTypeEnum.DOCUMENT.value:
+            sparse_vector = self.quantize_sparse_vector(sparse_vector)
+
+        return sparse_vector
+
+    def generate_sparse_vectors(self, texts: List[str], document_type: str = DocumentTypeEnum.DOCUMENT.value):
+        """
+        Batched generate_sparse_vector, in the order of `texts`.
+        """
+        return [
+            self.postprocess_sparse_vector(sparse_vector, document_type=document_type)
+            for sparse_vector in self.encode_batch(texts=texts)
+        ]
+
+    def generate_sparse_vector(self, text: str, document_type: str = DocumentTypeEnum.DOCUMENT.value):
+        """
+        Generates a sparse vector for a given text using the SPLADE model,
+        pruned with the settings of its document type.
+        """
+        return self.postprocess_sparse_vector(self.encode(text=text), document_type=document_type)
@@ -41,11 +41,48 @@ class VectorDBInterface(ABC):
 
     @abstractmethod
     def insert_many(self, collection_name: str, texts: list, 
-                          vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
+                          dense_vectors: list, sparse_vectors: list,
+                          metadata: list = None, 
+                          record_ids: list = None, batch_size: int = None,
+                          asset_ids: list = None, project_id: str = None,
+                          index_version: str = None):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    def delete_by_filter(self, collection_name: str, filters: dict,
+                               exclude_filters: dict = None):
+        pass
+
+    @abstractmethod
+    def count(self, collection_name: str, filters: dict = None) -> int:
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               filters: dict = None):
+        pass
+
+    @abstractmethod
+    def search_by_sparse_vector(self, collection_name: str, sparse_vector: dict, limit: int,
+                                      filters: dict = None):
+        pass
+
+    @abstractmethod
+    def search_hybrid(self, collection_name: str, dense_vector: list, sparse_vector: dict,
+                      dense_limit: int, sparse_limit: int, limit: int,
+                      filters: dict = None):
+        pass
+
+    @abstractmethod
+    def search_batch(self, collection_name: str, dense_vectors: list = None, sparse_vectors: list = None,
+                           dense_limit: int = 10, sparse_limit: int = 5, limit: int = 5,
+                           filters: dict = None):
+        pass
+
+    @abstractmethod
+    def get_alias_target(self, alias_name: str):
+        pass
+
+    @abstractmethod
+    def switch_alias(self, alias_name: str, collection_name: str):
         pass
-    
\ No newline at end of file
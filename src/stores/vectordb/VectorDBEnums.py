@@ -2,7 +2,18 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    EMBEDDED = "EMBEDDED"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
-    DOT = "dot"
\ No newline at end of file
+    DOT = "dot"
+
+class QuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar"
+    BINARY = "binary"
+
+
+class TenancyModeEnums(Enum):
+    COLLECTION = "collection"
+    SHARED = "shared"
@@ -1,5 +1,4 @@
-from .providers import QdrantDBProvider
-from .VectorDBEnums import VectorDBEnums
+from .VectorDBEnums import VectorDBEnums, TenancyModeEnums
 from ...controllers.BaseController import BaseController
 
 class VectorDBProviderFactory:
@@ -7,12 +6,57 @@ class VectorDBProviderFactory:
         self.config = config
         self.base_controller = BaseController()
 
+    def get_qdrant_params(self) -> dict:
+        return {
+            "url": self.config.QDRANT_URL,
+            "distance_method": self.config.VECTOR_DB_DISTANCE_METHOD,
+            "prefer_grpc": self.config.QDRANT_PREFER_GRPC,
+            "grpc_port": self.config.QDRANT_GRPC_PORT,
+            "timeout": self.config.QDRANT_TIMEOUT,
+            "pool_size": self.config.QDRANT_POOL_SIZE,
+            "upload_batch_size": self.config.VECTOR_DB_UPLOAD_BATCH_SIZE,
+            "upload_max_batch_bytes": self.config.VECTOR_DB_UPLOAD_MAX_BATCH_BYTES,
+            "upload_parallel": self.config.VECTOR_DB_UPLOAD_PARALLEL,
+            "upload_max_retries": self.config.VECTOR_DB_UPLOAD_MAX_RETRIES,
+            "quantization": self.config.VECTOR_DB_QUANTIZATION,
+            "quantization_always_ram": self.config.VECTOR_DB_QUANTIZATION_ALWAYS_RAM,
+            "dense_on_disk": self.config.VECTOR_DB_DENSE_ON_DISK,
+            "sparse_on_disk": self.config.VECTOR_DB_SPARSE_ON_DISK,
+            "hnsw_m": self.config.VECTOR_DB_HNSW_M,
+            "hnsw_ef_construct": self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+            "search_oversampling": self.config.VECTOR_DB_SEARCH_OVERSAMPLING,
+            "search_rescore": self.config.VECTOR_DB_SEARCH_RESCORE,
+            "multitenant": self.config.VECTOR_DB_TENANCY_MODE == TenancyModeEnums.SHARED.value,
+            "sparse_uint8": self.config.SPARSE_QUANTIZE_UINT8,
+        }
+
     def create(self, provider: str):
         if provider == VectorDBEnums.QDRANT.value:
+            from .providers import QdrantDBProvider
+
+            return QdrantDBProvider(**self.get_qdrant_params())
+
+        if provider == VectorDBEnums.EMBEDDED.value:
+            from .providers import EmbeddedVectorDBProvider
+            db_path = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
 
-            return QdrantDBProvider(
-                url=self.config.QDRANT_URL,
+            return EmbeddedVectorDBProvider(
+                db_path=db_path,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
             )
         
-        return None
\ No newline at end of file
+        return None
+
+    def create_async(self, provider: str):
+        """
+        Async client for the query paths running on the event loop, None when
+        the backend has none: those paths then run the sync client in a thread.
+        """
+        # the local ":memory:" client keeps its points in the process, an async
+        # one would not see what the sync client indexed
+        if provider == VectorDBEnums.QDRANT.value and self.config.QDRANT_URL != ":memory:":
+            from .providers import AsyncQdrantDBProvider
+
+            return AsyncQdrantDBProvider(**self.get_qdrant_params())
+
+        return None
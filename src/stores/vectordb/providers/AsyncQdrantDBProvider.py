@@ -0,0 +1,280 @@
+from qdrant_client import models, AsyncQdrantClient
+from .QdrantDBProvider import QdrantDBProvider
+from typing import List
+import asyncio
+
+class AsyncQdrantDBProvider(QdrantDBProvider):
+    """
+    Same collection layout and payloads as QdrantDBProvider, served by
+    AsyncQdrantClient so callers running on the event loop can await
+    Qdrant calls instead of blocking the worker.
+    """
+
+    def connect(self):
+        self.client = AsyncQdrantClient(**self.get_client_params())
+
+    async def disconnect(self):
+        if self.client:
+            await self.client.close()
+        self.client = None
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        if await self.client.collection_exists(collection_name=collection_name):
+            return True
+        return await self.get_alias_target(alias_name=collection_name) is not None
+
+    async def list_all_collections(self) -> List:
+        return await self.client.get_collections()
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        return await self.client.get_collection(
+            collection_name=await self.resolve_collection_name(collection_name)
+        )
+
+    async def delete_collection(self, collection_name: str):
+        target_collection = await self.get_alias_target(alias_name=collection_name)
+        if target_collection:
+            return await self.client.delete_collection(collection_name=target_collection)
+
+        if await self.client.collection_exists(collection_name=collection_name):
+            return await self.client.delete_collection(collection_name=collection_name)
+
+    async def delete_by_filter(self, collection_name: str, filters: dict,
+                                     exclude_filters: dict = None):
+        if not await self.is_collection_existed(collection_name):
+            return None
+
+        return await self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(
+                filter=self.build_filter(filters=filters, exclude_filters=exclude_filters)
+            ),
+        )
+
+    async def count(self, collection_name: str, filters: dict = None) -> int:
+        result = await self.client.count(
+            collection_name=collection_name,
+            count_filter=self.build_filter(filters=filters),
+            exact=True,
+        )
+        return result.count
+
+    async def get_alias_target(self, alias_name: str):
+        aliases = await self.client.get_aliases()
+        return self.find_alias_target(aliases=aliases, alias_name=alias_name)
+
+    async def resolve_collection_name(self, collection_name: str):
+        return await self.get_alias_target(alias_name=collection_name) or collection_name
+
+    async def switch_alias(self, alias_name: str, collection_name: str):
+        previous_collection = await self.get_alias_target(alias_name=alias_name)
+
+        if not previous_collection and await self.client.collection_exists(collection_name=alias_name):
+            self.logger.warning(f"Replacing legacy collection {alias_name} with an alias")
+            await self.client.delete_collection(collection_name=alias_name)
+
+        await self.client.update_collection_aliases(
+            change_aliases_operations=self.build_alias_operations(
+                alias_name=alias_name,
+                collection_name=collection_name,
+                previous_collection=previous_collection,
+            )
+        )
+
+        return previous_collection
+
+    async def create_collection(self, collection_name: str,
+                                      embedding_size: int,
+                                      do_reset: bool = False):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if not await self.is_collection_existed(collection_name):
+            _ = await self.client.create_collection(
+                collection_name=collection_name,
+                **self.build_collection_params(embedding_size=embedding_size)
+            )
+
+            for field_name, field_schema in self.PAYLOAD_INDEXES.items():
+                _ = await self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+
+            return True
+
+        return False
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                               metadata: dict = None,
+                               record_id: str = None):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
+            return False
+
+        try:
+            _ = await self.client.upsert(
+                collection_name=collection_name,
+                points=[
+                    models.PointStruct(
+                        id=record_id,
+                        vector={"dense": vector},
+                        payload={
+                            "text": text, "metadata": metadata
+                        }
+                    )
+                ]
+            )
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    async def upsert_batch(self, collection_name: str, points: list, wait: bool,
+                                 semaphore: asyncio.Semaphore = None):
+        semaphore = semaphore or asyncio.Semaphore(1)
+
+        for attempt in range(self.upload_max_retries + 1):
+            try:
+                async with semaphore:
+                    await self.client.upsert(
+                        collection_name=collection_name,
+                        points=points,
+                        wait=wait,
+                    )
+                return True
+            except Exception as e:
+                self.logger.warning(f"Error while inserting batch (attempt {attempt + 1}): {e}")
+                if attempt < self.upload_max_retries:
+                    await asyncio.sleep(min(2 ** attempt * 0.5, 8))
+
+        self.logger.error(f"Giving up on a batch of {len(points)} points for {collection_name}")
+        return False
+
+    async def insert_many(self, collection_name: str, texts: list,
+                                dense_vectors: list, sparse_vectors: list,
+                                metadata: list = None,
+                                record_ids: list = None, batch_size: int = None,
+                                asset_ids: list = None, project_id: str = None,
+                                index_version: str = None):
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        if asset_ids is None:
+            asset_ids = [None] * len(texts)
+
+        if len(texts) == 0:
+            return True
+
+        batches = [
+            self.build_points(
+                texts=texts[start:end],
+                dense_vectors=dense_vectors[start:end],
+                sparse_vectors=sparse_vectors[start:end],
+                metadata=metadata[start:end],
+                record_ids=record_ids[start:end],
+                asset_ids=asset_ids[start:end],
+                project_id=project_id,
+                index_version=index_version,
+            )
+            for start, end in self.build_batches(
+                texts=texts,
+                dense_vectors=dense_vectors,
+                sparse_vectors=sparse_vectors,
+                metadata=metadata,
+                batch_size=batch_size or self.upload_batch_size,
+            )
+        ]
+
+        *pending_batches, last_batch = batches
+
+        semaphore = asyncio.Semaphore(self.upload_parallel)
+        results = list(await asyncio.gather(*[
+            self.upsert_batch(collection_name=collection_name, points=points,
+                              wait=False, semaphore=semaphore)
+            for points in pending_batches
+        ]))
+
+        # consistency barrier
+        results.append(
+            await self.upsert_batch(collection_name=collection_name, points=last_batch, wait=True)
+        )
+
+        if not all(results):
+            self.logger.error(f"{results.count(False)} of {len(results)} batches failed for {collection_name}")
+            return False
+
+        return True
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                                     oversampling: float = None, rescore: bool = None,
+                                     filters: dict = None):
+
+        results = await self.client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            using="dense",
+            limit=limit,
+            search_params=self.build_search_params(oversampling=oversampling, rescore=rescore),
+            query_filter=self.build_filter(filters=filters),
+        )
+
+        return self.to_retrieved_documents(results)
+
+    async def search_by_sparse_vector(self, collection_name: str, sparse_vector: dict, limit: int = 5,
+                                            filters: dict = None):
+
+        results = await self.client.query_points(
+            collection_name=collection_name,
+            query=models.SparseVector(**sparse_vector),
+            using="sparse",
+            limit=limit,
+            query_filter=self.build_filter(filters=filters),
+        )
+
+        return self.to_retrieved_documents(results)
+
+    async def search_hybrid(self, collection_name: str, dense_vector: list, sparse_vector: dict,
+                                  dense_limit: int, sparse_limit: int, limit: int,
+                                  oversampling: float = None, rescore: bool = None,
+                                  filters: dict = None):
+
+        query_filter = self.build_filter(filters=filters)
+
+        results = await self.client.query_points(
+            collection_name=collection_name,
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            prefetch=self.build_hybrid_prefetch(
+                dense_vector=dense_vector,
+                sparse_vector=sparse_vector,
+                dense_limit=dense_limit,
+                sparse_limit=sparse_limit,
+                oversampling=oversampling,
+                rescore=rescore,
+                query_filter=query_filter,
+            ),
+            query_filter=query_filter,
+            limit=limit
+        )
+
+        return self.to_retrieved_documents(results)
+
+    async def search_batch(self, collection_name: str, dense_vectors: list = None, sparse_vectors: list = None,
+                                 dense_limit: int = 10, sparse_limit: int = 5, limit: int = 5,
+                                 filters: dict = None):
+
+        requests = self.build_query_requests(dense_vectors=dense_vectors, sparse_vectors=sparse_vectors,
+                                             dense_limit=dense_limit, sparse_limit=sparse_limit,
+                                             limit=limit, filters=filters)
+        if not requests:
+            return []
+
+        responses = await self.client.query_batch_points(collection_name=collection_name, requests=requests)
+        return [ self.to_retrieved_documents(response) for response in responses ]
@@ -0,0 +1,621 @@
+from ..VectorDBEInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from contextlib import contextmanager
+import numpy as np
+import threading
+import fcntl
+import json
+import logging
+import os
+import shutil
+from typing import List
+from ....models.db_schemes import RetrievedDocument
+
+
+class EmbeddedCollection:
+    """
+    One collection stored in its own directory:
+
+        config.json   embedding size and distance
+        dense.npy     memory-mapped float32 matrix, one row per point
+        points.jsonl  append-only log of upserts / deletes (id, payload, sparse vector)
+
+    The in-memory state (live rows, payloads, sparse inverted index) is rebuilt
+    from the log, and reloaded whenever another process appended to it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.config_path = os.path.join(path, "config.json")
+        self.dense_path = os.path.join(path, "dense.npy")
+        self.log_path = os.path.join(path, "points.jsonl")
+        self.lock_path = os.path.join(path, ".lock")
+
+        with open(self.config_path) as f:
+            self.config = json.load(f)
+
+        self.embedding_size = self.config["embedding_size"]
+        self.distance_method = self.config["distance_method"]
+        self.log_state = None
+
+    @classmethod
+    def create(cls, path: str, embedding_size: int, distance_method: str, capacity: int):
+        os.makedirs(path)
+
+        with open(os.path.join(path, "config.json"), "w") as f:
+            json.dump({"embedding_size": embedding_size, "distance_method": distance_method}, f)
+
+        dense = np.lib.format.open_memmap(os.path.join(path, "dense.npy"), mode="w+",
+                                          dtype=np.float32, shape=(capacity, embedding_size))
+        dense.flush()
+        del dense
+
+        open(os.path.join(path, "points.jsonl"), "w").close()
+        return cls(path)
+
+    def get_log_state(self):
+        stat = os.stat(self.log_path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def reload(self):
+        self.dense = np.load(self.dense_path, mmap_mode="r+")
+        self.ids = {}
+        self.row_ids = {}
+        self.payloads = {}
+        self.sparse = {}
+        self.inverted_index = {}
+        self.payload_index = {}
+        self.next_row = 0
+
+        with open(self.log_path) as f:
+            for line in f:
+                if line.strip():
+                    self.apply(json.loads(line))
+
+        self.log_state = self.get_log_state()
+
+    @contextmanager
+    def file_lock(self, operation: int):
+        # shared by the workers using the same directory: readers take LOCK_SH
+        # while reloading, writers LOCK_EX for the whole write
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        if self.log_state == self.get_log_state():
+            return
+
+        with self.file_lock(fcntl.LOCK_SH):
+            self.reload()
+
+    @contextmanager
+    def write_lock(self):
+        with self.file_lock(fcntl.LOCK_EX):
+            if self.log_state != self.get_log_state():
+                self.reload()
+            try:
+                yield
+            finally:
+                self.log_state = self.get_log_state()
+
+    def apply(self, entry: dict):
+        if entry["op"] == "upsert":
+            self.remove_row(self.ids.get(entry["id"]))
+            row = entry["row"]
+            self.ids[entry["id"]] = row
+            self.row_ids[row] = entry["id"]
+            self.payloads[row] = entry["payload"]
+            self.payload_index = {}
+
+            if entry.get("sparse"):
+                self.sparse[row] = entry["sparse"]
+                for index, value in zip(entry["sparse"]["indices"], entry["sparse"]["values"]):
+                    self.inverted_index.setdefault(index, {})[row] = value
+
+            self.next_row = max(self.next_row, row + 1)
+
+        elif entry["op"] == "delete":
+            self.remove_row(self.ids.get(entry["id"]))
+
+    def remove_row(self, row: int):
+        if row is None or row not in self.payloads:
+            return
+
+        del self.payloads[row]
+        del self.ids[self.row_ids.pop(row)]
+        self.payload_index = {}
+
+        for index in self.sparse.pop(row, {}).get("indices", []):
+            postings = self.inverted_index.get(index, {})
+            postings.pop(row, None)
+            if len(postings) == 0:
+                self.inverted_index.pop(index, None)
+
+    def append(self, entries: list):
+        with open(self.log_path, "a") as f:
+            f.write("".join(json.dumps(entry, default=str) + "\n" for entry in entries))
+        for entry in entries:
+            self.apply(entry)
+
+    def ensure_capacity(self, rows: int):
+        capacity = self.dense.shape[0]
+        if rows <= capacity:
+            return
+
+        while capacity < rows:
+            capacity *= 2
+
+        # grow into a new file and swap it in, readers holding the old map keep a valid file
+        tmp_path = self.dense_path + ".tmp.npy"
+        dense = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32,
+                                          shape=(capacity, self.embedding_size))
+        dense[:self.dense.shape[0]] = self.dense
+        dense.flush()
+        del dense
+
+        os.replace(tmp_path, self.dense_path)
+        self.dense = np.load(self.dense_path, mmap_mode="r+")
+
+    def prepare_vector(self, vector: list):
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.distance_method == DistanceMethodEnums.COSINE.value:
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+        return vector
+
+    def prepare_sparse_vector(self, sparse_vector: dict):
+        if not sparse_vector:
+            return None
+        return {
+            "indices": [ int(index) for index in sparse_vector["indices"] ],
+            "values": [ float(value) for value in sparse_vector["values"] ],
+        }
+
+    def upsert(self, points: list):
+        """
+        points: (id, dense vector, sparse vector, payload) tuples.
+        """
+        rows = range(self.next_row, self.next_row + len(points))
+        self.ensure_capacity(self.next_row + len(points))
+
+        for row, (_, dense_vector, _, _) in zip(rows, points):
+            self.dense[row] = self.prepare_vector(dense_vector)
+        self.dense.flush()
+
+        self.append([
+            {"op": "upsert", "row": row, "id": point_id, "payload": payload,
+             "sparse": self.prepare_sparse_vector(sparse_vector)}
+            for row, (point_id, _, sparse_vector, payload) in zip(rows, points)
+        ])
+
+    def delete(self, point_ids: list):
+        if len(point_ids) == 0:
+            return
+        self.append([{"op": "delete", "id": point_id} for point_id in point_ids])
+
+        # deleted and overwritten rows are never reused, rewrite once they are the majority
+        if self.next_row > max(2 * len(self.payloads), 1024):
+            self.compact()
+
+    def compact(self):
+        live_rows = sorted(self.payloads.keys())
+        capacity = max(len(live_rows), 1) * 2
+
+        tmp_dense_path = self.dense_path + ".tmp.npy"
+        dense = np.lib.format.open_memmap(tmp_dense_path, mode="w+", dtype=np.float32,
+                                          shape=(capacity, self.embedding_size))
+        if len(live_rows):
+            dense[:len(live_rows)] = self.dense[live_rows]
+        dense.flush()
+        del dense
+
+        tmp_log_path = self.log_path + ".tmp"
+        with open(tmp_log_path, "w") as f:
+            for new_row, row in enumerate(live_rows):
+                f.write(json.dumps({
+                    "op": "upsert", "row": new_row, "id": self.row_ids[row],
+                    "payload": self.payloads[row], "sparse": self.sparse.get(row),
+                }, default=str) + "\n")
+
+        os.replace(tmp_dense_path, self.dense_path)
+        os.replace(tmp_log_path, self.log_path)
+        self.reload()
+
+    def get_field_value(self, payload: dict, field_name: str):
+        value = payload
+        for key in field_name.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    def get_field_index(self, field_name: str):
+        # {value: set(rows)}, built lazily and dropped on every write
+        if field_name not in self.payload_index:
+            field_index = {}
+            for row, payload in self.payloads.items():
+                field_index.setdefault(self.get_field_value(payload, field_name), set()).add(row)
+            self.payload_index[field_name] = field_index
+        return self.payload_index[field_name]
+
+    def match_rows(self, filters: dict = None, exclude_filters: dict = None):
+        """
+        Rows matching one of the values of every field in `filters`
+        and none of the values in `exclude_filters`.
+        """
+        rows = set(self.payloads.keys())
+
+        for field_name, values in (filters or {}).items():
+            if values:
+                field_index = self.get_field_index(field_name)
+                rows &= set().union(*[field_index.get(value, set()) for value in values])
+
+        for field_name, values in (exclude_filters or {}).items():
+            if values:
+                field_index = self.get_field_index(field_name)
+                rows -= set().union(*[field_index.get(value, set()) for value in values])
+
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def top_k(self, rows: np.ndarray, scores: np.ndarray, limit: int):
+        if len(rows) == 0:
+            return []
+
+        if len(rows) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(rows))
+
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [ (int(rows[x]), float(scores[x])) for x in top ]
+
+    def search_dense(self, vector: list, limit: int, filters: dict = None):
+        rows = np.sort(self.match_rows(filters=filters))
+        if len(rows) == 0:
+            return []
+
+        scores = self.dense[rows] @ self.prepare_vector(vector)
+        return self.top_k(rows=rows, scores=scores, limit=limit)
+
+    def search_sparse(self, sparse_vector: dict, limit: int, filters: dict = None):
+        allowed_rows = set(self.match_rows(filters=filters).tolist())
+
+        scores = {}
+        for index, value in zip(sparse_vector["indices"], sparse_vector["values"]):
+            for row, row_value in self.inverted_index.get(index, {}).items():
+                if row in allowed_rows:
+                    scores[row] = scores.get(row, 0.0) + value * row_value
+
+        rows = np.fromiter(scores.keys(), dtype=np.int64, count=len(scores))
+        return self.top_k(
+            rows=rows,
+            scores=np.fromiter(scores.values(), dtype=np.float32, count=len(scores)),
+            limit=limit,
+        )
+
+    def count(self, filters: dict = None, exclude_filters: dict = None):
+        return len(self.match_rows(filters=filters, exclude_filters=exclude_filters))
+
+    def close(self):
+        if getattr(self, "dense", None) is not None:
+            self.dense.flush()
+        self.dense = None
+        self.log_state = None
+
+
+class EmbeddedVectorDBProvider(VectorDBInterface):
+    """
+    In-process vector store for tests, benchmarks and small installs that do
+    not run a Qdrant server. Same collection / alias / payload semantics as
+    QdrantDBProvider, persisted under `db_path`.
+    """
+
+    # reciprocal rank fusion constant, same as Qdrant so hybrid scores are comparable
+    RRF_K = 2
+
+    def __init__(self, db_path: str, distance_method: str, initial_capacity: int = 1024):
+        self.db_path = db_path
+        self.distance_method = distance_method
+        self.initial_capacity = initial_capacity
+
+        self.collections = {}
+        self.aliases_path = os.path.join(db_path, "aliases.json")
+        self.lock = threading.RLock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def disconnect(self):
+        with self.lock:
+            for collection in self.collections.values():
+                collection.close()
+            self.collections = {}
+
+    def get_collection_path(self, collection_name: str):
+        return os.path.join(self.db_path, collection_name)
+
+    def load_aliases(self) -> dict:
+        if not os.path.exists(self.aliases_path):
+            return {}
+        with open(self.aliases_path) as f:
+            return json.load(f)
+
+    def save_aliases(self, aliases: dict):
+        tmp_path = self.aliases_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(aliases, f)
+        os.replace(tmp_path, self.aliases_path)
+
+    def get_alias_target(self, alias_name: str):
+        return self.load_aliases().get(alias_name)
+
+    def resolve_collection_name(self, collection_name: str):
+        return self.get_alias_target(alias_name=collection_name) or collection_name
+
+    def get_collection(self, collection_name: str):
+        """
+        Returns the loaded collection behind a name or alias, None if it does not exist.
+        """
+        collection_name = self.resolve_collection_name(collection_name)
+
+        with self.lock:
+            if not os.path.exists(os.path.join(self.get_collection_path(collection_name), "config.json")):
+                self.collections.pop(collection_name, None)
+                return None
+
+            if collection_name not in self.collections:
+                self.collections[collection_name] = EmbeddedCollection(self.get_collection_path(collection_name))
+
+            collection = self.collections[collection_name]
+            collection.refresh()
+            return collection
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return self.get_collection(collection_name) is not None
+
+    def list_all_collections(self) -> List:
+        return [
+            name for name in sorted(os.listdir(self.db_path))
+            if os.path.exists(os.path.join(self.get_collection_path(name), "config.json"))
+        ]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        points_count = collection.count()
+        return {
+            "status": "green",
+            "points_count": points_count,
+            "vectors_count": points_count,
+            "config": collection.config,
+        }
+
+    def delete_collection(self, collection_name: str):
+        # deleting through an alias drops the collection it points to (and the alias with it)
+        collection_name = self.resolve_collection_name(collection_name)
+
+        with self.lock:
+            collection = self.collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+
+            aliases = self.load_aliases()
+            remaining_aliases = {alias: target for alias, target in aliases.items() if target != collection_name}
+            if remaining_aliases != aliases:
+                self.save_aliases(remaining_aliases)
+
+            collection_path = self.get_collection_path(collection_name)
+            if not os.path.exists(collection_path):
+                return False
+
+            shutil.rmtree(collection_path)
+            return True
+
+    def switch_alias(self, alias_name: str, collection_name: str):
+        """
+        Atomically points `alias_name` to `collection_name`.
+        Returns the collection the alias pointed to before the switch, if any.
+        """
+        with self.lock:
+            aliases = self.load_aliases()
+            previous_collection = aliases.get(alias_name)
+
+            if not previous_collection and os.path.exists(self.get_collection_path(alias_name)):
+                self.logger.warning(f"Replacing legacy collection {alias_name} with an alias")
+                self.delete_collection(collection_name=alias_name)
+
+            aliases[alias_name] = collection_name
+            self.save_aliases(aliases)
+
+            return previous_collection
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+
+        with self.lock:
+            if self.is_collection_existed(collection_name):
+                return False
+
+            self.collections[collection_name] = EmbeddedCollection.create(
+                path=self.get_collection_path(collection_name),
+                embedding_size=embedding_size,
+                distance_method=self.distance_method,
+                capacity=self.initial_capacity,
+            )
+            return True
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None):
+
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
+            return False
+
+        try:
+            with collection.write_lock():
+                collection.upsert([
+                    (record_id, vector, None, {"text": text, "metadata": metadata})
+                ])
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    def insert_many(self, collection_name: str, texts: list,
+                          dense_vectors: list, sparse_vectors: list,
+                          metadata: list = None,
+                          record_ids: list = None, batch_size: int = None,
+                          asset_ids: list = None, project_id: str = None,
+                          index_version: str = None):
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        if asset_ids is None:
+            asset_ids = [None] * len(texts)
+
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        try:
+            with collection.write_lock():
+                collection.upsert([
+                    (
+                        record_ids[x],
+                        dense_vectors[x],
+                        sparse_vectors[x],
+                        {
+                            "text": texts[x], "metadata": metadata[x], "asset_id": asset_ids[x],
+                            "project_id": project_id, "index_version": index_version,
+                        },
+                    )
+                    for x in range(len(texts))
+                ])
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    def delete_by_filter(self, collection_name: str, filters: dict,
+                               exclude_filters: dict = None):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        with collection.write_lock():
+            rows = collection.match_rows(filters=filters, exclude_filters=exclude_filters).tolist()
+            collection.delete([collection.row_ids[row] for row in rows])
+
+        return True
+
+    def count(self, collection_name: str, filters: dict = None) -> int:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return 0
+        return collection.count(filters=filters)
+
+    def to_retrieved_documents(self, collection: EmbeddedCollection, hits: list):
+        if len(hits) == 0:
+            return None
+
+        return [
+            RetrievedDocument(**{
+                "score": score,
+                "text": collection.payloads[row]["text"],
+                "asset_id": collection.payloads[row].get("asset_id"),
+                "metadata": collection.payloads[row].get("metadata"),
+            })
+            for row, score in hits
+        ]
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               oversampling: float = None, rescore: bool = None,
+                               filters: dict = None):
+        # vectors are kept in full precision, oversampling / rescore do not apply
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        hits = collection.search_dense(vector=vector, limit=limit, filters=filters)
+        return self.to_retrieved_documents(collection=collection, hits=hits)
+
+    def search_by_sparse_vector(self, collection_name: str, sparse_vector: dict, limit: int = 5,
+                                      filters: dict = None):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        hits = collection.search_sparse(sparse_vector=sparse_vector, limit=limit, filters=filters)
+        return self.to_retrieved_documents(collection=collection, hits=hits)
+
+    def fuse_rrf(self, result_lists: list, limit: int):
+        scores = {}
+        for hits in result_lists:
+            for rank, (row, _) in enumerate(hits):
+                scores[row] = scores.get(row, 0.0) + 1.0 / (rank + self.RRF_K)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def search_hybrid(self, collection_name: str, dense_vector: list, sparse_vector: dict,
+                            dense_limit: int, sparse_limit: int, limit: int,
+                            oversampling: float = None, rescore: bool = None,
+                            filters: dict = None):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        hits = self.fuse_rrf(
+            result_lists=[
+                collection.search_dense(vector=dense_vector, limit=dense_limit, filters=filters),
+                collection.search_sparse(sparse_vector=sparse_vector, limit=sparse_limit, filters=filters),
+            ],
+            limit=limit,
+        )
+
+        return self.to_retrieved_documents(collection=collection, hits=hits)
+
+    def search_batch(self, collection_name: str, dense_vectors: list = None, sparse_vectors: list = None,
+                           dense_limit: int = 10, sparse_limit: int = 5, limit: int = 5,
+                           filters: dict = None):
+        # in process, a batch is just the queries one after the other
+        queries_count = len(dense_vectors or sparse_vectors or [])
+        results = []
+        for x in range(queries_count):
+            dense_vector = dense_vectors[x] if dense_vectors else None
+            sparse_vector = sparse_vectors[x] if sparse_vectors else None
+
+            if dense_vector and sparse_vector:
+                results.append(self.search_hybrid(collection_name=collection_name,
+                                                  dense_vector=dense_vector, sparse_vector=sparse_vector,
+                                                  dense_limit=dense_limit, sparse_limit=sparse_limit,
+                                                  limit=limit, filters=filters))
+            elif dense_vector:
+                results.append(self.search_by_vector(collection_name=collection_name, vector=dense_vector,
+                                                     limit=limit, filters=filters))
+            else:
+                results.append(self.search_by_sparse_vector(collection_name=collection_name,
+                                                            sparse_vector=sparse_vector,
+                                                            limit=limit, filters=filters))
+
+        return results
@@ -1,17 +1,67 @@
 from  qdrant_client import models, QdrantClient
 from ..VectorDBEInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import DistanceMethodEnums, QuantizationEnums
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import json
 import logging
+import time
 from typing import List
 from ....models.db_schemes import RetrievedDocument
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, url: str, distance_method: str):
+    # payload fields indexed at collection creation, used by filtered searches
+    PAYLOAD_INDEXES = {
+        "asset_id": models.PayloadSchemaType.KEYWORD,
+        "metadata.source": models.PayloadSchemaType.KEYWORD,
+        "metadata.page": models.PayloadSchemaType.INTEGER,
+        # project_id is the tenant key of the shared collection, Qdrant co-locates its points
+        "project_id": models.KeywordIndexParams(
+            type=models.KeywordIndexType.KEYWORD,
+            is_tenant=True,
+        ),
+        "index_version": models.PayloadSchemaType.KEYWORD,
+    }
+
+    def __init__(self, url: str, distance_method: str,
+                       prefer_grpc: bool = False, grpc_port: int = 6334,
+                       timeout: int = None, pool_size: int = None,
+                       upload_batch_size: int = 256, upload_max_batch_bytes: int = 4194304,
+                       upload_parallel: int = 4, upload_max_retries: int = 3,
+                       quantization: str = QuantizationEnums.NONE.value,
+                       quantization_always_ram: bool = True,
+                       dense_on_disk: bool = False, sparse_on_disk: bool = False,
+                       hnsw_m: int = None, hnsw_ef_construct: int = None,
+                       search_oversampling: float = None, search_rescore: bool = True,
+                       multitenant: bool = False, sparse_uint8: bool = False):
 
         self.client = None
         self.url = url
         self.distance_method = None
 
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+        self.upload_batch_size = upload_batch_size
+        self.upload_max_batch_bytes = upload_max_batch_bytes
+        # the local in-process client is not thread safe, it uploads one batch at a time
+        self.upload_parallel = max(1, upload_parallel) if url != ":memory:" else 1
+        self.upload_max_retries = upload_max_retries
+
+        # collection profile, applied when a collection is (re)created
+        self.quantization = quantization or QuantizationEnums.NONE.value
+        self.quantization_always_ram = quantization_always_ram
+        self.dense_on_disk = dense_on_disk
+        self.sparse_on_disk = sparse_on_disk
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.search_oversampling = search_oversampling
+        self.search_rescore = search_rescore
+        self.multitenant = multitenant
+        self.sparse_uint8 = sparse_uint8
+
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
@@ -19,25 +69,242 @@ class QdrantDBProvider(VectorDBInterface):
 
         self.logger = logging.getLogger(__name__)
 
+    def get_client_params(self) -> dict:
+        """
+        Connection parameters shared by the sync and async clients.
+        With prefer_grpc the points traffic goes over gRPC (protobuf instead of JSON
+        encoded float vectors), the REST port is still used for the few calls without a gRPC API.
+        """
+        if self.url == ":memory:":
+            # local in-process mode (benchmarks, tests), nothing else applies
+            return { "location": self.url }
+
+        params = {
+            "url": self.url,
+            "prefer_grpc": self.prefer_grpc,
+            "grpc_port": self.grpc_port,
+        }
+
+        if self.timeout:
+            params["timeout"] = self.timeout
+
+        if self.pool_size:
+            # forwarded to the underlying httpx client of the REST transport
+            params["limits"] = httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            )
+
+        return params
+
     def connect(self):
-        self.client = QdrantClient(url=self.url)
+        self.client = QdrantClient(**self.get_client_params())
 
     def disconnect(self):
+        if self.client:
+            self.client.close()
         self.client = None
 
     def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        if self.client.collection_exists(collection_name=collection_name):
+            return True
+        return self.get_alias_target(alias_name=collection_name) is not None
     
     def list_all_collections(self) -> List:
         return self.client.get_collections()
     
     def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+        return self.client.get_collection(
+            collection_name=self.resolve_collection_name(collection_name)
+        )
     
     def delete_collection(self, collection_name: str):
-        if self.is_collection_existed(collection_name):
+        # deleting through an alias drops the collection it points to (and the alias with it)
+        target_collection = self.get_alias_target(alias_name=collection_name)
+        if target_collection:
+            return self.client.delete_collection(collection_name=target_collection)
+
+        if self.client.collection_exists(collection_name=collection_name):
             return self.client.delete_collection(collection_name=collection_name)
-        
+
+    def delete_by_filter(self, collection_name: str, filters: dict,
+                               exclude_filters: dict = None):
+        if not self.is_collection_existed(collection_name):
+            return None
+
+        return self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(
+                filter=self.build_filter(filters=filters, exclude_filters=exclude_filters)
+            ),
+        )
+
+    def count(self, collection_name: str, filters: dict = None) -> int:
+        result = self.client.count(
+            collection_name=collection_name,
+            count_filter=self.build_filter(filters=filters),
+            exact=True,
+        )
+        return result.count
+
+    def get_alias_target(self, alias_name: str):
+        aliases = self.client.get_aliases()
+        return self.find_alias_target(aliases=aliases, alias_name=alias_name)
+
+    def find_alias_target(self, aliases, alias_name: str):
+        for alias in aliases.aliases:
+            if alias.alias_name == alias_name:
+                return alias.collection_name
+        return None
+
+    def resolve_collection_name(self, collection_name: str):
+        return self.get_alias_target(alias_name=collection_name) or collection_name
+
+    def build_alias_operations(self, alias_name: str, collection_name: str,
+                                     previous_collection: str = None):
+        operations = []
+        if previous_collection:
+            operations.append(
+                models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=alias_name)
+                )
+            )
+
+        operations.append(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=collection_name,
+                    alias_name=alias_name
+                )
+            )
+        )
+
+        return operations
+
+    def switch_alias(self, alias_name: str, collection_name: str):
+        """
+        Atomically points `alias_name` to `collection_name`.
+        Returns the collection the alias pointed to before the switch, if any.
+        """
+        previous_collection = self.get_alias_target(alias_name=alias_name)
+
+        if not previous_collection and self.client.collection_exists(collection_name=alias_name):
+            # legacy layout: a plain collection still owns the alias name
+            self.logger.warning(f"Replacing legacy collection {alias_name} with an alias")
+            self.client.delete_collection(collection_name=alias_name)
+
+        self.client.update_collection_aliases(
+            change_aliases_operations=self.build_alias_operations(
+                alias_name=alias_name,
+                collection_name=collection_name,
+                previous_collection=previous_collection,
+            )
+        )
+
+        return previous_collection
+
+    def build_quantization_config(self):
+        if self.quantization == QuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        if self.quantization == QuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        return None
+
+    def build_collection_params(self, embedding_size: int) -> dict:
+        hnsw_config = None
+        if self.multitenant:
+            # searches are always filtered by project_id: skip the global graph
+            # and build one per tenant from the payload index instead
+            hnsw_config = models.HnswConfigDiff(
+                m=0,
+                payload_m=self.hnsw_m or 16,
+                ef_construct=self.hnsw_ef_construct,
+            )
+        elif self.hnsw_m or self.hnsw_ef_construct:
+            hnsw_config = models.HnswConfigDiff(
+                m=self.hnsw_m,
+                ef_construct=self.hnsw_ef_construct,
+            )
+
+        return {
+            "vectors_config": {
+                # Dense vectors for semantic search
+                "dense": models.VectorParams(
+                    size=embedding_size,
+                    distance=self.distance_method,
+                    on_disk=self.dense_on_disk,
+                    hnsw_config=hnsw_config,
+                ),
+            },
+            # Sparse vectors for keyword search
+            "sparse_vectors_config": {
+               "sparse": models.SparseVectorParams(
+                   index=models.SparseIndexParams(
+                       on_disk=self.sparse_on_disk,
+                       # document weights are quantized to 1..255 by the sparse embedding provider
+                       datatype=models.Datatype.UINT8 if self.sparse_uint8 else None,
+                   )
+               )
+            },
+            # quantized copies stay in RAM, full precision vectors may live on disk
+            "quantization_config": self.build_quantization_config(),
+        }
+
+    def build_search_params(self, oversampling: float = None, rescore: bool = None):
+        """
+        Search params for the dense vectors: with quantization enabled, fetch
+        `oversampling` times more candidates from the quantized index and
+        re-score them against the original vectors.
+        """
+        if self.quantization == QuantizationEnums.NONE.value:
+            return None
+
+        oversampling = oversampling if oversampling is not None else self.search_oversampling
+        rescore = rescore if rescore is not None else self.search_rescore
+
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=rescore,
+                oversampling=oversampling,
+            )
+        )
+
+    def build_conditions(self, filters: dict = None):
+        return [
+            models.FieldCondition(
+                key=field_name,
+                match=models.MatchAny(any=list(values)),
+            )
+            for field_name, values in (filters or {}).items()
+            if values
+        ]
+
+    def build_filter(self, filters: dict = None, exclude_filters: dict = None):
+        """
+        Translates {payload_field: [accepted values]} into a Qdrant filter,
+        a point must match one of the values of every given field
+        and none of the values in `exclude_filters`.
+        """
+        must = self.build_conditions(filters=filters)
+        must_not = self.build_conditions(filters=exclude_filters)
+
+        if len(must) == 0 and len(must_not) == 0:
+            return None
+
+        return models.Filter(must=must or None, must_not=must_not or None)
+
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
                                 do_reset: bool = False):
@@ -45,26 +312,17 @@ class QdrantDBProvider(VectorDBInterface):
             _ = self.delete_collection(collection_name=collection_name)
         
         if not self.is_collection_existed(collection_name):
-             # START of changes
             _ = self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config={
-                    # Dense vectors for semantic search
-                    "dense": models.VectorParams(
-                        size=embedding_size,
-                        distance=self.distance_method
-                    ),
-                },
-                # Sparse vectors for keyword search
-                sparse_vectors_config={
-                   "sparse": models.SparseVectorParams(
-                       index=models.SparseIndexParams(
-                           on_disk=False,
-                       )
-                   )
-                }
+                **self.build_collection_params(embedding_size=embedding_size)
             )
-            # END of changes
+
+            for field_name, field_schema in self.PAYLOAD_INDEXES.items():
+                _ = self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
 
             return True
         
@@ -79,12 +337,12 @@ class QdrantDBProvider(VectorDBInterface):
             return False
         
         try:
-            _ = self.client.upload_records(
+            _ = self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
-                        vector=vector,
+                points=[
+                    models.PointStruct(
+                        id=record_id,
+                        vector={"dense": vector},
                         payload={
                             "text": text, "metadata": metadata
                         }
@@ -96,62 +354,145 @@ class QdrantDBProvider(VectorDBInterface):
             return False
 
         return True
+
+    def build_points(self, texts: list, dense_vectors: list, sparse_vectors: list,
+                           metadata: list, record_ids: list, asset_ids: list,
+                           project_id: str = None, index_version: str = None):
+        return [
+            models.PointStruct(
+                id=record_ids[x],
+                vector={
+                    "dense": dense_vectors[x],
+                    "sparse": models.SparseVector(**sparse_vectors[x])
+                },
+                payload={
+                    "text": texts[x], "metadata": metadata[x], "asset_id": asset_ids[x],
+                    "project_id": project_id, "index_version": index_version,
+                }
+            )
+            for x in range(len(texts))
+        ]
+
+    def estimate_point_bytes(self, text: str, dense_vector: list, sparse_vector: dict,
+                                   metadata: dict):
+        # rough wire size: floats and sparse (index, value) pairs as JSON numbers
+        return (
+            len(text.encode("utf-8"))
+            + len(dense_vector) * 12
+            + len(sparse_vector["indices"]) * 20
+            + len(json.dumps(metadata, default=str))
+        )
+
+    def build_batches(self, texts: list, dense_vectors: list, sparse_vectors: list,
+                            metadata: list, batch_size: int):
+        """
+        Splits the records into (start, end) ranges holding at most `batch_size`
+        points and at most `upload_max_batch_bytes` of estimated payload, so
+        long chunks produce smaller requests and short ones bigger requests.
+        """
+        batches = []
+        start, batch_bytes = 0, 0
+
+        for x in range(len(texts)):
+            point_bytes = self.estimate_point_bytes(
+                text=texts[x],
+                dense_vector=dense_vectors[x],
+                sparse_vector=sparse_vectors[x],
+                metadata=metadata[x],
+            )
+
+            is_full = x - start >= batch_size or batch_bytes + point_bytes > self.upload_max_batch_bytes
+            if x > start and is_full:
+                batches.append((start, x))
+                start, batch_bytes = x, 0
+
+            batch_bytes += point_bytes
+
+        if start < len(texts):
+            batches.append((start, len(texts)))
+
+        return batches
+
+    def upsert_batch(self, collection_name: str, points: list, wait: bool):
+        for attempt in range(self.upload_max_retries + 1):
+            try:
+                self.client.upsert(
+                    collection_name=collection_name,
+                    points=points,
+                    wait=wait,
+                )
+                return True
+            except Exception as e:
+                self.logger.warning(f"Error while inserting batch (attempt {attempt + 1}): {e}")
+                if attempt < self.upload_max_retries:
+                    time.sleep(min(2 ** attempt * 0.5, 8))
+
+        self.logger.error(f"Giving up on a batch of {len(points)} points for {collection_name}")
+        return False
     
     def insert_many(self, collection_name: str, texts: list, 
-                          dense_vectors: list, sparse_vectors: list, # Modified parameters
+                          dense_vectors: list, sparse_vectors: list,
                           metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
-        
+                          record_ids: list = None, batch_size: int = None,
+                          asset_ids: list = None, project_id: str = None,
+                          index_version: str = None):
+        """
+        Uploads the batches from `upload_parallel` threads without waiting for
+        Qdrant to apply them, then sends the last batch with wait=True: updates
+        are applied in order, so once it returns all previous batches are visible.
+        """
         if metadata is None:
             metadata = [None] * len(texts)
 
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-
-            batch_texts = texts[i:batch_end]
-            batch_dense_vectors = dense_vectors[i:batch_end]
-            batch_sparse_vectors = sparse_vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector={
-                        "dense": batch_dense_vectors[x],
-                        "sparse": models.SparseVector(**batch_sparse_vectors[x])
-                    },
-                    payload={
-                        "text": batch_texts[x], "metadata": batch_metadata[x]
-                    }
-                )
-                for x in range(len(batch_texts))
-            ]
+        if asset_ids is None:
+            asset_ids = [None] * len(texts)
 
-            try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name,
-                    records=batch_records,
-                )
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+        if len(texts) == 0:
+            return True
 
-        return True
-        
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
-        
-        # Use the modern query_points API for simple dense search
-        results = self.client.query_points(
-            collection_name=collection_name,
-            query=vector,  # For simple search, the vector goes directly into 'query'
-            using="dense", # Specify which named vector to use
-            limit=limit
+        batches = [
+            self.build_points(
+                texts=texts[start:end],
+                dense_vectors=dense_vectors[start:end],
+                sparse_vectors=sparse_vectors[start:end],
+                metadata=metadata[start:end],
+                record_ids=record_ids[start:end],
+                asset_ids=asset_ids[start:end],
+                project_id=project_id,
+                index_version=index_version,
+            )
+            for start, end in self.build_batches(
+                texts=texts,
+                dense_vectors=dense_vectors,
+                sparse_vectors=sparse_vectors,
+                metadata=metadata,
+                batch_size=batch_size or self.upload_batch_size,
+            )
+        ]
+
+        *pending_batches, last_batch = batches
+
+        with ThreadPoolExecutor(max_workers=self.upload_parallel) as executor:
+            results = list(executor.map(
+                lambda points: self.upsert_batch(collection_name=collection_name, points=points, wait=False),
+                pending_batches
+            ))
+
+        # consistency barrier
+        results.append(
+            self.upsert_batch(collection_name=collection_name, points=last_batch, wait=True)
         )
 
+        if not all(results):
+            self.logger.error(f"{results.count(False)} of {len(results)} batches failed for {collection_name}")
+            return False
+
+        return True
+
+    def to_retrieved_documents(self, results):
         if not results or not hasattr(results, 'points') or len(results.points) == 0:
             return None
         
@@ -159,43 +500,160 @@ class QdrantDBProvider(VectorDBInterface):
             RetrievedDocument(**{
                 "score": result.score,
                 "text": result.payload["text"],
+                "asset_id": result.payload.get("asset_id"),
+                "metadata": result.payload.get("metadata"),
             })
             for result in results.points
         ]
-    
-
-    def search_hybrid(self, collection_name: str, dense_vector: list, sparse_vector: dict,
-                      dense_limit: int, sparse_limit: int, limit: int):
         
-        # Define the two searches we want to run in parallel
-        prefetches = [
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               oversampling: float = None, rescore: bool = None,
+                               filters: dict = None):
+        
+        # Use the modern query_points API for simple dense search
+        results = self.client.query_points(
+            collection_name=collection_name,
+            query=vector,  # For simple search, the vector goes directly into 'query'
+            using="dense", # Specify which named vector to use
+            limit=limit,
+            search_params=self.build_search_params(oversampling=oversampling, rescore=rescore),
+            query_filter=self.build_filter(filters=filters),
+        )
+
+        return self.to_retrieved_documents(results)
+
+    def search_by_sparse_vector(self, collection_name: str, sparse_vector: dict, limit: int = 5,
+                                      filters: dict = None):
+
+        results = self.client.query_points(
+            collection_name=collection_name,
+            query=models.SparseVector(**sparse_vector),
+            using="sparse",
+            limit=limit,
+            query_filter=self.build_filter(filters=filters),
+        )
+
+        return self.to_retrieved_documents(results)
+
+    def build_hybrid_prefetch(self, dense_vector: list, sparse_vector: dict,
+                                    dense_limit: int, sparse_limit: int,
+                                    oversampling: float = None, rescore: bool = None,
+                                    query_filter: models.Filter = None):
+        # Define the two searches we want to run in parallel,
+        # each one filtered inside the index rather than after the fusion
+        return [
             models.Prefetch(
                 query=dense_vector,
                 using="dense",
                 limit=dense_limit,
+                params=self.build_search_params(oversampling=oversampling, rescore=rescore),
+                filter=query_filter,
             ),
             models.Prefetch(
                 query=models.SparseVector(**sparse_vector),
                 using="sparse",
-                limit=sparse_limit
+                limit=sparse_limit,
+                filter=query_filter,
             )
         ]
 
+    def search_hybrid(self, collection_name: str, dense_vector: list, sparse_vector: dict,
+                      dense_limit: int, sparse_limit: int, limit: int,
+                      oversampling: float = None, rescore: bool = None,
+                      filters: dict = None):
+
+        query_filter = self.build_filter(filters=filters)
+
         # Use Reciprocal Rank Fusion (RRF) to combine the results
         results = self.client.query_points(
             collection_name=collection_name,
             query=models.FusionQuery(fusion=models.Fusion.RRF),
-            prefetch=prefetches,
+            prefetch=self.build_hybrid_prefetch(
+                dense_vector=dense_vector,
+                sparse_vector=sparse_vector,
+                dense_limit=dense_limit,
+                sparse_limit=sparse_limit,
+                oversampling=oversampling,
+                rescore=rescore,
+                query_filter=query_filter,
+            ),
+            query_filter=query_filter,
             limit=limit
         )
 
-        if not results or len(results.points) == 0:
-            return None
-        
+        return self.to_retrieved_documents(results)
+
+
+    def build_query_request(self, dense_vector: list = None, sparse_vector: dict = None,
+                                  dense_limit: int = 10, sparse_limit: int = 5, limit: int = 5,
+                                  query_filter: models.Filter = None):
+        """
+        One query of a batch: hybrid (RRF) when both vectors are given,
+        otherwise a search on the side that is present.
+        """
+        if dense_vector and sparse_vector:
+            return models.QueryRequest(
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                prefetch=self.build_hybrid_prefetch(
+                    dense_vector=dense_vector,
+                    sparse_vector=sparse_vector,
+                    dense_limit=dense_limit,
+                    sparse_limit=sparse_limit,
+                    query_filter=query_filter,
+                ),
+                filter=query_filter,
+                limit=limit,
+                with_payload=True,
+            )
+
+        if dense_vector:
+            return models.QueryRequest(
+                query=dense_vector,
+                using="dense",
+                params=self.build_search_params(),
+                filter=query_filter,
+                limit=limit,
+                with_payload=True,
+            )
+
+        return models.QueryRequest(
+            query=models.SparseVector(**sparse_vector),
+            using="sparse",
+            filter=query_filter,
+            limit=limit,
+            with_payload=True,
+        )
+
+    def build_query_requests(self, dense_vectors: list = None, sparse_vectors: list = None,
+                                   dense_limit: int = 10, sparse_limit: int = 5, limit: int = 5,
+                                   filters: dict = None):
+        query_filter = self.build_filter(filters=filters)
+        queries_count = len(dense_vectors or sparse_vectors or [])
+
         return [
-            RetrievedDocument(**{
-                "score": result.score,
-                "text": result.payload["text"],
-            })
-            for result in results.points
-        ]
\ No newline at end of file
+            self.build_query_request(
+                dense_vector=dense_vectors[x] if dense_vectors else None,
+                sparse_vector=sparse_vectors[x] if sparse_vectors else None,
+                dense_limit=dense_limit,
+                sparse_limit=sparse_limit,
+                limit=limit,
+                query_filter=query_filter,
+            )
+            for x in range(queries_count)
+        ]
+
+    def search_batch(self, collection_name: str, dense_vectors: list = None, sparse_vectors: list = None,
+                           dense_limit: int = 10, sparse_limit: int = 5, limit: int = 5,
+                           filters: dict = None):
+        """
+        Runs all the queries in one query_batch_points round trip,
+        returns their results in order.
+        """
+        requests = self.build_query_requests(dense_vectors=dense_vectors, sparse_vectors=sparse_vectors,
+                                             dense_limit=dense_limit, sparse_limit=sparse_limit,
+                                             limit=limit, filters=filters)
+        if not requests:
+            return []
+
+        responses = self.client.query_batch_points(collection_name=collection_name, requests=requests)
+        return [ self.to_retrieved_documents(response) for response in responses ]
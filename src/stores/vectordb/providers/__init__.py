@@ -1 +1,13 @@
-from .QdrantDBProvider import QdrantDBProvider
\ No newline at end of file
+import importlib
+
+# each provider pulls in its client library, it is imported the first time it is used
+__all__ = ["QdrantDBProvider", "AsyncQdrantDBProvider", "EmbeddedVectorDBProvider"]
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    provider = getattr(importlib.import_module(f".{name}", __name__), name)
+    # the submodule import bound its module to the name, the class replaces it
+    globals()[name] = provider
+    return provider
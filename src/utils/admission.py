@@ -0,0 +1,148 @@
+from enum import Enum
+from collections import deque
+from .metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_QUEUE_TIME, ADMISSION_REJECTED
+import asyncio
+import math
+import time
+
+
+class AdmissionClassEnums(Enum):
+    INTERACTIVE = "interactive"
+    INGESTION = "ingestion"
+
+
+class AdmissionRejectReasonEnums(Enum):
+    QUEUE_FULL = "queue_full"
+    QUEUE_TIMEOUT = "queue_timeout"
+
+
+class AdmissionRejectedError(Exception):
+
+    def __init__(self, admission_class: str, reason: str, retry_after: int):
+        super().__init__(f"{admission_class} request rejected: {reason}")
+        self.admission_class = admission_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    At most `max_concurrency` requests of one class run at once in the
+    worker, the next `max_queue` wait for a slot in arrival order, at most
+    `max_wait_seconds`. Requests beyond the queue are rejected right away,
+    so a burst is shed instead of slowing down every request in flight.
+    A `max_concurrency` of 0 disables the limit.
+    """
+
+    def __init__(self, admission_class: str, max_concurrency: int, max_queue: int,
+                       max_wait_seconds: float, max_retry_after_seconds: int = 60):
+        self.admission_class = admission_class
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+
+        self.in_flight = 0
+        self.waiters = deque()
+        # moving average of how long a request holds its slot, for Retry-After
+        self.hold_seconds = 1.0
+
+    def get_retry_after(self) -> int:
+        """
+        Seconds until the queue ahead of a new request has likely drained.
+        """
+        queued = len(self.waiters) + 1
+        estimate = self.hold_seconds * queued / max(self.max_concurrency, 1)
+        return min(max(math.ceil(estimate), 1), self.max_retry_after_seconds)
+
+    def reject(self, reason: AdmissionRejectReasonEnums):
+        ADMISSION_REJECTED.labels(admission_class=self.admission_class, reason=reason.value).inc()
+        raise AdmissionRejectedError(admission_class=self.admission_class, reason=reason.value,
+                                     retry_after=self.get_retry_after())
+
+    def grant(self, queued_seconds: float):
+        ADMISSION_QUEUE_TIME.labels(admission_class=self.admission_class).observe(queued_seconds)
+        ADMISSION_IN_FLIGHT.labels(admission_class=self.admission_class).inc()
+
+    async def acquire(self):
+        if not self.max_concurrency:
+            return
+
+        start = time.perf_counter()
+        if self.in_flight < self.max_concurrency and not self.waiters:
+            self.in_flight += 1
+            self.grant(0.0)
+            return
+
+        if len(self.waiters) >= self.max_queue:
+            self.reject(AdmissionRejectReasonEnums.QUEUE_FULL)
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        ADMISSION_QUEUED.labels(admission_class=self.admission_class).inc()
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            # the slot may have been handed over as the wait timed out
+            if future.done() and not future.cancelled():
+                self.release_slot()
+            self.reject(AdmissionRejectReasonEnums.QUEUE_TIMEOUT)
+        except BaseException:
+            # the slot may have been handed over as the client went away
+            if future.done() and not future.cancelled():
+                self.release_slot()
+            raise
+        finally:
+            ADMISSION_QUEUED.labels(admission_class=self.admission_class).dec()
+            if future in self.waiters:
+                self.waiters.remove(future)
+
+        self.grant(time.perf_counter() - start)
+
+    def release_slot(self):
+        # hand the slot over to the oldest waiter still waiting, in_flight
+        # stays the same
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def release(self, hold_seconds: float):
+        if not self.max_concurrency:
+            return
+
+        self.hold_seconds = 0.8 * self.hold_seconds + 0.2 * hold_seconds
+        ADMISSION_IN_FLIGHT.labels(admission_class=self.admission_class).dec()
+        self.release_slot()
+
+
+class AdmissionController:
+    """
+    One AdmissionLimiter per endpoint class, each with its own budget: bulk
+    ingestion can not take the slots of the interactive queries.
+    """
+
+    def __init__(self, limiters: dict):
+        self.limiters = limiters
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(limiters={
+            AdmissionClassEnums.INTERACTIVE.value: AdmissionLimiter(
+                admission_class=AdmissionClassEnums.INTERACTIVE.value,
+                max_concurrency=settings.ADMISSION_INTERACTIVE_MAX_CONCURRENCY,
+                max_queue=settings.ADMISSION_INTERACTIVE_MAX_QUEUE,
+                max_wait_seconds=settings.ADMISSION_INTERACTIVE_MAX_WAIT_SECONDS,
+            ),
+            AdmissionClassEnums.INGESTION.value: AdmissionLimiter(
+                admission_class=AdmissionClassEnums.INGESTION.value,
+                max_concurrency=settings.ADMISSION_INGESTION_MAX_CONCURRENCY,
+                max_queue=settings.ADMISSION_INGESTION_MAX_QUEUE,
+                max_wait_seconds=settings.ADMISSION_INGESTION_MAX_WAIT_SECONDS,
+            ),
+        })
+
+    def get_limiter(self, admission_class: AdmissionClassEnums) -> AdmissionLimiter:
+        return self.limiters[admission_class.value]
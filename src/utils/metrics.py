@@ -1,10 +1,17 @@
 from prometheus_client import (
-    Counter, Histogram, Gauge,
-    generate_latest, CONTENT_TYPE_LATEST
+    Counter, Histogram, Gauge, CollectorRegistry,
+    generate_latest, multiprocess, CONTENT_TYPE_LATEST
 )
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Response
 from fastapi.routing import APIRoute
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Match
+from collections import OrderedDict
+from contextvars import ContextVar
+import asyncio
+import functools
+import glob
+import os
+import re
 import time
 
 # ========== HTTP METRICS ==========
@@ -38,7 +45,8 @@ RESPONSE_SIZE = Histogram(
 IN_PROGRESS = Gauge(
     "http_requests_in_progress",
     "Number of HTTP requests currently in progress",
-    ["method", "endpoint"]
+    ["method", "endpoint"],
+    multiprocess_mode="livesum"  # summed over the running workers only
 )
 
 SPARSE_EMBEDDINGS_COUNT = Counter(
@@ -75,59 +83,316 @@ ANSWER_CONFIDENCE = Histogram(
     buckets=[0.1, 0.3, 0.5, 0.7, 0.9, 1.0]
 )
 
+ANSWER_CACHE_LOOKUPS = Counter(
+    "answer_cache_lookups_total",
+    "Semantic answer cache lookups",
+    ["mode", "result"]
+)
+
+RERANK_PAIRS = Counter(
+    "rerank_pairs_total",
+    "Cross-encoder (query, chunk) pairs, served from the score cache or scored",
+    ["result"]
+)
+
+RERANK_DEPTH = Histogram(
+    "rerank_depth_candidates",
+    "Number of first-stage candidates cross-encoded per query",
+    buckets=[5, 10, 15, 20, 25, 30, 40, 50, 75, 100]
+)
+
+HYBRID_SEARCH_FALLBACKS = Counter(
+    "hybrid_search_fallbacks_total",
+    "Hybrid searches served by a single side after the other query encoding failed",
+    ["mode"]
+)
+
+CONTEXT_TOKENS = Histogram(
+    "rag_context_tokens",
+    "Tokens of retrieved context packed into a RAG prompt",
+    buckets=[250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 16000]
+)
+
+INFERENCE_SERVER_BATCH_SIZE = Histogram(
+    "inference_server_batch_size",
+    "Inputs per model call of the shared inference server, after micro-batching",
+    ["operation"],
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256]
+)
+
+# ========== LLM USAGE ==========
+# operation: generation, embedding | token_type: prompt, completion
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "Calls to the generation and embedding backends",
+    ["backend", "model", "endpoint", "operation"]
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens sent to and generated by the LLM backends, as reported by their APIs",
+    ["backend", "model", "endpoint", "operation", "token_type"]
+)
+
+LLM_COST = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM cost (USD) from LLM_TOKEN_PRICES",
+    ["backend", "model", "endpoint"]
+)
+
+# ========== PIPELINE STAGES ==========
+# stages: mongo_project_lookup, chunk_fetch, dense_embed, sparse_encode,
+# vector_query, vector_upsert, rerank, prompt_assembly, llm_generation
+STAGE_LATENCY = Histogram(
+    "rag_stage_duration_seconds",
+    "Time spent in each stage of the retrieval, generation and indexing pipeline",
+    ["stage", "backend", "endpoint"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+)
+
+# route of the request being served, set by PrometheusMiddleware
+CURRENT_ENDPOINT = ContextVar("current_endpoint", default="none")
+
+# ========== ADMISSION CONTROL ==========
+# admission_class: interactive, ingestion | reason: queue_full, queue_timeout
+ADMISSION_QUEUE_TIME = Histogram(
+    "admission_queue_seconds",
+    "Time a request waited for a slot of its endpoint class before running",
+    ["admission_class"],
+    buckets=[0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "Requests holding a slot of their endpoint class",
+    ["admission_class"],
+    multiprocess_mode="livesum"
+)
+
+ADMISSION_QUEUED = Gauge(
+    "admission_queued",
+    "Requests waiting for a slot of their endpoint class",
+    ["admission_class"],
+    multiprocess_mode="livesum"
+)
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests turned away by admission control",
+    ["admission_class", "reason"]
+)
+
 # ========== HELPERS ==========
-def get_route_name(request: Request) -> str:
+def get_route_name(routes: list, scope: dict) -> str:
     """
     Normalize endpoint path: /users/123 -> /users/{id}
     """
-    for route in request.app.routes:
+    for route in routes:
         if isinstance(route, APIRoute):
-            match, _ = route.matches(request.scope)
-            if match.value == "full":
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
                 return route.path
-    return request.url.path
+    # a label per unknown path would grow the series without bound
+    return "unmatched"
+
+def get_backend_name(client) -> str:
+    """
+    Backend label of a provider instance: OpenAIProvider -> OpenAI
+    """
+    if client is None:
+        return "none"
+    return type(client).__name__.replace("Provider", "")
+
+class StageTimer:
+    def __init__(self, stage: str, backend: str):
+        self.stage = stage
+        self.backend = backend
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        STAGE_LATENCY.labels(
+            stage=self.stage,
+            backend=self.backend,
+            endpoint=CURRENT_ENDPOINT.get()
+        ).observe(time.perf_counter() - self.start_time)
+        return False
+
+    def __call__(self, function):
+        # a fresh timer per call, concurrent calls must not share start_time
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with StageTimer(stage=self.stage, backend=self.backend):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with StageTimer(stage=self.stage, backend=self.backend):
+                return function(*args, **kwargs)
+        return wrapper
+
+def track_stage(stage: str, backend: str = "none") -> StageTimer:
+    """
+    Times a pipeline stage into STAGE_LATENCY, labelled with the endpoint of
+    the current request:
+
+        with track_stage("rerank", get_backend_name(reranker_client)):
+            ...
+
+    or as a decorator of sync and async functions.
+    """
+    return StageTimer(stage=stage, backend=backend)
+
+# ========== MULTIPROCESS ==========
+# With several workers (uvicorn --workers) each process has its own
+# registry, a scrape would only see the worker that served it. When
+# PROMETHEUS_MULTIPROC_DIR is set (before prometheus_client is imported,
+# see docker/asksource) the workers write their metrics to files in that
+# directory and the metrics route aggregates them.
+def get_multiprocess_dir() -> str:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def cleanup_dead_workers():
+    """
+    Drops the live gauge files of the workers that exited without shutting
+    down (crash, OOM kill), their in-progress requests are not running anymore.
+    Counters and histograms of dead workers are kept, the totals stay monotonic.
+    """
+    multiprocess_dir = get_multiprocess_dir()
+    if not multiprocess_dir:
+        return
+
+    pids = set()
+    for file_path in glob.glob(os.path.join(multiprocess_dir, "gauge_live*_*.db")):
+        match = re.search(r"_(\d+)\.db$", file_path)
+        if match:
+            pids.add(int(match.group(1)))
+
+    for pid in pids:
+        if not is_process_alive(pid):
+            multiprocess.mark_process_dead(pid, multiprocess_dir)
+
+def mark_worker_dead():
+    if get_multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid(), get_multiprocess_dir())
+
+def generate_metrics() -> bytes:
+    if not get_multiprocess_dir():
+        return generate_latest()
+
+    cleanup_dead_workers()
+
+    # a fresh registry per scrape, the collector reads the worker files
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
 
 # ========== MIDDLEWARE ==========
-class PrometheusMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware: the request runs in the server task (no extra task
+    or response stream as with BaseHTTPMiddleware) and the sizes are the bytes
+    actually received and sent, streamed bodies included.
+
+    The route template of a (method, path) is resolved once against the app
+    routes and cached, it is needed before the app runs (in-progress gauge,
+    CURRENT_ENDPOINT) while the router only sets scope["route"] while handling
+    the request. The cache is bounded per matched route: each route template
+    keeps its `route_cache_size` most recent paths, so the ids of one busy
+    route (or scans of unknown URLs, all "unmatched") can not evict the
+    paths of the others. Past that a path costs one route matching (10-30 us).
+    """
+
+    def __init__(self, app, route_cache_size: int = 256):
+        self.app = app
+        self.route_cache_size = route_cache_size
+        # (method, path) -> route template
+        self.route_cache = {}
+        # route template -> its cached (method, path), least recently used first
+        self.route_paths = {}
+
+    def resolve_endpoint(self, scope: dict) -> str:
+        key = (scope["method"], scope["path"])
+        endpoint = self.route_cache.get(key)
+        if endpoint is not None:
+            self.route_paths[endpoint].move_to_end(key)
+            return endpoint
+
+        endpoint = get_route_name(scope["app"].routes, scope)
+        paths = self.route_paths.setdefault(endpoint, OrderedDict())
+        if len(paths) >= self.route_cache_size:
+            evicted, _ = paths.popitem(last=False)
+            del self.route_cache[evicted]
+        paths[key] = None
+        self.route_cache[key] = endpoint
+        return endpoint
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.perf_counter()
-        endpoint = get_route_name(request)
+        method = scope["method"]
+        endpoint = self.resolve_endpoint(scope)
+
+        request_size = 0
+        response_size = 0
+        status_code = 500
+
+        async def receive_wrapper():
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_size, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
         # in-progress
-        IN_PROGRESS.labels(request.method, endpoint).inc()
+        in_progress = IN_PROGRESS.labels(method, endpoint)
+        in_progress.inc()
+        endpoint_token = CURRENT_ENDPOINT.set(endpoint)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive_wrapper, send_wrapper)
         finally:
-            IN_PROGRESS.labels(request.method, endpoint).dec()
-
-        # duration
-        duration = time.perf_counter() - start_time
-        REQUEST_LATENCY.labels(method=request.method, endpoint=endpoint).observe(duration)
+            CURRENT_ENDPOINT.reset(endpoint_token)
+            in_progress.dec()
 
-        # count
-        REQUEST_COUNT.labels(
-            method=request.method,
-            endpoint=endpoint,
-            status=response.status_code
-        ).inc()
+            # duration
+            duration = time.perf_counter() - start_time
+            REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration)
 
-        # errors
-        if response.status_code >= 400:
-            ERROR_COUNT.labels(
-                method=request.method,
-                endpoint=endpoint,
-                status=response.status_code
-            ).inc()
+            # count, a request that raised before responding counts as a 500
+            REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status_code).inc()
 
-        # sizes
-        req_size = int(request.headers.get("content-length", 0))
-        REQUEST_SIZE.labels(method=request.method, endpoint=endpoint).observe(req_size)
+            # errors
+            if status_code >= 400:
+                ERROR_COUNT.labels(method=method, endpoint=endpoint, status=status_code).inc()
 
-        res_size = int(response.headers.get("content-length", 0) or 0)
-        RESPONSE_SIZE.labels(method=request.method, endpoint=endpoint).observe(res_size)
-
-        return response
+            # sizes
+            REQUEST_SIZE.labels(method=method, endpoint=endpoint).observe(request_size)
+            RESPONSE_SIZE.labels(method=method, endpoint=endpoint).observe(response_size)
 
 # ========== SETUP ==========
 def setup_metrics(app: FastAPI):
@@ -136,6 +401,10 @@ def setup_metrics(app: FastAPI):
     """
     app.add_middleware(PrometheusMiddleware)
 
+    if get_multiprocess_dir():
+        app.add_event_handler("startup", cleanup_dead_workers)
+        app.add_event_handler("shutdown", mark_worker_dead)
+
     @app.get("/TrhBVe_m5gg2002_E5VVqS", include_in_schema=False)
     def metrics():
-        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+        return Response(generate_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,101 @@
+from enum import Enum
+import asyncio
+import logging
+import time
+
+
+class ComponentStateEnums(Enum):
+    PENDING = "pending"
+    LOADING = "loading"
+    WARMING_UP = "warming_up"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class Readiness:
+    """
+    Load state of the components a worker needs (clients, local models),
+    reported by the readiness endpoint. The model loaders run in threads so
+    several of them (and the rest of the startup) overlap.
+    """
+
+    def __init__(self):
+        self.components = {}
+        self.checks = {}
+        self.logger = logging.getLogger(__name__)
+
+    def set_state(self, name: str, state: ComponentStateEnums, **details):
+        component = self.components.setdefault(name, {})
+        component["state"] = state.value
+        component.update(details)
+
+    def set_ready(self, name: str):
+        self.set_state(name, ComponentStateEnums.READY)
+
+    async def load(self, name: str, loader, warm_up_batch_size: int = 0):
+        """
+        Builds a component with `loader()` in a thread, then runs its
+        warm_up(batch_size) if it has one. Returns None when loading failed,
+        the error is kept in the component state.
+        """
+        self.set_state(name, ComponentStateEnums.LOADING)
+        try:
+            start_time = time.perf_counter()
+            component = await asyncio.to_thread(loader)
+            load_seconds = time.perf_counter() - start_time
+
+            warm_up_seconds = 0.0
+            if warm_up_batch_size and hasattr(component, "warm_up"):
+                self.set_state(name, ComponentStateEnums.WARMING_UP, load_seconds=round(load_seconds, 3))
+                start_time = time.perf_counter()
+                await asyncio.to_thread(component.warm_up, batch_size=warm_up_batch_size)
+                warm_up_seconds = time.perf_counter() - start_time
+        except Exception as e:
+            self.logger.exception(f"Error while loading {name}")
+            self.set_state(name, ComponentStateEnums.FAILED, error=str(e))
+            return None
+
+        self.logger.info(f"{name} loaded in {load_seconds:.2f}s, warmed up in {warm_up_seconds:.2f}s")
+        self.set_state(name, ComponentStateEnums.READY,
+                       load_seconds=round(load_seconds, 3), warm_up_seconds=round(warm_up_seconds, 3))
+        return component
+
+    def add_check(self, name: str, check):
+        """
+        Registers a component that can fail after startup (the shared
+        inference server): `check()` blocks and raises when it is down, it
+        runs on every readiness report.
+        """
+        self.checks[name] = check
+        self.set_ready(name)
+
+    async def run_check(self, name: str, check):
+        try:
+            await asyncio.to_thread(check)
+        except Exception as e:
+            self.set_state(name, ComponentStateEnums.FAILED, error=str(e))
+            return
+
+        self.components[name] = { "state": ComponentStateEnums.READY.value }
+
+    async def run_checks(self):
+        await asyncio.gather(*[ self.run_check(name, check) for name, check in self.checks.items() ])
+
+    def is_ready(self, names: list = None) -> bool:
+        names = names if names is not None else list(self.components)
+        return all(
+            self.components.get(name, {}).get("state") == ComponentStateEnums.READY.value
+            for name in names
+        )
+
+    def get_failed(self) -> list:
+        return [
+            name for name, component in self.components.items()
+            if component["state"] == ComponentStateEnums.FAILED.value
+        ]
+
+    def report(self) -> dict:
+        return {
+            "ready": self.is_ready(),
+            "components": { name: dict(component) for name, component in self.components.items() },
+        }